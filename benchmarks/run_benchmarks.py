@@ -0,0 +1,330 @@
+"""
+Benchmarks for the page-object hot paths.
+
+    python -m benchmarks.run_benchmarks run [--backend=engine] [--offline] [--save-baseline]
+    python -m benchmarks.run_benchmarks compare [BASELINE] CURRENT [--threshold=0.15]
+
+'run' measures:
+  - driver startup (create_driver + quit), selenium backend only
+  - per-method latency of open, choose_build, set_numbers, choose_operation,
+    set_integer_only, calculate and read_answer, against the synthetic
+    calculator fixture (src/synthetic/) served locally, so only the
+    framework's own cost is measured
+  - page load (Navigation Timing of each open: DOMContentLoaded, requests and
+    bytes transferred), selenium backend only; compare a BROWSER_PROFILE=default
+    baseline with a BROWSER_PROFILE=lean run to see what the lean profile saves
+  - cases per second for the data-driven arithmetic matrix at -n 1/2/4/8,
+    against BASE_URL or, with --offline, the vendored copy of the AUT: the
+    cases pytest reports as run over its own session time, with interpreter
+    and plugin startup reported apart
+
+and writes reports/benchmarks/benchmark-<timestamp>.json. 'compare' flags
+every metric that got worse than the baseline by more than the threshold
+and exits non-zero if there is any.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from src.engine.calculator_engine import ALL_BUILDS, CONCATENATE, INCOMPLETE_BUILDS
+from src.pages.calculator_page import CalculatorPage
+from src.pages.engine_page import EngineCalculatorPage
+from src.utils import page_load
+from src.utils.aut_server import SYNTHETIC_DIR, AUTServer
+from src.utils.browser_profile import BROWSER_PROFILE
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join("reports", "benchmarks")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+
+PAGE_METHODS = (
+    "open",
+    "choose_build",
+    "set_numbers",
+    "choose_operation",
+    "set_integer_only",
+    "calculate",
+    "read_answer",
+)
+
+# Last line of a pytest run: "3 failed, 200 passed, 5 xfailed in 12.34s"
+_RAN_RE = re.compile(r"(\d+) (passed|failed|xfailed|xpassed)\b")
+_SESSION_RE = re.compile(r" in (\d+(?:\.\d+)?)s\b")
+# pytest exit codes that mean the cases ran (1: some of them failed)
+_RAN_EXIT_CODES = (0, 1)
+
+
+# Measurements
+def _timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def _summary(samples: list[float], unit: str = "s") -> dict:
+    ordered = sorted(samples)
+    return {
+        "value": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "samples": len(ordered),
+        "unit": unit,
+        "better": "lower",
+    }
+
+
+def bench_driver_startup(samples: int) -> dict:
+    from src.utils.web import create_driver
+
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        driver = create_driver()
+        timings.append(time.perf_counter() - started)
+        driver.quit()
+    return {"driver.startup": _summary(timings)}
+
+
+def bench_page_methods(backend: str, base_url: str, rounds: int) -> dict:
+    """Time each page method over 'rounds' passes through every complete build."""
+    timings = {name: [] for name in PAGE_METHODS}
+
+    driver = None
+    if backend == "selenium":
+        from src.utils.web import create_driver
+
+        driver = create_driver()
+        page = CalculatorPage(driver)
+    else:
+        page = EngineCalculatorPage()
+
+    try:
+        for _ in range(rounds):
+            timings["open"].append(_timed(page.open, base_url))
+            for build in ALL_BUILDS:
+                if build in INCOMPLETE_BUILDS:
+                    continue
+                timings["choose_build"].append(_timed(page.choose_build, build))
+                timings["set_numbers"].append(_timed(page.set_numbers, "12", "3"))
+                for op in range(CONCATENATE):
+                    timings["choose_operation"].append(_timed(page.choose_operation, op))
+                    timings["set_integer_only"].append(_timed(page.set_integer_only, op % 2 == 1))
+                    timings["calculate"].append(_timed(page.calculate))
+                    timings["read_answer"].append(_timed(page.read_answer))
+    finally:
+        if driver is not None:
+            driver.quit()
+
+    return {f"method.{name}": _summary(samples) for name, samples in timings.items()}
+
+
+def bench_page_load(loads: list[dict]) -> dict:
+    """Navigation Timing of the selenium opens recorded by bench_page_methods()."""
+    if not loads:
+        return {}
+    return {
+        f"page.{key}": _summary([load[key] for load in loads], unit)
+        for key, unit in (
+            ("dom_content_loaded", "ms"),
+            ("requests", "requests"),
+            ("transfer_bytes", "bytes"),
+        )
+    }
+
+
+def bench_matrix(backend: str, workers: list[int], offline: bool = False) -> dict:
+    """
+    Cases per second for the arithmetic matrix, one pytest run per worker
+    count. The rate is the cases pytest ran (passed, failed, xfailed or
+    xpassed) over the session time it reports; the rest of the wall time,
+    interpreter start and plugin imports, is the startup metric.
+    """
+    results = {}
+    for n in workers:
+        cmd = [
+            sys.executable,
+            "-m",
+            "pytest",
+            "tests/test_data_driven_arithmetic.py",
+            f"--backend={backend}",
+            "-n",
+            str(n),
+            "--maxfail=0",
+            "-p",
+            "no:cacheprovider",
+        ]
+        if offline:
+            cmd.append("--offline")
+        started = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=ROOT_DIR, capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+
+        summary = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else ""
+        ran = sum(int(count) for count, _ in _RAN_RE.findall(summary))
+        session = _SESSION_RE.search(summary)
+        if proc.returncode not in _RAN_EXIT_CODES or not ran or session is None:
+            raise RuntimeError(
+                f"matrix run with -n {n} exited with {proc.returncode} after {ran} case(s):\n"
+                + "\n".join((proc.stdout + proc.stderr).strip().splitlines()[-20:])
+            )
+        seconds = float(session.group(1))
+        results[f"matrix.n{n}.cases_per_second"] = {
+            "value": ran / seconds,
+            "samples": 1,
+            "unit": "cases/s",
+            "better": "higher",
+        }
+        results[f"matrix.n{n}.startup"] = {
+            "value": max(elapsed - seconds, 0.0),
+            "samples": 1,
+            "unit": "s",
+            "better": "lower",
+        }
+    return results
+
+
+def run(args) -> str:
+    metrics = {}
+    server = AUTServer(directory=SYNTHETIC_DIR).start()
+    try:
+        if args.backend == "selenium":
+            metrics.update(bench_driver_startup(args.startup_samples))
+        metrics.update(bench_page_methods(args.backend, server.url, args.rounds))
+        metrics.update(bench_page_load(page_load.LOADS))
+    finally:
+        server.stop()
+    metrics.update(bench_matrix(args.backend, args.workers, args.offline))
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "backend": args.backend,
+            "offline": args.offline,
+            "browser_profile": BROWSER_PROFILE,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "metrics": metrics,
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = args.output or os.path.join(
+        RESULTS_DIR, f"benchmark-{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+    print(f"Benchmark results written to: {path}")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"Saved as baseline: {BASELINE_PATH}")
+    return path
+
+
+# Comparison
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """
+    Compare two benchmark results metric by metric.
+
+    Returns one row per metric present in both, with 'change' as the
+    relative change in the "worse" direction (positive = slower) and
+    'regressed' set when it exceeds 'threshold'.
+    """
+    rows = []
+    for name, before in sorted(baseline["metrics"].items()):
+        after = current["metrics"].get(name)
+        if after is None or not before["value"]:
+            continue
+        change = (after["value"] - before["value"]) / before["value"]
+        if before.get("better") == "higher":
+            change = -change
+        rows.append(
+            {
+                "metric": name,
+                "baseline": before["value"],
+                "current": after["value"],
+                "unit": before.get("unit", ""),
+                "change": change,
+                "regressed": change > threshold,
+            }
+        )
+    return rows
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_compare(args) -> int:
+    rows = compare(_load(args.baseline), _load(args.current), args.threshold)
+
+    print(f"{'metric':<36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['metric']:<36} {row['baseline']:>12.4g} {row['current']:>12.4g} "
+            f"{row['change']:>+7.1%}{flag}"
+        )
+
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write a JSON result.")
+    run_parser.add_argument("--backend", choices=("selenium", "engine"), default="selenium")
+    run_parser.add_argument(
+        "--rounds", type=int, default=3, help="Passes over every build per method benchmark."
+    )
+    run_parser.add_argument("--startup-samples", type=int, default=3)
+    run_parser.add_argument(
+        "--workers",
+        type=lambda value: [int(n) for n in value.split(",")],
+        default=[1, 2, 4, 8],
+        help="Comma-separated xdist worker counts for the matrix benchmark.",
+    )
+    run_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Run the matrix benchmark against the vendored AUT (src/aut/).",
+    )
+    run_parser.add_argument(
+        "--output", help="Result path (default: reports/benchmarks/benchmark-<ts>.json)."
+    )
+    run_parser.add_argument(
+        "--save-baseline", action="store_true", help=f"Also save the result as {BASELINE_PATH}."
+    )
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a baseline.")
+    compare_parser.add_argument("baseline", nargs="?", default=BASELINE_PATH)
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.15, help="Allowed relative slowdown."
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args)
+        return 0
+    return run_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
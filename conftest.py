@@ -1,17 +1,169 @@
 import os
 import platform
-from datetime import datetime
 
 import allure
 import pytest
 
-from src.pages.calculator_page import CalculatorPage
-from src.utils.web import BASE_URL, create_driver
+from src.engine.calculator_engine import EMULATED_BUILDS, EMULATED_PROPERTY, INCOMPLETE_BUILDS
+from src.pages.engine_page import EngineCalculatorPage, TimeoutException
+from src.utils import page_load
+from src.utils.browser_profile import BROWSER_PROFILE
+from src.utils.capabilities import CACHE_DIR, load_or_discover
+from src.utils.driver_resolver import RESOLUTION
+from src.utils.durations import build_of
+from src.utils.evidence import POLICIES, EvidenceCollector
+from src.utils.web import BASE_URL
+
+# Selenium-backed modules (CalculatorPage, DriverPool, AUTServer) are imported
+# inside the fixtures that need them, so collection, -k selection and xdist
+# worker start-up do not pay for selenium.webdriver.
+
+pytest_plugins = [
+    "src.plugins.adaptive_sampling",
+    "src.plugins.build_scheduler",
+    "src.plugins.cassettes",
+    "src.plugins.combinatorial",
+    "src.plugins.history",
+    "src.plugins.incremental",
+    "src.plugins.infra_retry",
+    "src.plugins.native_report",
+    "src.plugins.sharding",
+    "src.plugins.step_trace",
+    "src.plugins.telemetry",
+    "src.plugins.worker_control",
+]
+
+
+# Command-line options
+def pytest_addoption(parser):
+    parser.addoption(
+        "--offline",
+        action="store_true",
+        default=False,
+        help="Serve the vendored copy of the calculator (src/aut/) from a local server instead of BASE_URL.",
+    )
+    parser.addoption(
+        "--backend",
+        choices=("selenium", "engine"),
+        default="selenium",
+        help="Drive the calculator through a browser (selenium) or evaluate it in-process (engine).",
+    )
+    parser.addoption(
+        "--async-contexts",
+        type=int,
+        default=0,
+        help="Run batched cases across N concurrent browser contexts of one Chrome (0 = off).",
+    )
+    parser.addoption(
+        "--evidence",
+        choices=POLICIES,
+        default="full",
+        help="Screenshot/DOM capture on bad outcomes: every test, the first per build, or none.",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # The session's AUT address, settled before any plugin keys or records
+    # results against it (see base_url)
+    config._base_url = BASE_URL
+    if config.getoption("offline"):
+        from src.utils.aut_server import AUT_DIR, AUTServer, is_vendored
+
+        if not is_vendored():
+            raise pytest.UsageError(
+                f"--offline: no vendored calculator in {AUT_DIR}; "
+                "run `python -m src.utils.aut_server vendor` while online"
+            )
+        server = AUTServer().start()
+        config.add_cleanup(server.stop)
+        config._base_url = server.url
+    config._evidence = EvidenceCollector(config, policy=config.getoption("evidence"))
+    config._driver_resolutions = []
+    config._page_loads = []
+
+
+def pytest_collection_modifyitems(config, items):
+    # Engine answers for builds 1-8 replay the synthetic page's invented
+    # defects; tag them so no report or history takes them for verdicts,
+    # and let them fail without failing the run. Build 9's missing controls
+    # raise the engine's TimeoutException, an expected failure as in the
+    # matrix tests.
+    if config.getoption("backend") != "engine":
+        return
+    for item in items:
+        build = build_of(item.nodeid)
+        if build in EMULATED_BUILDS:
+            item.user_properties.append((EMULATED_PROPERTY, build))
+            item.add_marker(allure.tag("emulated"))
+            item.add_marker(
+                pytest.mark.xfail(
+                    strict=False, reason=f"Build {build} is emulated; its defects are invented"
+                )
+            )
+        elif build in INCOMPLETE_BUILDS:
+            item.add_marker(
+                pytest.mark.xfail(
+                    raises=TimeoutException,
+                    strict=False,
+                    reason=f"Build {build} has incomplete calculator UI",
+                )
+            )
+
+
+def pytest_unconfigure(config):
+    # Let queued screenshot/DOM writes land before the run ends
+    evidence = getattr(config, "_evidence", None)
+    if evidence is not None:
+        evidence.close()
+
+
+# Startup metrics
+def pytest_sessionfinish(session):
+    # xdist workers hand their driver resolution back to the controller
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None and RESOLUTION:
+        workeroutput["driver_resolution"] = dict(RESOLUTION)
+    if workeroutput is not None and page_load.LOADS:
+        workeroutput["page_loads"] = page_load.LOADS
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    resolution = getattr(node, "workeroutput", {}).get("driver_resolution")
+    if resolution:
+        node.config._driver_resolutions.append(resolution)
+    node.config._page_loads.extend(getattr(node, "workeroutput", {}).get("page_loads", []))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    resolutions = list(config._driver_resolutions)
+    if RESOLUTION and not hasattr(config, "workeroutput"):
+        resolutions.append(dict(RESOLUTION))
+
+    for r in resolutions:
+        terminalreporter.write_line(
+            f"driver resolution: {r['browser']} {r['version']} -> {r['path']} "
+            f"via {r['source']} in {r['seconds']:.3f}s"
+        )
+
+    if config.getoption("backend") == "engine":
+        terminalreporter.write_line(
+            f"engine backend: builds {min(EMULATED_BUILDS)}-{max(EMULATED_BUILDS)} are emulated "
+            "(defects invented by src/synthetic/); their outcomes are not verdicts on the AUT"
+        )
+
+    loads = list(config._page_loads)
+    if not hasattr(config, "workeroutput"):
+        loads.extend(page_load.LOADS)
+    summary = page_load.summarize(loads)
+    if summary:
+        terminalreporter.write_line(page_load.format_summary(summary))
 
 
 # Allure environment metadata
 @pytest.fixture(scope="session", autouse=True)
-def write_allure_environment():
+def write_allure_environment(request, base_url):
     """
     Create reports/allure-results/environment.properties so Allure
     can display environment info (OS, browser, AUT URL, etc.) on the
@@ -21,41 +173,155 @@ def write_allure_environment():
     env_path = os.path.join("reports", "allure-results", "environment.properties")
 
     with open(env_path, "w", encoding="utf-8") as f:
-        f.write("ApplicationUnderTest=https://testsheepnz.github.io/BasicCalculator.html\n")
+        f.write(f"ApplicationUnderTest={BASE_URL}\n")
+        if base_url != BASE_URL:
+            f.write(f"ServedFrom={base_url} (vendored copy, src/aut/)\n")
+        if request.config.getoption("backend") == "engine":
+            f.write(
+                f"Backend=engine (builds {min(EMULATED_BUILDS)}-{max(EMULATED_BUILDS)} emulated, tagged 'emulated')\n"
+            )
         f.write("TestSuite=Regression & Validation (All Builds)\n")
         f.write(f"OS={platform.system()} {platform.release()}\n")
         f.write("Browser=Chrome (headless)\n")
+        f.write(f"BrowserProfile={BROWSER_PROFILE}\n")
         f.write("Framework=pytest + Selenium\n")
         f.write("Executor=Local Run\n")
 
 
 # Selenium fixtures
 @pytest.fixture(scope="session")
-def driver():
+def driver_pool():
     """
-    Create a single WebDriver instance for the session.
-    Closed automatically at the end of the test run.
+    Pre-spawn DRIVER_POOL_SIZE browsers for this worker.
+    All browsers are quit at the end of the test run.
     """
-    drv = create_driver()
-    yield drv
-    drv.quit()
+    from src.utils.driver_pool import DriverPool
+
+    pool = DriverPool().start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture()
+def driver(request, base_url):
+    """
+    Lease a WebDriver from the worker's pool for one test.
+    On return the browser is health-checked and recycled if it crashed,
+    wedged, or has served DRIVER_MAX_USES tests, if the test hit an
+    infrastructure fault (see src/plugins/infra_retry.py), or if the runner
+    asked for it (see src/plugins/worker_control.py).
+
+    With --record-cassettes the test's WebDriver traffic is recorded; with
+    --replay-cassettes it is served from the recording and no browser starts
+    (see src/plugins/cassettes.py).
+    """
+    cassettes = request.config.pluginmanager.get_plugin("cassette-deck")
+    if cassettes is not None and cassettes.mode == "replay":
+        with cassettes.replay(request.node, base_url) as drv:
+            yield drv
+        return
+
+    driver_pool = request.getfixturevalue("driver_pool")
+    drv = driver_pool.acquire()
+    try:
+        if cassettes is not None:
+            with cassettes.record(request.node, drv, base_url):
+                yield drv
+        else:
+            yield drv
+    finally:
+        broken = getattr(request.node, "_infra_fault", False) or getattr(
+            request.node, "_recycle_browser", False
+        )
+        driver_pool.release(drv, broken=broken)
 
 
 @pytest.fixture(scope="session")
-def base_url():
+def base_url(request):
     """
     Expose the base URL so tests can override or parametrize it later if needed.
+    With --offline, the vendored copy of the calculator (src/aut/) served on
+    an ephemeral local port for the whole session (see pytest_configure).
+    """
+    return request.config._base_url
+
+
+@pytest.fixture(scope="session")
+def capabilities(request, base_url):
+    """
+    Per-build capability map ({build: {"complete", "controls", "operations"}}).
+
+    Discovered once per session by visiting every build, and cached under
+    reports/.cache keyed by the AUT's content hash. Also seeds
+    CalculatorPage's completeness cache so is_calculator_complete() never waits.
+    """
+    if request.config.getoption("backend") == "engine":
+        # Known statically; nothing to discover or cache
+        return EngineCalculatorPage().capabilities()
+
+    from src.pages.calculator_page import CalculatorPage
+
+    # Recorded cassettes keep the capability map next to them
+    cassettes = request.config.pluginmanager.get_plugin("cassette-deck")
+    cache_dir = cassettes.directory if cassettes is not None else CACHE_DIR
+
+    def discover():
+        if cassettes is not None and cassettes.mode == "replay":
+            pytest.skip(
+                "no capability map recorded for this AUT; re-record with --record-cassettes"
+            )
+        with request.getfixturevalue("driver_pool").lease() as drv:
+            return CalculatorPage(drv).open(base_url).capabilities()
+
+    caps = load_or_discover(discover, base_url, cache_dir)
+    CalculatorPage._completeness_by_build.update(
+        {str(build): entry["complete"] for build, entry in caps.items()}
+    )
+    return caps
+
+
+@pytest.fixture(scope="session")
+def async_fanout(request, base_url):
+    """
+    Callable that runs {build: cases} across --async-contexts isolated
+    browser contexts of one leased Chrome, concurrently over CDP.
+    None when the option is off or the engine backend is in use.
     """
-    return BASE_URL
+    contexts = request.config.getoption("async_contexts")
+    if not contexts or request.config.getoption("backend") != "selenium":
+        return None
+
+    import asyncio
+
+    from src.pages.async_calculator_page import browser_ws_url, run_matrix
+
+    pool = request.getfixturevalue("driver_pool")
+
+    def fanout(work):
+        with pool.lease() as drv:
+            return asyncio.run(run_matrix(browser_ws_url(drv), base_url, work, contexts))
+
+    return fanout
 
 
 @pytest.fixture()
-def calc(driver, base_url):
+def calc(request, base_url):
     """
-    Return a CalculatorPage that has already been opened.
+    Return a CalculatorPage that is open and in a clean state.
     This is the main fixture used by tests.
+
+    A leased browser that is already on the calculator is reset in the DOM;
+    the full page load is only repeated when the reset's sanity check fails.
+    With --backend=engine no browser is started at all.
     """
-    page = CalculatorPage(driver).open(base_url)
+    if request.config.getoption("backend") == "engine":
+        return EngineCalculatorPage().open(base_url)
+
+    from src.pages.calculator_page import CalculatorPage
+
+    page = CalculatorPage(request.getfixturevalue("driver"))
+    if not page.reset(base_url):
+        page.open(base_url)
     return page
 
 
@@ -72,7 +338,7 @@ def pytest_runtest_makereport(item, call):
       - setup failures (for example, driver could not load page in time)
 
     The hook tries to get a driver either directly from the test function
-    or via the 'calc' fixture.
+    or via the 'calc' fixture. How much is captured is set by --evidence.
     """
     outcome = yield
     report = outcome.get_result()
@@ -100,34 +366,9 @@ def pytest_runtest_makereport(item, call):
         # Test did not use WebDriver; nothing to capture
         return
 
-    # Ensure screenshot directory exists
-    screenshot_dir = os.path.join("reports", "screenshots")
-    os.makedirs(screenshot_dir, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    test_name = item.name
-
-    # Screenshot
-    screenshot_path = os.path.join(screenshot_dir, f"{test_name}-{timestamp}.png")
-    try:
-        driver.save_screenshot(screenshot_path)
-        with open(screenshot_path, "rb") as f:
-            allure.attach(
-                f.read(),
-                name=f"screenshot-{test_name}",
-                attachment_type=allure.attachment_type.PNG,
-            )
-    except Exception:
-        # Do not break the test run if screenshot capture fails
-        pass
-
-    # Page source
-    try:
-        html_source = driver.page_source
-        allure.attach(
-            html_source,
-            name=f"page-source-{test_name}",
-            attachment_type=allure.attachment_type.HTML,
-        )
-    except Exception:
-        pass
+    # Screenshot and page source are grabbed now; storing them happens in
+    # the background, once per distinct image / DOM. The paths go on the
+    # report for --native-report's evidence links.
+    paths = item.config._evidence.capture(item, driver)
+    if paths:
+        report.user_properties.append(("evidence", paths))
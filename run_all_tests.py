@@ -1,10 +1,15 @@
+import argparse
 import os
 import shutil
 import subprocess
 import sys
+import threading
 from datetime import datetime
 
 RESULTS_DIR = "reports/allure-results"
+NATIVE_DIR = "reports/native"
+SHARDS_DIR = "reports/shards"
+WORKERS_LOG = "reports/workers.json"
 REQ_FILE = "requirements.txt"
 
 
@@ -13,7 +18,158 @@ def in_venv() -> bool:
     return sys.prefix != getattr(sys, "base_prefix", sys.prefix)
 
 
+def shard_cmd(base_cmd: list[str], index: int, total: int, report: str) -> list[str]:
+    """pytest command for shard index/total, writing everything under reports/shards/<index>."""
+    shard_dir = os.path.join(SHARDS_DIR, str(index))
+    cmd = base_cmd + [
+        f"--shard={index}/{total}",
+        f"--shard-dir={shard_dir}",
+        f"--native-report={os.path.join(shard_dir, 'native')}",
+    ]
+    if report == "allure":
+        cmd.append(f"--alluredir={os.path.join(shard_dir, 'allure-results')}")
+    return cmd
+
+
+def _prefix_output(proc: subprocess.Popen, prefix: str) -> threading.Thread:
+    """Echo a process's output line by line, each line tagged with 'prefix'."""
+
+    def echo():
+        for line in proc.stdout:
+            print(f"{prefix} {line}", end="", flush=True)
+
+    thread = threading.Thread(target=echo, daemon=True)
+    thread.start()
+    return thread
+
+
+def run_local_shards(base_cmd: list[str], total: int, report: str) -> int:
+    """
+    Run every shard as its own process on this machine, then merge them.
+
+    Shard output is streamed with a "[shard i/N]" prefix. Returns non-zero
+    if a shard ended in a pytest error (interrupted, internal or usage
+    error, nothing collected) or the merge failed; failing tests alone are
+    expected for defective builds, as in a single run.
+    """
+    if os.path.exists(SHARDS_DIR):
+        shutil.rmtree(SHARDS_DIR)
+    procs = []
+    for index in range(1, total + 1):
+        cmd = shard_cmd(base_cmd, index, total, report)
+        print("Running:", " ".join(cmd))
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        procs.append((index, proc, _prefix_output(proc, f"[shard {index}/{total}]")))
+
+    status = 0
+    for index, proc, echo in procs:
+        proc.wait()
+        echo.join()
+        if proc.returncode == 1:
+            print(
+                f"shard {index}/{total} finished with failures (this can be expected for defective builds)"
+            )
+        elif proc.returncode != 0:
+            print(f"shard {index}/{total} failed: pytest exited with {proc.returncode}")
+            status = proc.returncode
+
+    shard_dirs = [os.path.join(SHARDS_DIR, str(index)) for index in range(1, total + 1)]
+    merge = subprocess.run(
+        [sys.executable, "-m", "src.utils.sharding", "merge", *shard_dirs, "--output", "reports"]
+    )
+    if merge.returncode != 0:
+        print(f"merging the shards failed (exit {merge.returncode})")
+        status = status or merge.returncode
+    return status
+
+
+def auto_workers() -> tuple[int, dict]:
+    """Calibrate on one build of the matrix with one worker and size the run from it."""
+    from src.utils.worker_sizing import (
+        CALIBRATION_SECONDS,
+        CALIBRATION_SLICE,
+        calibrate,
+        choose_workers,
+        cpu_count,
+        memory_mb,
+    )
+
+    calibration_cmd = [sys.executable, "-m", "pytest", *CALIBRATION_SLICE, "-n", "1"]
+    calibration_cmd += ["--maxfail=0", "--no-history", "-p", "no:cacheprovider"]
+    print(f"Calibrating for at least {CALIBRATION_SECONDS:g}s:", " ".join(calibration_cmd))
+    calibration = calibrate(calibration_cmd, min_seconds=CALIBRATION_SECONDS)
+    workers, config = choose_workers(cpu_count(), memory_mb(), calibration)
+
+    rss = calibration["worker_rss_mb"]
+    cpu = calibration["cpu_per_worker"]
+    print(
+        f"workers: {workers} (limited by {config['limited_by']}; limits {config['limits']}); "
+        f"calibration {calibration['cases']} cases at {calibration['cases_per_second']:.1f}/s, "
+        f"{'n/a' if cpu is None else f'{cpu:.2f}'} CPUs and {'n/a' if rss is None else f'{rss:.0f} MB'} per worker"
+    )
+    return workers, config
+
+
+def run_pytest(cmd: list[str], config: dict | None) -> subprocess.CompletedProcess:
+    """Run pytest; with an --workers=auto config, supervise the workers while it runs."""
+    if config is None:
+        print("Running:", " ".join(cmd))
+        return subprocess.run(cmd)
+
+    from src.utils.worker_sizing import (
+        WORKER_CONTROL_DIR,
+        WORKER_MEMORY_CEILING_MB,
+        WorkerMonitor,
+        save_log,
+    )
+
+    if os.path.exists(WORKER_CONTROL_DIR):
+        shutil.rmtree(WORKER_CONTROL_DIR)
+    ceiling = WORKER_MEMORY_CEILING_MB or 2 * (config["calibration"]["worker_rss_mb"] or 1024)
+    config["memory_ceiling_mb"] = ceiling
+    cmd = cmd + [f"--worker-control={WORKER_CONTROL_DIR}"]
+    print("Running:", " ".join(cmd))
+
+    monitor = WorkerMonitor(WORKER_CONTROL_DIR, ceiling).start()
+    try:
+        return subprocess.run(cmd)
+    finally:
+        monitor.stop()
+        save_log(WORKERS_LOG, config, monitor)
+        print(f"Worker configuration and events: {WORKERS_LOG}")
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the full regression suite and build the reports."
+    )
+    parser.add_argument(
+        "--report",
+        choices=("allure", "native"),
+        default="allure",
+        help="'native' skips Allure (no raw results, no JVM) and keeps only reports/native/index.html.",
+    )
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument(
+        "--shard",
+        metavar="i/N",
+        help="Run only shard i of N (one machine of a fleet); merge with 'python -m src.utils.sharding merge'.",
+    )
+    shard_group.add_argument(
+        "--shards",
+        type=int,
+        metavar="N",
+        help="Run N duration-balanced shards as parallel processes on this machine and merge them.",
+    )
+    parser.add_argument(
+        "--workers",
+        default="2",
+        help="xdist workers, or 'auto' to size them from a calibration run and supervise their memory.",
+    )
+    args = parser.parse_args()
+    if args.workers != "auto" and not args.workers.isdigit():
+        parser.error("--workers must be a number or 'auto'")
+
     os.makedirs("reports", exist_ok=True)
 
     # If requirements.txt exists, install it (this is safe to run multiple times)
@@ -33,20 +189,37 @@ def main() -> None:
         shutil.rmtree(RESULTS_DIR)
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
-    # Run pytest (2 workers, do not stop on first failure)
-    pytest_cmd = [
-        sys.executable,
-        "-m",
-        "pytest",
-        "-n",
-        "2",
-        "--maxfail=0",
-        "--alluredir=reports/allure-results",
-    ]
-    print("Running:", " ".join(pytest_cmd))
-    pytest_proc = subprocess.run(pytest_cmd)
-    if pytest_proc.returncode != 0:
-        print("pytest finished with failures (this can be expected for defective builds)")
+    base_cmd = [sys.executable, "-m", "pytest", "--maxfail=0"]
+
+    # The shard processes are the parallelism of --shards; no xdist inside them
+    workers, worker_config = args.workers, None
+    if args.workers == "auto" and not args.shards:
+        workers, worker_config = auto_workers()
+    xdist_args = ["-n", str(workers), "--build-scheduling"]
+
+    if args.shard:
+        # One shard of a fleet: leave merging and reporting to the merge step
+        index, total = (int(part) for part in args.shard.split("/"))
+        run_pytest(shard_cmd(base_cmd + xdist_args, index, total, args.report), worker_config)
+        print(f"Shard results are in {os.path.join(SHARDS_DIR, str(index))}")
+        return
+
+    if args.shards:
+        status = run_local_shards(base_cmd, args.shards, args.report)
+        if status:
+            sys.exit(status)
+    else:
+        # Run pytest (one build per worker at a time, do not stop on first failure)
+        pytest_cmd = base_cmd + xdist_args + [f"--native-report={NATIVE_DIR}"]
+        if args.report == "allure":
+            pytest_cmd.append(f"--alluredir={RESULTS_DIR}")
+        pytest_proc = run_pytest(pytest_cmd, worker_config)
+        if pytest_proc.returncode != 0:
+            print("pytest finished with failures (this can be expected for defective builds)")
+    print(f"Native report: {os.path.join(NATIVE_DIR, 'index.html')}")
+
+    if args.report == "native":
+        return
 
     # Generate timestamped report
     ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -1,5 +1,13 @@
 #!/usr/bin/env bash
 
+# REPORT=native skips Allure entirely (no raw results, no JVM):
+#   REPORT=native ./run_all_tests.sh
+REPORT="${REPORT:-allure}"
+# SHARD=i/N runs one duration-balanced shard into reports/shards/<i>; merge the
+# shard directories with: python -m src.utils.sharding merge reports/shards/*
+#   SHARD=1/2 ./run_all_tests.sh
+SHARD="${SHARD:-}"
+
 # Optional: use local venv if it exists
 if [ -d ".venv" ]; then
   # shellcheck disable=SC1091
@@ -21,11 +29,34 @@ fi
 rm -rf reports/allure-results
 mkdir -p reports/allure-results
 
+RESULTS_DIR=reports/allure-results
+NATIVE_DIR=reports/native
+SHARD_ARGS=()
+if [ -n "$SHARD" ]; then
+  SHARD_DIR="reports/shards/${SHARD%%/*}"
+  RESULTS_DIR="$SHARD_DIR/allure-results"
+  NATIVE_DIR="$SHARD_DIR/native"
+  SHARD_ARGS=(--shard="$SHARD" --shard-dir="$SHARD_DIR")
+fi
+
+ALLURE_ARGS=()
+if [ "$REPORT" = "allure" ]; then
+  ALLURE_ARGS=(--alluredir="$RESULTS_DIR")
+fi
+
 # Run pytest (allow failures so we can still generate the report)
 python -m pytest \
   -n 2 \
+  --build-scheduling \
   --maxfail=0 \
-  --alluredir=reports/allure-results || echo "pytest finished with failures (expected for defective builds)"
+  --native-report="$NATIVE_DIR" \
+  "${SHARD_ARGS[@]}" \
+  "${ALLURE_ARGS[@]}" || echo "pytest finished with failures (expected for defective builds)"
+
+echo "Native report: $NATIVE_DIR/index.html"
+if [ "$REPORT" = "native" ] || [ -n "$SHARD" ]; then
+  exit 0
+fi
 
 # Generate a timestamped allure report
 TS=$(date +"%Y-%m-%d_%H-%M-%S")
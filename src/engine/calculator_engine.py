@@ -0,0 +1,169 @@
+"""
+Python port of the synthetic calculator's build logic (src/synthetic/calculator.js).
+
+Evaluates (build, op, a, b, integer_only) directly, with JavaScript number
+semantics for parsing (Number("...")), arithmetic (IEEE-754 doubles) and
+display (Number.prototype.toString), so answers match the page character
+for character without a browser.
+
+Only build 0 (correct arithmetic) and build 9's missing controls describe
+the public calculator. The defects of builds 1-8 and the validation
+messages are the synthetic page's invented ones: engine outcomes for
+EMULATED_BUILDS are tagged as such and never recorded as verdicts.
+"""
+
+import math
+import re
+from decimal import Decimal
+
+# Operation values used by #selectOperationDropdown
+ADD, SUBTRACT, MULTIPLY, DIVIDE, CONCATENATE = range(5)
+
+# Builds exposed by #selectBuild; build 9 has no number2 field / calculate button
+ALL_BUILDS = list(range(0, 10))
+INCOMPLETE_BUILDS = {9}
+# Builds whose defects are emulated from src/synthetic/, not known from the AUT
+EMULATED_BUILDS = frozenset(range(1, 9))
+# user_properties set on --backend=engine tests of an emulated build (conftest.py)
+EMULATED_PROPERTY = "engine_emulated"
+
+# JavaScript StrDecimalLiteral (no underscores, no "inf"/"nan" spellings)
+_DECIMAL_RE = re.compile(r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$")
+_RADIX_RE = re.compile(r"^0(?:[xX][0-9a-fA-F]+|[oO][0-7]+|[bB][01]+)$")
+
+
+# JavaScript number semantics
+def js_to_number(text: str) -> float:
+    """
+    Equivalent of JavaScript Number(text) for strings.
+
+    Returns NaN for anything JavaScript would not parse.
+    """
+    s = text.strip()
+    if s == "":
+        return 0.0
+    if s in ("Infinity", "+Infinity"):
+        return math.inf
+    if s == "-Infinity":
+        return -math.inf
+    if _RADIX_RE.match(s):
+        return float(int(s, 0))
+    if _DECIMAL_RE.match(s):
+        return float(s)
+    return math.nan
+
+
+def js_number_to_string(x: float) -> str:
+    """
+    Equivalent of JavaScript String(x) for numbers (ECMAScript Number::toString).
+    """
+    if math.isnan(x):
+        return "NaN"
+    if x == 0:
+        return "0"
+    if x < 0:
+        return "-" + js_number_to_string(-x)
+    if math.isinf(x):
+        return "Infinity"
+
+    # repr() gives the shortest round-tripping digits, as JavaScript does
+    _, digit_tuple, exponent = Decimal(repr(x)).as_tuple()
+    digits = "".join(map(str, digit_tuple)).rstrip("0") or "0"
+    exponent += len(digit_tuple) - len(digits)
+
+    k = len(digits)
+    n = exponent + k
+
+    if k <= n <= 21:
+        return digits + "0" * (n - k)
+    if 0 < n <= 21:
+        return digits[:n] + "." + digits[n:]
+    if -6 < n <= 0:
+        return "0." + "0" * (-n) + digits
+
+    e = n - 1
+    sign = "+" if e >= 0 else "-"
+    mantissa = digits if k == 1 else digits[0] + "." + digits[1:]
+    return f"{mantissa}e{sign}{abs(e)}"
+
+
+def js_divide(x: float, y: float) -> float:
+    """IEEE-754 division, including the zero-divisor cases Python raises on."""
+    if y != 0:
+        return x / y
+    if x == 0 or math.isnan(x):
+        return math.nan
+    return math.copysign(math.inf, x) * math.copysign(1.0, y)
+
+
+def js_trunc(x: float) -> float:
+    """Math.trunc()"""
+    if math.isnan(x) or math.isinf(x):
+        return x
+    return float(math.trunc(x))
+
+
+def js_round(x: float) -> float:
+    """Math.round(): halves round towards +Infinity."""
+    if math.isnan(x) or math.isinf(x):
+        return x
+    r = math.floor(x)
+    if x - r >= 0.5:
+        r += 1
+    return float(r)
+
+
+def is_number(text: str) -> bool:
+    """Input validation used by the page before any arithmetic."""
+    return text.strip() != "" and not math.isnan(js_to_number(text))
+
+
+# Build logic
+def calculate(build: int, op: int, a: str, b: str, integer_only: bool = False) -> tuple[str, str]:
+    """
+    Evaluate one calculation exactly as the given build of the page would.
+
+    Returns:
+        (answer, error) - the #numberAnswerField value and #errorMsgField text.
+    """
+    build = int(build)
+    op = int(op)
+    a = str(a)
+    b = str(b)
+
+    if op == CONCATENATE:
+        return (b + a if build == 8 else a + b), ""
+
+    if not is_number(a):
+        return "", "Number 1 is not a number"
+    if not is_number(b):
+        return "", "Number 2 is not a number"
+
+    x = js_to_number(a)
+    y = js_to_number(b)
+    if build == 6:
+        y = abs(y)
+
+    if op == ADD:
+        if build == 4:
+            return a + b, ""
+        result = x + y
+    elif op == SUBTRACT:
+        result = y - x if build == 1 else x - y
+    elif op == MULTIPLY:
+        result = js_trunc(x) * js_trunc(y) if build == 2 else x * y
+    elif op == DIVIDE:
+        if y == 0 and build != 7:
+            return "", "Divide by zero error!"
+        result = js_divide(x, y)
+        if build == 7 and math.isfinite(result):
+            result = js_trunc(result * 100) / 100
+    else:
+        return "", "Unknown operation"
+
+    if build == 5:
+        result = js_round(result)
+    if integer_only and build != 3:
+        result = js_trunc(result)
+
+    return js_number_to_string(result), ""
@@ -0,0 +1,135 @@
+"""
+Reference oracle for differential fuzzing.
+
+Computes what a correct calculator shows for large batches of
+(op, a, b, integer_only) inputs, with JavaScript number semantics: operands
+parse like Number(), arithmetic is IEEE-754 double precision (NumPy float64
+arrays, evaluated a whole batch at a time) and answers format like
+Number.prototype.toString. Each distinct operand string is parsed once and
+each distinct result formatted once per batch.
+
+NumPy is optional; without it the same rules are applied case by case. It
+is imported on the first batch rather than at import time, so collecting
+the tests that import this module does not pay for it.
+"""
+
+import math
+
+from src.engine.calculator_engine import (
+    ADD,
+    CONCATENATE,
+    DIVIDE,
+    MULTIPLY,
+    SUBTRACT,
+    js_divide,
+    js_number_to_string,
+    js_to_number,
+    js_trunc,
+)
+
+np = None
+_numpy_checked = False
+
+
+def _numpy():
+    """The numpy module, imported on first use, or None when it is not installed."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover - exercised when numpy is absent
+            np = None
+    return np
+
+
+NOT_A_NUMBER_1 = "Number 1 is not a number"
+NOT_A_NUMBER_2 = "Number 2 is not a number"
+DIVIDE_BY_ZERO = "Divide by zero error!"
+
+
+def _parse(text: str) -> float:
+    """Number(text), or NaN for input the page rejects (blank or not numeric)."""
+    return js_to_number(text) if text.strip() else math.nan
+
+
+def expected_one(op: int, a: str, b: str, integer_only: bool = False) -> tuple[str, str]:
+    """Expected (answer, error) for one input."""
+    op = int(op)
+    if op == CONCATENATE:
+        return a + b, ""
+
+    x, y = _parse(a), _parse(b)
+    if math.isnan(x):
+        return "", NOT_A_NUMBER_1
+    if math.isnan(y):
+        return "", NOT_A_NUMBER_2
+    if op == DIVIDE and y == 0:
+        return "", DIVIDE_BY_ZERO
+
+    if op == ADD:
+        result = x + y
+    elif op == SUBTRACT:
+        result = x - y
+    elif op == MULTIPLY:
+        result = x * y
+    else:
+        result = js_divide(x, y)
+
+    if integer_only:
+        result = js_trunc(result)
+    return js_number_to_string(result), ""
+
+
+def expected_batch(cases) -> list[tuple[str, str]]:
+    """
+    Expected (answer, error) for every (op, a, b, integer_only) in 'cases'.
+    """
+    cases = list(cases)
+    if _numpy() is None or not cases:
+        return [expected_one(*case) for case in cases]
+
+    ops, a_values, b_values, integer_flags = zip(*cases)
+    parsed: dict[str, float] = {}
+
+    def parse_all(values):
+        for text in values:
+            if text not in parsed:
+                parsed[text] = _parse(text)
+        return np.fromiter((parsed[text] for text in values), dtype=np.float64, count=len(values))
+
+    op = np.asarray(ops, dtype=np.int8)
+    x = parse_all(a_values)
+    y = parse_all(b_values)
+
+    with np.errstate(all="ignore"):
+        result = np.select(
+            [op == ADD, op == SUBTRACT, op == MULTIPLY, op == DIVIDE],
+            [x + y, x - y, x * y, x / y],
+            default=np.nan,
+        )
+    result = np.where(np.asarray(integer_flags, dtype=bool), np.trunc(result), result)
+
+    concatenate = op == CONCATENATE
+    bad_a = ~concatenate & np.isnan(x)
+    bad_b = ~concatenate & ~bad_a & np.isnan(y)
+    divide_by_zero = ~concatenate & ~bad_a & ~bad_b & (op == DIVIDE) & (y == 0)
+    numeric = ~(concatenate | bad_a | bad_b | divide_by_zero)
+
+    # -0.0 and 0.0 share a key, and both format as "0"
+    formatted = {value: js_number_to_string(float(value)) for value in np.unique(result[numeric])}
+
+    expected = []
+    for i in range(len(cases)):
+        if concatenate[i]:
+            expected.append((a_values[i] + b_values[i], ""))
+        elif bad_a[i]:
+            expected.append(("", NOT_A_NUMBER_1))
+        elif bad_b[i]:
+            expected.append(("", NOT_A_NUMBER_2))
+        elif divide_by_zero[i]:
+            expected.append(("", DIVIDE_BY_ZERO))
+        else:
+            value = result[i]
+            expected.append(("NaN" if np.isnan(value) else formatted[value], ""))
+    return expected
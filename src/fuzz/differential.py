@@ -0,0 +1,420 @@
+"""
+Differential fuzzing of calculator builds against the reference oracle.
+
+    python -m src.fuzz.differential --cases 1000000 --builds 1-8 --backend engine
+    python -m src.fuzz.differential --cases 20000 --backend selenium [--base-url=URL] --write-back
+
+Random (op, a, b, integer_only) inputs, biased towards float boundaries,
+scientific notation, negatives, long concatenation strings and non-numeric
+text, are run through the backend's batch path (CalculatorPage.run_cases:
+one script call per build per batch) and compared with
+src/engine/oracle.expected_batch. The first mismatch of each kind is
+shrunk to a minimal reproducer.
+
+--write-back appends the reproducers to data/arithmetic_cases.json (plain
+answers) or data/edge_cases.csv (integer-only cases and error messages).
+It needs --backend selenium against the AUT (BASE_URL or --base-url): the
+engine's builds 1-8 are emulated, so their mismatches say nothing about the
+AUT, and each expectation is only written once the AUT's own prototype
+(build 0) gives the same answer as the oracle.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import string
+import sys
+import time
+from itertools import islice
+
+from src.engine.calculator_engine import ALL_BUILDS, CONCATENATE, DIVIDE, INCOMPLETE_BUILDS
+from src.engine.oracle import expected_batch
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ARITHMETIC_CASES = os.path.join(ROOT_DIR, "data", "arithmetic_cases.json")
+EDGE_CASES = os.path.join(ROOT_DIR, "data", "edge_cases.csv")
+
+OP_NAMES = {0: "add", 1: "subtract", 2: "multiply", 3: "divide", 4: "concatenate"}
+
+BOUNDARY_VALUES = (
+    "0",
+    "-0",
+    "1",
+    "-1",
+    "0.1",
+    "0.2",
+    "0.3",
+    "0.5",
+    "1.5",
+    "2.5",
+    "-2.5",
+    "5e-324",
+    "2.2250738585072014e-308",
+    "1.7976931348623157e308",
+    "9007199254740991",
+    "9007199254740992",
+    "9007199254740993",
+    "1e21",
+    "1e-7",
+    "1e-6",
+    "0.000001",
+    "123456789.123456789",
+    "999999999999999999999",
+)
+NON_NUMERIC = (
+    "",
+    " ",
+    "abc",
+    "1,000",
+    "1.2.3",
+    "--1",
+    "1e",
+    "e5",
+    "NaN",
+    "12abc",
+    "+",
+    ".",
+    "Infinity",
+    "-Infinity",
+    "0x1F",
+    "0b101",
+    "0o17",
+    "1_000",
+)
+# No '|' (expected-value separator in the CSV) and no control characters
+_TEXT_ALPHABET = string.ascii_letters + string.digits + " .-+e"
+
+# Candidate operands tried first when shrinking
+_SIMPLE_OPERANDS = ("0", "1", "2", "-1", "10")
+
+
+# Input generation
+def _random_number(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.2:
+        return rng.choice(BOUNDARY_VALUES)
+    if kind < 0.4:
+        return str(rng.randint(-1000, 1000))
+    if kind < 0.55:
+        return str(rng.randint(-(10**20), 10**20))
+    if kind < 0.8:
+        digits = rng.randint(1, 17)
+        return f"{rng.uniform(-1000, 1000):.{digits}f}".rstrip("0").rstrip(".") or "0"
+    mantissa = f"{rng.uniform(-10, 10):.{rng.randint(0, 6)}f}"
+    return f"{mantissa}{rng.choice('eE')}{rng.randint(-330, 330)}"
+
+
+def _random_operand(rng: random.Random, op: int) -> str:
+    if op == CONCATENATE and rng.random() < 0.3:
+        return "".join(rng.choices(_TEXT_ALPHABET, k=rng.randint(50, 2000)))
+    if rng.random() < 0.12:
+        return rng.choice(NON_NUMERIC)
+    return _random_number(rng)
+
+
+def generate_cases(count: int, seed: int = 0):
+    """Yield 'count' random (op, a, b, integer_only) inputs, reproducibly for a seed."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        op = rng.randrange(len(OP_NAMES))
+        a = _random_operand(rng, op)
+        b = "0" if op == DIVIDE and rng.random() < 0.05 else _random_operand(rng, op)
+        yield op, a, b, op != CONCATENATE and rng.random() < 0.3
+
+
+def _batches(iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# Comparison and shrinking
+def _observed(result: dict) -> tuple[str, str]:
+    if result.get("alert"):
+        return "", result["alert"]
+    return result["answer"] or "", result["error"] or ""
+
+
+def _signature(build: int, case, expected, actual) -> tuple:
+    """What kind of mismatch this is, so each kind is shrunk once."""
+    op, _, _, integer_only = case
+    return build, op, integer_only, bool(expected[1]), bool(actual[1])
+
+
+def _size(case) -> tuple:
+    op, a, b, integer_only = case
+    return len(a) + len(b), int(integer_only), a, b
+
+
+def _simplifications(case):
+    op, a, b, integer_only = case
+    if integer_only:
+        yield op, a, b, False
+    for position, operand in ((0, a), (1, b)):
+        candidates = list(_SIMPLE_OPERANDS)
+        if len(operand) > 1:
+            half = len(operand) // 2
+            candidates += [operand[:half], operand[half:], operand[1:], operand[:-1]]
+            if "." in operand:
+                candidates.append(operand.split(".")[0])
+            if operand.startswith("-"):
+                candidates.append(operand[1:])
+        for candidate in candidates:
+            yield (
+                (op, candidate, b, integer_only)
+                if position == 0
+                else (op, a, candidate, integer_only)
+            )
+
+
+def shrink(case, still_fails, max_checks: int = 500):
+    """
+    Greedily simplify a failing input while still_fails(candidate) holds.
+
+    Only strictly smaller candidates (shorter operands, then integer-only
+    off, then lexicographically smaller) are accepted, so this terminates.
+    """
+    checks = 0
+    improved = True
+    while improved and checks < max_checks:
+        improved = False
+        for candidate in _simplifications(case):
+            if _size(candidate) >= _size(case):
+                continue
+            checks += 1
+            if still_fails(candidate):
+                case = candidate
+                improved = True
+                break
+    return case
+
+
+def run_differential(
+    page, builds, count: int, seed: int = 0, batch_size: int = 1000, max_reproducers: int = 50
+):
+    """
+    Fuzz 'builds' through page.run_cases() and shrink one mismatch per kind.
+
+    Returns (stats, reproducers): stats is {build: {"cases", "mismatches"}},
+    reproducers a list of {"build", "case", "expected", "actual"} dicts with
+    minimal inputs.
+    """
+    builds = [b for b in builds if b not in INCOMPLETE_BUILDS]
+    stats = {b: {"cases": 0, "mismatches": 0} for b in builds}
+    first_by_signature = {}
+
+    for batch in _batches(generate_cases(count, seed), batch_size):
+        expected = expected_batch(batch)
+        for build in builds:
+            results = page.run_cases(build, batch)
+            stats[build]["cases"] += len(batch)
+            for case, want, result in zip(batch, expected, results):
+                if result["missing"]:
+                    continue
+                got = _observed(result)
+                if got == want:
+                    continue
+                stats[build]["mismatches"] += 1
+                signature = _signature(build, case, want, got)
+                if (
+                    signature not in first_by_signature
+                    and len(first_by_signature) < max_reproducers
+                ):
+                    first_by_signature[signature] = case
+
+    reproducers = []
+    for signature, case in first_by_signature.items():
+        build = signature[0]
+
+        def still_fails(candidate, build=build, signature=signature):
+            want = expected_batch([candidate])[0]
+            got = _observed(page.run_cases(build, [candidate])[0])
+            return got != want and _signature(build, candidate, want, got) == signature
+
+        minimal = shrink(case, still_fails)
+        reproducers.append(
+            {
+                "build": build,
+                "case": minimal,
+                "expected": expected_batch([minimal])[0],
+                "actual": _observed(page.run_cases(build, [minimal])[0]),
+            }
+        )
+    return stats, reproducers
+
+
+# Write-back
+def confirmed_on_prototype(page, reproducers) -> tuple[list[dict], list[dict]]:
+    """
+    Split reproducers into those whose oracle expectation the page's build 0
+    reproduces and those it does not (the oracle is wrong there, so the
+    expectation must not become test data).
+    """
+    if not reproducers:
+        return [], []
+    results = page.run_cases(0, [r["case"] for r in reproducers])
+    confirmed, rejected = [], []
+    for reproducer, result in zip(reproducers, results):
+        agrees = not result["missing"] and _observed(result) == tuple(reproducer["expected"])
+        (confirmed if agrees else rejected).append(reproducer)
+    return confirmed, rejected
+
+
+def write_back(
+    reproducers, json_path: str = ARITHMETIC_CASES, csv_path: str = EDGE_CASES
+) -> tuple[int, int]:
+    """
+    Append reproducers as new data rows, skipping inputs already present.
+
+    Cases with an expected answer go to the arithmetic JSON (fanned out over
+    every build); integer-only cases and expected error messages go to the
+    edge-case CSV, which has those columns. Returns (json_rows, csv_rows) added.
+    """
+    with open(json_path, encoding="utf-8") as f:
+        json_rows = json.load(f)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        csv_rows = list(reader)
+
+    seen_json = {(int(r["op"]), str(r["a"]), str(r["b"])) for r in json_rows}
+    seen_csv = {
+        (int(r["op"]), r["a"], r["b"], r["integer_only"].lower() == "true") for r in csv_rows
+    }
+    new_json, new_csv = [], []
+
+    for reproducer in reproducers:
+        op, a, b, integer_only = reproducer["case"]
+        answer, error = reproducer["expected"]
+        note = f"fuzz reproducer, build {reproducer['build']} gave {reproducer['actual'][0] or reproducer['actual'][1]!r}"
+
+        if integer_only or error:
+            expected = error or answer
+            if not expected or (op, a, b, integer_only) in seen_csv:
+                continue
+            seen_csv.add((op, a, b, integer_only))
+            new_csv.append(
+                {
+                    "build": reproducer["build"],
+                    "op": op,
+                    "a": a,
+                    "b": b,
+                    "integer_only": str(integer_only).lower(),
+                    "expected": expected,
+                    "notes": note,
+                }
+            )
+        else:
+            if (op, a, b) in seen_json:
+                continue
+            seen_json.add((op, a, b))
+            new_json.append(
+                {
+                    "desc": f"fuzz {OP_NAMES[op]} {a!r} {b!r} (build {reproducer['build']})",
+                    "op": op,
+                    "a": a,
+                    "b": b,
+                    "expected": answer,
+                }
+            )
+
+    if new_json:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(json_rows + new_json, f, indent=2)
+            f.write("\n")
+    if new_csv:
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=fieldnames).writerows(new_csv)
+    return len(new_json), len(new_csv)
+
+
+# Command line
+def _parse_builds(spec: str) -> list[int]:
+    builds = []
+    for part in spec.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            builds.extend(range(int(start), int(end) + 1))
+        elif part.strip():
+            builds.append(int(part))
+    return builds
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Differential fuzzing of calculator builds.")
+    parser.add_argument("--cases", type=int, default=100_000, help="Random inputs per build.")
+    parser.add_argument("--builds", type=_parse_builds, default=[b for b in ALL_BUILDS if b != 0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=("selenium", "engine"), default="engine")
+    parser.add_argument(
+        "--base-url", default=None, help="AUT page for --backend selenium (default: BASE_URL)."
+    )
+    parser.add_argument("--batch-size", type=int, default=None, help="Cases per run_cases() call.")
+    parser.add_argument("--max-reproducers", type=int, default=50)
+    parser.add_argument(
+        "--write-back",
+        action="store_true",
+        help="Append reproducers confirmed on the AUT's build 0 to the data files (--backend selenium only).",
+    )
+    args = parser.parse_args(argv)
+    if args.write_back and args.backend != "selenium":
+        parser.error("--write-back needs --backend selenium: the engine's builds 1-8 are emulated")
+    if args.base_url and args.backend != "selenium":
+        parser.error("--base-url applies to --backend selenium")
+
+    driver = None
+    if args.backend == "selenium":
+        from src.pages.calculator_page import CalculatorPage
+        from src.utils.web import BASE_URL, create_driver
+
+        driver = create_driver()
+        page = CalculatorPage(driver).open(args.base_url or BASE_URL)
+        batch_size = args.batch_size or 500
+    else:
+        from src.pages.engine_page import EngineCalculatorPage
+
+        page = EngineCalculatorPage().open("")
+        batch_size = args.batch_size or 10_000
+
+    started = time.perf_counter()
+    try:
+        stats, reproducers = run_differential(
+            page, args.builds, args.cases, args.seed, batch_size, args.max_reproducers
+        )
+        elapsed = time.perf_counter() - started
+        if args.write_back:
+            confirmed, rejected = confirmed_on_prototype(page, reproducers)
+    finally:
+        if driver is not None:
+            driver.quit()
+
+    total = sum(s["cases"] for s in stats.values())
+    print(f"{total} cases in {elapsed:.1f}s ({total / elapsed:,.0f} cases/s)")
+    for build, s in stats.items():
+        print(f"build {build}: {s['mismatches']} mismatches in {s['cases']} cases")
+    for r in reproducers:
+        op, a, b, integer_only = r["case"]
+        print(
+            f"build {r['build']}: {OP_NAMES[op]}({a!r}, {b!r}, integer_only={integer_only}) "
+            f"expected {r['expected']} got {r['actual']}"
+        )
+
+    if args.write_back:
+        for r in rejected:
+            op, a, b, integer_only = r["case"]
+            print(
+                f"not written back: build 0 does not give the oracle's {r['expected']} for "
+                f"{OP_NAMES[op]}({a!r}, {b!r}, integer_only={integer_only})"
+            )
+        if confirmed:
+            added_json, added_csv = write_back(confirmed)
+            print(
+                f"Added {added_json} rows to {ARITHMETIC_CASES} and {added_csv} rows to {EDGE_CASES}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+asyncio-native calculator page driven over the Chrome DevTools Protocol.
+
+One websocket to the browser multiplexes many isolated browser contexts
+(each with its own tab), so a single process can run dozens of calculator
+pages concurrently instead of one browser per xdist worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import urllib.request
+
+import websockets
+
+from src.pages.calculator_page import RUN_CASES_JS, resolve_batch_results
+
+# RUN_CASES_JS is written for execute_async_script (arguments + callback);
+# wrap it so CDP can await it as a promise.
+_RUN_CASES_EXPRESSION = """
+new Promise(function (resolve, reject) {
+    try {
+        (function () { %s }).apply(null, [%s, %s, resolve]);
+    } catch (e) {
+        reject(e);
+    }
+})
+"""
+
+_READY_EXPRESSION = (
+    "(document.readyState === 'interactive' || document.readyState === 'complete')"
+    " && !!document.getElementById('selectBuild')"
+)
+
+
+class CDPError(RuntimeError):
+    """A DevTools command returned an error or a script threw."""
+
+
+def browser_ws_url(driver) -> str:
+    """
+    Return the browser-level DevTools websocket URL of a Selenium Chrome driver.
+    """
+    address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+    with urllib.request.urlopen(f"http://{address}/json/version", timeout=10) as resp:
+        return json.load(resp)["webSocketDebuggerUrl"]
+
+
+class CDPConnection:
+    """
+    A single DevTools websocket with request/response matching.
+
+    Commands for different tabs share the socket and are told apart by
+    sessionId (Target.attachToTarget with flatten=True).
+    """
+
+    def __init__(self, websocket) -> None:
+        self._ws = websocket
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, ws_url: str) -> CDPConnection:
+        websocket = await websockets.connect(ws_url, max_size=None)
+        return cls(websocket)
+
+    async def send(
+        self, method: str, params: dict | None = None, session_id: str | None = None
+    ) -> dict:
+        message_id = next(self._ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        await self._ws.send(json.dumps(message))
+        return await future
+
+    async def close(self) -> None:
+        self._reader.cancel()
+        await self._ws.close()
+
+    async def _read_loop(self) -> None:
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                future = self._pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    # Events (no id) are not used by this page object
+                    continue
+                if "error" in message:
+                    future.set_exception(
+                        CDPError(message["error"].get("message", str(message["error"])))
+                    )
+                else:
+                    future.set_result(message.get("result", {}))
+        except websockets.ConnectionClosed as e:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError(f"DevTools connection closed: {e}"))
+            self._pending.clear()
+
+
+class AsyncCalculatorPage:
+    """
+    Calculator page in its own isolated browser context, driven over CDP.
+
+    Exposes the batch API (run_cases) with the same result format as
+    CalculatorPage.run_cases, since one awaited script per build is what
+    makes running many contexts concurrently worthwhile.
+    """
+
+    def __init__(
+        self, connection: CDPConnection, context_id: str, target_id: str, session_id: str
+    ) -> None:
+        self.connection = connection
+        self.context_id = context_id
+        self.target_id = target_id
+        self.session_id = session_id
+
+    @classmethod
+    async def create(cls, connection: CDPConnection) -> AsyncCalculatorPage:
+        """Open a fresh incognito-style context with one blank tab."""
+        context = await connection.send("Target.createBrowserContext", {"disposeOnDetach": True})
+        context_id = context["browserContextId"]
+        target = await connection.send(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+        )
+        attached = await connection.send(
+            "Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}
+        )
+        return cls(connection, context_id, target["targetId"], attached["sessionId"])
+
+    async def evaluate(self, expression: str, await_promise: bool = False):
+        result = await self.connection.send(
+            "Runtime.evaluate",
+            {"expression": expression, "awaitPromise": await_promise, "returnByValue": True},
+            session_id=self.session_id,
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description") or details.get("text"))
+        return result["result"].get("value")
+
+    # Navigation
+    async def open(self, base_url: str, timeout: float = 30) -> AsyncCalculatorPage:
+        await self.connection.send("Page.navigate", {"url": base_url}, session_id=self.session_id)
+
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not await self.evaluate(_READY_EXPRESSION):
+            if asyncio.get_running_loop().time() > deadline:
+                raise TimeoutError(f"Calculator did not load within {timeout}s: {base_url}")
+            await asyncio.sleep(0.05)
+        return self
+
+    # Batch execution
+    async def run_cases(self, build_value: int | str, cases) -> list[dict]:
+        """Async equivalent of CalculatorPage.run_cases()."""
+        payload = [
+            [str(op), str(a), str(b), bool(integer_only)] for op, a, b, integer_only in cases
+        ]
+        expression = _RUN_CASES_EXPRESSION % (
+            RUN_CASES_JS,
+            json.dumps(str(build_value)),
+            json.dumps(payload),
+        )
+        raw = await self.evaluate(expression, await_promise=True)
+        return resolve_batch_results(raw)
+
+    async def close(self) -> None:
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+        await self.connection.send(
+            "Target.disposeBrowserContext", {"browserContextId": self.context_id}
+        )
+
+
+async def run_matrix(ws_url: str, base_url: str, work: dict, contexts: int = 8) -> dict:
+    """
+    Run {build: [(op, a, b, integer_only), ...]} across 'contexts' concurrent
+    browser contexts of one browser. Returns {build: results}; a build whose
+    batch failed maps to the exception instead.
+    """
+    connection = await CDPConnection.connect(ws_url)
+    queue: asyncio.Queue = asyncio.Queue()
+    for build, cases in work.items():
+        queue.put_nowait((build, cases))
+
+    results = {}
+
+    async def worker():
+        page = await AsyncCalculatorPage.create(connection)
+        try:
+            await page.open(base_url)
+            while True:
+                try:
+                    build, cases = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results[build] = await page.run_cases(build, cases)
+                except (CDPError, TimeoutError) as e:
+                    results[build] = e
+        finally:
+            await page.close()
+
+    try:
+        # A context that fails to load just stops; the others drain the queue
+        outcomes = await asyncio.gather(
+            *(worker() for _ in range(max(1, min(contexts, len(work))))),
+            return_exceptions=True,
+        )
+    finally:
+        await connection.close()
+
+    for build in work:
+        if build not in results:
+            errors = [o for o in outcomes if isinstance(o, BaseException)]
+            results[build] = CDPError(f"No browser context could run build {build}: {errors[:1]}")
+    return results
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+
+class CalculatorBackend(Protocol):
+    """
+    Interface shared by every calculator page implementation.
+
+    CalculatorPage drives the real page through Selenium; EngineCalculatorPage
+    evaluates the same calls in-process. Tests only use these methods, so the
+    calc fixture can hand them either one (see --backend).
+    """
+
+    def open(self, base_url: str) -> CalculatorBackend: ...
+
+    def reset(self, base_url: str) -> bool: ...
+
+    def is_calculator_complete(self, timeout: int = 2) -> bool: ...
+
+    def capabilities(self) -> dict: ...
+
+    def choose_build(self, build_value: int | str) -> CalculatorBackend: ...
+
+    def set_numbers(self, a: str, b: str) -> CalculatorBackend: ...
+
+    def choose_operation(self, op_value: int | str) -> CalculatorBackend: ...
+
+    def set_integer_only(self, enabled: bool) -> CalculatorBackend: ...
+
+    def calculate(self) -> CalculatorBackend: ...
+
+    def read_answer(self) -> str: ...
+
+    def run_cases(self, build_value: int | str, cases, timeout: int = 30) -> list[dict]: ...
@@ -1,16 +1,204 @@
 from __future__ import annotations
 
+import contextlib
+import weakref
+
 from selenium.common.exceptions import (
+    ElementNotInteractableException,
     NoAlertPresentException,
     NoSuchElementException,
+    StaleElementReferenceException,
     TimeoutException,
+    WebDriverException,
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
 
-from src.utils.waits import wait_clickable, wait_visible
+from src.utils import page_load
+from src.utils.browser_profile import BROWSER_PROFILE
+from src.utils.capabilities import CAPABILITIES_JS
+from src.utils.instrumentation import instrument_driver, traced
+from src.utils.waits import wait_clickable, wait_for_alert_or_js, wait_visible
+
+
+def resolve_batch_results(raw: list[dict]) -> list[dict]:
+    """
+    Turn RUN_CASES_JS output into run_cases() results, resolving each answer
+    in the same order as read_answer(): alert, answer field, body text.
+    """
+    results = []
+    for item in raw:
+        if item["alert"]:
+            answer = item["alert"]
+        elif item["answer"] is not None:
+            answer = item["answer"]
+        else:
+            answer = item["body"]
+        results.append(
+            {
+                "missing": item["missing"],
+                "alert": item["alert"],
+                "error": item["error"],
+                "answer": answer,
+            }
+        )
+    return results
+
+
+# Snapshot of the calculator output, and the in-page condition calculate()
+# waits on: true once either differs from the snapshot taken before the click.
+ANSWER_STATE_JS = """
+var answer = document.getElementById("numberAnswerField");
+var error = document.getElementById("errorMsgField");
+return [answer ? answer.value : null, error ? error.textContent : null];
+"""
+
+ANSWER_CHANGED_JS = """
+var answer = document.getElementById("numberAnswerField");
+var error = document.getElementById("errorMsgField");
+var now = [answer ? answer.value : null, error ? error.textContent : null];
+return (now[0] !== args[0] || now[1] !== args[1]) ? now : null;
+"""
+
+# In-page reset used by CalculatorPage.reset().
+# Returns the page to its freshly-loaded state and reports whether the core
+# controls are present, so the caller can fall back to a full reload.
+RESET_JS = """
+function byId(id) { return document.getElementById(id); }
+function fire(el, type) { el.dispatchEvent(new Event(type, { bubbles: true })); }
+function setValue(el, value) {
+    if (!el) { return; }
+    el.value = value;
+    fire(el, "input");
+    fire(el, "change");
+}
+
+var build = byId("selectBuild");
+if (!build) { return false; }
+
+setValue(build, "0");
+setValue(byId("selectOperationDropdown"), "0");
+setValue(byId("number1Field"), "");
+setValue(byId("number2Field"), "");
+setValue(byId("numberAnswerField"), "");
+
+var error = byId("errorMsgField");
+if (error) { error.textContent = ""; }
+
+var integerOnly = byId("integerSelect");
+if (integerOnly && integerOnly.checked) { integerOnly.click(); }
+
+return build.value === "0"
+    && !!byId("number1Field")
+    && !!byId("number2Field")
+    && !!byId("calculateButton")
+    && !!byId("numberAnswerField")
+    && !(integerOnly && integerOnly.checked);
+"""
+
+# In-page batch runner used by CalculatorPage.run_cases().
+# Fires the same input/change/click events a user would, captures window.alert
+# instead of letting it block the page, and reports everything in one array.
+RUN_CASES_JS = """
+var build = arguments[0];
+var cases = arguments[1];
+var done = arguments[arguments.length - 1];
+
+function byId(id) { return document.getElementById(id); }
+function fire(el, type) { el.dispatchEvent(new Event(type, { bubbles: true })); }
+function setValue(el, value) { el.value = value; fire(el, "input"); fire(el, "change"); }
+function visible(el) {
+    return !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+
+var nativeAlert = window.alert;
+var alertText = null;
+window.alert = function (msg) { alertText = String(msg); };
+
+var results = [];
+
+function finish() {
+    window.alert = nativeAlert;
+    done(results);
+}
+
+function runCase(index) {
+    if (index >= cases.length) {
+        finish();
+        return;
+    }
+    var c = cases[index];
+    var n1 = byId("number1Field");
+    var n2 = byId("number2Field");
+    var button = byId("calculateButton");
+
+    if (!visible(n1) || !visible(n2) || !visible(button)) {
+        results.push({ missing: true, alert: null, answer: null, error: "", body: "" });
+    } else {
+        alertText = null;
+        setValue(n1, c[1]);
+        setValue(n2, c[2]);
+        setValue(byId("selectOperationDropdown"), String(c[0]));
+
+        var integerOnly = byId("integerSelect");
+        if (visible(integerOnly) && integerOnly.checked !== !!c[3]) {
+            integerOnly.click();
+        }
+
+        button.click();
+
+        var answer = byId("numberAnswerField");
+        var error = byId("errorMsgField");
+        var answerVisible = visible(answer);
+        results.push({
+            missing: false,
+            alert: alertText,
+            answer: answerVisible ? answer.value : null,
+            error: error ? (error.innerText || "").trim() : "",
+            body: answerVisible ? "" : (document.body.innerText || "").trim()
+        });
+    }
+    setTimeout(function () { runCase(index + 1); }, 0);
+}
+
+try {
+    setValue(byId("selectBuild"), String(build));
+    setTimeout(function () { runCase(0); }, 0);
+} catch (e) {
+    window.alert = nativeAlert;
+    throw e;
+}
+"""
+
+
+class ElementCache:
+    """
+    WebElement handles (and Select wrappers) resolved once per page load.
+
+    Shared by every CalculatorPage on the same driver, so handles survive
+    across tests while the page stays loaded (see reset()). Stale handles are
+    dropped and re-resolved by CalculatorPage._interact().
+    """
+
+    def __init__(self) -> None:
+        self.elements = {}
+        self.selects = {}
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, keep=()) -> None:
+        self.elements = {k: v for k, v in self.elements.items() if k in keep}
+        self.selects = {k: v for k, v in self.selects.items() if k in keep}
+
+    def discard(self, locator) -> None:
+        self.elements.pop(locator, None)
+        self.selects.pop(locator, None)
+
+
+# One cache per live driver; entries disappear with the driver
+_ELEMENT_CACHES: weakref.WeakKeyDictionary[WebDriver, ElementCache] = weakref.WeakKeyDictionary()
 
 
 class CalculatorPage:
@@ -36,98 +224,219 @@ class CalculatorPage:
     # Fallback locator for inline error text
     PAGE_BODY = (By.TAG_NAME, "body")
 
+    # is_calculator_complete() result per build, shared by every page in this
+    # worker process, so each build is probed at most once per worker.
+    _completeness_by_build: dict[str, bool] = {}
+
     def __init__(self, driver: WebDriver) -> None:
-        self.driver = driver
+        self.driver = instrument_driver(driver)
         self._last_alert_text: str | None = None
+        self._build: str | None = None
+        self.element_cache = _ELEMENT_CACHES.setdefault(driver, ElementCache())
 
     # Navigation
+    @traced("step")
     def open(self, base_url: str) -> "CalculatorPage":
         """
         Open the calculator page and wait until it is ready.
         Retries once on TimeoutException due to intermittent site slowness.
+        The load's Navigation Timing is recorded in src.utils.page_load.LOADS.
         """
         try:
             self.driver.get(base_url)
         except TimeoutException:
             self.driver.get(base_url)
 
+        # New document: every cached handle belongs to the old one
+        self.element_cache.invalidate()
         wait_visible(self.driver, self.SELECT_BUILD)
+        with contextlib.suppress(WebDriverException):
+            page_load.record(
+                self.driver.execute_script(page_load.NAVIGATION_TIMING_JS), BROWSER_PROFILE
+            )
         return self
 
+    @traced("step")
+    def reset(self, base_url: str) -> bool:
+        """
+        Restore a clean state without reloading the page: build 0, empty
+        number and answer fields, 'Integers only' unticked, no pending alert.
+
+        Returns False when the browser is on a different URL or the sanity
+        check fails, in which case the caller should fall back to open().
+        """
+        self._last_alert_text = None
+        try:
+            self._dismiss_alert()
+            if self.driver.current_url != base_url:
+                return False
+            if not self.driver.execute_script(RESET_JS):
+                return False
+        except WebDriverException:
+            return False
+
+        # Back on build 0, whose controls may differ from the last build's
+        self.element_cache.invalidate(keep=(self.SELECT_BUILD,))
+        self._build = None
+        return True
+
+    # Element cache
+    def _element(self, locator, clickable: bool = False):
+        """Return the cached handle for 'locator', resolving it with a wait on a miss."""
+        cache = self.element_cache
+        element = cache.elements.get(locator)
+        if element is not None:
+            cache.hits += 1
+            return element
+
+        cache.misses += 1
+        wait = wait_clickable if clickable else wait_visible
+        element = wait(self.driver, locator)
+        cache.elements[locator] = element
+        return element
+
+    def _select(self, locator) -> Select:
+        cache = self.element_cache
+        select = cache.selects.get(locator)
+        if select is None:
+            select = Select(self._element(locator))
+            cache.selects[locator] = select
+        else:
+            cache.hits += 1
+        return select
+
+    def _interact(self, locator, action, clickable: bool = False, select: bool = False):
+        """
+        Run action(element) on the cached handle. If the handle went stale or
+        the element is no longer interactable, re-resolve it once and retry.
+        """
+        resolve = (
+            (lambda: self._select(locator))
+            if select
+            else (lambda: self._element(locator, clickable))
+        )
+        try:
+            return action(resolve())
+        except (StaleElementReferenceException, ElementNotInteractableException):
+            self.element_cache.discard(locator)
+            return action(resolve())
+
     # Helpers
+    @traced("step")
     def is_calculator_complete(self, timeout: int = 2) -> bool:
         """
         Return False if any essential inputs/buttons are missing (e.g. build 9).
         Uses a short wait so we do not fail on slow render.
+
+        After choose_build() the answer is cached per build for this worker.
         """
+        cached = self._completeness_by_build.get(self._build)
+        if cached is not None:
+            return cached
+
         try:
             wait = WebDriverWait(self.driver, timeout)
             wait.until(EC.presence_of_element_located(self.NUMBER1))
             wait.until(EC.presence_of_element_located(self.NUMBER2))
             wait.until(EC.presence_of_element_located(self.CALCULATE))
-            return True
+            complete = True
         except TimeoutException:
-            return False
+            complete = False
+
+        if self._build is not None:
+            self._completeness_by_build[self._build] = complete
+        return complete
+
+    @traced("step")
+    def capabilities(self) -> dict:
+        """
+        Visit every build once (single script call) and report which controls
+        and operations each one has. Leaves the page on build 0.
+        """
+        caps = self.driver.execute_script(CAPABILITIES_JS)
+        self.element_cache.invalidate(keep=(self.SELECT_BUILD,))
+        self._build = None
+        return caps
 
     # Interactions
+    @traced("step")
     def choose_build(self, build_value: int | str) -> "CalculatorPage":
-        select = Select(wait_visible(self.driver, self.SELECT_BUILD))
-        select.select_by_value(str(build_value))
+        self._interact(
+            self.SELECT_BUILD, lambda s: s.select_by_value(str(build_value)), select=True
+        )
+        self._build = str(build_value)
+        # Switching build can add or remove controls; keep only the build select
+        self.element_cache.invalidate(keep=(self.SELECT_BUILD,))
         return self
 
+    @traced("step")
     def set_numbers(self, a: str, b: str) -> "CalculatorPage":
         """
         Enter the first and second numbers.
         Tests should confirm calculator completeness before calling.
         """
-        n1 = wait_visible(self.driver, self.NUMBER1)
-        n1.clear()
-        n1.send_keys(a)
 
-        n2 = wait_visible(self.driver, self.NUMBER2)
-        n2.clear()
-        n2.send_keys(b)
+        def enter(value):
+            def action(field):
+                field.clear()
+                field.send_keys(value)
 
+            return action
+
+        self._interact(self.NUMBER1, enter(a))
+        self._interact(self.NUMBER2, enter(b))
         return self
 
+    @traced("step")
     def choose_operation(self, op_value: int | str) -> "CalculatorPage":
         """
         Select an operation.
         0 = Add, 1 = Subtract, 2 = Multiply, 3 = Divide, 4 = Concatenate.
         """
-        select = Select(wait_visible(self.driver, self.OPERATION))
-        select.select_by_value(str(op_value))
+        self._interact(self.OPERATION, lambda s: s.select_by_value(str(op_value)), select=True)
         return self
 
+    @traced("step")
     def set_integer_only(self, enabled: bool) -> "CalculatorPage":
         """
         Toggle the 'Integers only' checkbox.
         Called only for operations where this option exists.
         """
-        checkbox = wait_clickable(self.driver, self.INTEGER_ONLY)
-        if checkbox.is_selected() != enabled:
-            checkbox.click()
+
+        def toggle(checkbox):
+            if checkbox.is_selected() != enabled:
+                checkbox.click()
+
+        self._interact(self.INTEGER_ONLY, toggle, clickable=True)
         return self
 
     # Actions
+    @traced("step")
     def calculate(self) -> "CalculatorPage":
         """
         Click 'Calculate' and handle any resulting alert.
         Stores alert text for later retrieval.
+
+        Waits for whichever comes first: an alert, or a change in the answer
+        or error output. The wait budget adapts to observed latencies.
         """
-        btn = wait_clickable(self.driver, self.CALCULATE)
-        btn.click()
+        before = self.driver.execute_script(ANSWER_STATE_JS)
 
-        try:
-            alert = WebDriverWait(self.driver, 5).until(EC.alert_is_present())
-            self._last_alert_text = alert.text
-            alert.accept()
-        except (TimeoutException, NoAlertPresentException):
-            self._last_alert_text = None
+        self._interact(self.CALCULATE, lambda btn: btn.click(), clickable=True)
+
+        # Return as soon as an alert opens or the answer/error output changes,
+        # instead of always blocking on a fixed alert wait.
+        kind, value = wait_for_alert_or_js(self.driver, "calculate", ANSWER_CHANGED_JS, before)
+        self._last_alert_text = value if kind == "alert" else None
 
         return self
 
+    def _dismiss_alert(self) -> None:
+        with contextlib.suppress(NoAlertPresentException):
+            self.driver.switch_to.alert.accept()
+
     # Result accessors
+    @traced("step")
     def read_answer(self) -> str:
         """
         Return the calculator output text.
@@ -141,9 +450,13 @@ class CalculatorPage:
             return self._last_alert_text
 
         try:
-            answer_el = wait_visible(self.driver, self.ANSWER)
-            return answer_el.get_attribute("value")
-        except (TimeoutException, NoSuchElementException):
+            value = self._interact(
+                self.ANSWER,
+                lambda el: el.get_attribute("value") if el.is_displayed() else None,
+            )
+            if value is not None:
+                return value
+        except (TimeoutException, NoSuchElementException, StaleElementReferenceException):
             pass
 
         try:
@@ -151,3 +464,25 @@ class CalculatorPage:
             return body.text.strip()
         except Exception:
             return ""
+
+    # Batch execution
+    @traced("step")
+    def run_cases(self, build_value: int | str, cases, timeout: int = 30) -> list[dict]:
+        """
+        Run many (op, a, b, integer_only) cases against one build in a single
+        execute_async_script round-trip instead of ~12 driver calls per case.
+
+        Each result dict has:
+          - missing: True when number1/number2/calculate are not on the page
+          - alert:   text of any alert raised by Calculate (None otherwise)
+          - error:   inline error text from #errorMsgField
+          - answer:  the value read_answer() would have returned
+        """
+        payload = [
+            [str(op), str(a), str(b), bool(integer_only)] for op, a, b, integer_only in cases
+        ]
+
+        self.driver.set_script_timeout(timeout)
+        raw = self.driver.execute_async_script(RUN_CASES_JS, str(build_value), payload)
+        self.element_cache.invalidate(keep=(self.SELECT_BUILD,))
+        return resolve_batch_results(raw)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from src.engine.calculator_engine import ALL_BUILDS, CONCATENATE, INCOMPLETE_BUILDS, calculate
+
+
+class TimeoutException(TimeoutError):
+    """
+    What the browser raises when a control never appears. Named like
+    selenium's TimeoutException so failures read and classify the same
+    (src/utils/failure_classifier.py), without importing selenium.
+    """
+
+
+class EngineCalculatorPage:
+    """
+    Browser-free implementation of the CalculatorPage API.
+
+    Keeps the form state (build, numbers, operation, integer toggle) in memory
+    and evaluates Calculate with the Python port of the build logic. Missing
+    controls behave like they do in the browser: interacting with them raises
+    TimeoutException, so tests handle both backends the same way.
+    """
+
+    URL: str | None = None
+
+    def __init__(self, driver=None) -> None:
+        # No browser behind this page; kept so evidence hooks can check it.
+        self.driver = driver
+        self._clear()
+
+    def _clear(self) -> None:
+        self._build = 0
+        self._op = 0
+        self._a = ""
+        self._b = ""
+        self._integer_only = False
+        self._answer = ""
+        self._error = ""
+
+    # Navigation
+    def open(self, base_url: str) -> EngineCalculatorPage:
+        self.URL = base_url
+        self._clear()
+        return self
+
+    def reset(self, base_url: str) -> bool:
+        self.URL = base_url
+        self._clear()
+        return True
+
+    # Helpers
+    def is_calculator_complete(self, timeout: int = 2) -> bool:
+        return self._build not in INCOMPLETE_BUILDS
+
+    def capabilities(self) -> dict:
+        caps = {}
+        for build in ALL_BUILDS:
+            complete = build not in INCOMPLETE_BUILDS
+            caps[build] = {
+                "complete": complete,
+                "controls": {
+                    "number1": True,
+                    "number2": complete,
+                    "calculate": complete,
+                    "answer": True,
+                    "integer_only": True,
+                },
+                "operations": [str(op) for op in range(CONCATENATE + 1)],
+            }
+        return caps
+
+    def _require_complete(self, control: str) -> None:
+        if not self.is_calculator_complete():
+            raise TimeoutException(f"{control} is not present on build {self._build}")
+
+    # Interactions
+    def choose_build(self, build_value: int | str) -> EngineCalculatorPage:
+        self._build = int(build_value)
+        self._answer = ""
+        self._error = ""
+        return self
+
+    def set_numbers(self, a: str, b: str) -> EngineCalculatorPage:
+        self._require_complete("#number2Field")
+        self._a = a
+        self._b = b
+        return self
+
+    def choose_operation(self, op_value: int | str) -> EngineCalculatorPage:
+        self._op = int(op_value)
+        return self
+
+    def set_integer_only(self, enabled: bool) -> EngineCalculatorPage:
+        if self._op == CONCATENATE:
+            # The checkbox is hidden for Concatenate, as in the browser
+            raise TimeoutException("#integerSelect is not clickable for Concatenate")
+        self._integer_only = enabled
+        return self
+
+    # Actions
+    def calculate(self) -> EngineCalculatorPage:
+        self._require_complete("#calculateButton")
+        self._answer, self._error = calculate(
+            self._build, self._op, self._a, self._b, self._integer_only
+        )
+        return self
+
+    # Result accessors
+    def read_answer(self) -> str:
+        # The answer field shows the error text when there is no result
+        return self._answer or self._error
+
+    # Batch execution
+    def run_cases(self, build_value: int | str, cases, timeout: int = 30) -> list[dict]:
+        build = int(build_value)
+        if build in INCOMPLETE_BUILDS:
+            missing = {"missing": True, "alert": None, "error": "", "answer": ""}
+            return [dict(missing) for _ in cases]
+
+        results = []
+        for op, a, b, integer_only in cases:
+            # The browser only honours the checkbox while it is visible
+            integer_only = bool(integer_only) and int(op) != CONCATENATE
+            answer, error = calculate(build, op, a, b, integer_only)
+            results.append({"missing": False, "alert": None, "error": error, "answer": answer})
+        return results
@@ -0,0 +1,222 @@
+"""
+--adaptive-sampling: stop executing cases of a build whose verdict is settled.
+
+Each build x case test that ends in a known-defect xfail gives its test
+function, build and operation a failure signature (src/utils/sampling.py).
+Each test function keeps its own evidence, since they check different
+things (integer-only mode, validation messages). Once one signature is
+established with --sampling-confidence, that function's remaining cases
+for the build and operation are not executed: they are reported as xfailed
+before any fixture is set up, tagged "inferred" in Allure, and
+marked with a user property that keeps them out of the --incremental
+cache. A --sampling-rate share of them still runs, picked by
+--sampling-seed (default: today's date); one that disagrees with the
+signature is listed in the summary and reopens the question.
+
+A case whose answer is already computed (its build's run_cases() batch is
+in config._batch_results, see tests/test_data_driven_arithmetic.py) costs
+nothing to check, so it is never inferred: it runs and is compared with
+the signature like a sampled case.
+
+Observations are per process: with --build-scheduling each build runs on a
+single worker, so nothing is lost. Under plain load scheduling every
+worker learns the builds from the cases it happens to run.
+"""
+
+import allure
+import pytest
+
+from src.utils.covering_array import matrix_case
+from src.utils.result_cache import REPLAYED_PROPERTY
+from src.utils.sampling import (
+    FAILED,
+    INFERRED_PROPERTY,
+    PASSED,
+    SAMPLED_PROPERTY,
+    SAMPLING_CONFIDENCE,
+    SAMPLING_RATE,
+    SignatureTracker,
+    default_seed,
+    failure_kind,
+    sampled,
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--adaptive-sampling",
+        action="store_true",
+        default=False,
+        help="Infer the remaining cases of a build and operation once their failure signature is settled.",
+    )
+    parser.addoption(
+        "--sampling-confidence",
+        type=float,
+        default=SAMPLING_CONFIDENCE,
+        help="Confidence a signature needs before cases are inferred (0-1).",
+    )
+    parser.addoption(
+        "--sampling-rate",
+        type=float,
+        default=SAMPLING_RATE,
+        help="Share of inferable cases that still runs to catch new behaviour (0-1).",
+    )
+    parser.addoption(
+        "--sampling-seed",
+        default=None,
+        help="Seed picking the sampled cases (default: today's date).",
+    )
+
+
+def pytest_configure(config):
+    if not config.getoption("adaptive_sampling"):
+        return
+    confidence = config.getoption("sampling_confidence")
+    rate = config.getoption("sampling_rate")
+    if not 0 < confidence < 1:
+        raise pytest.UsageError("--sampling-confidence must be between 0 and 1")
+    if not 0 <= rate <= 1:
+        raise pytest.UsageError("--sampling-rate must be between 0 and 1")
+    seed = config.getoption("sampling_seed") or default_seed()
+    config.pluginmanager.register(
+        AdaptiveSampler(config, confidence, rate, seed), "adaptive-sampler"
+    )
+
+
+def _already_computed(item, build) -> bool:
+    """Whether the item only looks up a result its build's batch already holds."""
+    computed = getattr(item.config, "_batch_results", {})
+    return "batch_results" in item.fixturenames and build in computed
+
+
+def _signature_key(item) -> tuple | None:
+    """(test function, build, op) of a build x case test, or None outside the matrix."""
+    case = matrix_case(getattr(getattr(item, "callspec", None), "params", {}))
+    if case is None:
+        return None
+    return item.originalname, case["build"], case["op"]
+
+
+class AdaptiveSampler:
+    def __init__(self, config, confidence: float, rate: float, seed: str):
+        self.config = config
+        self.rate = rate
+        self.seed = seed
+        self.is_worker = hasattr(config, "workerinput")
+        self.tracker = SignatureTracker(confidence)
+
+        self.counts = {"inferred": 0, "sampled": 0, "checked": 0}
+        self.disagreements: list[dict] = []
+        # [test, build, op, signature, matching, executed] reported by xdist workers
+        self.worker_settled: list[list] = []
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        key = _signature_key(item)
+        if key is None or dict(item.user_properties).get(REPLAYED_PROPERTY):
+            return
+        settled = self.tracker.settled(key)
+        if settled is None:
+            return
+        kind, matching, executed = settled
+        if _already_computed(item, key[1]):
+            self.counts["checked"] += 1
+            item.user_properties.append((SAMPLED_PROPERTY, kind))
+            return
+        if sampled(item.nodeid, self.seed, self.rate):
+            self.counts["sampled"] += 1
+            item.user_properties.append((SAMPLED_PROPERTY, kind))
+            return
+
+        self.counts["inferred"] += 1
+        item.user_properties.append((INFERRED_PROPERTY, kind))
+        allure.dynamic.tag("inferred")
+        pytest.xfail(
+            f"[inferred] build {key[1]} op={key[2]} settled on '{kind}' "
+            f"({matching} of {executed} executed cases)"
+        )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when != "call":
+            return
+        properties = dict(item.user_properties)
+        key = _signature_key(item)
+        if key is None or properties.get(REPLAYED_PROPERTY):
+            return
+
+        if hasattr(report, "wasxfail") and report.skipped:
+            if "actual" not in properties:
+                # Incomplete UI, not a wrong answer
+                return
+            case = matrix_case(item.callspec.params)
+            observed = failure_kind(case["a"], case["b"], case["expected"], properties["actual"])
+        elif report.passed:
+            observed = PASSED
+        elif report.failed:
+            observed = FAILED
+        else:
+            return
+
+        expected_kind = properties.get(SAMPLED_PROPERTY)
+        if expected_kind is not None and observed != expected_kind:
+            self.disagreements.append(
+                {"nodeid": item.nodeid, "settled": expected_kind, "observed": observed}
+            )
+        self.tracker.observe(key, observed)
+
+    def _settled(self) -> list[list]:
+        settled = []
+        for key in sorted(self.tracker.evidence, key=str):
+            signature = self.tracker.settled(key)
+            if signature is not None:
+                settled.append([*key, *signature])
+        return settled
+
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["adaptive_sampling"] = {
+                "counts": self.counts,
+                "disagreements": self.disagreements,
+                "settled": self._settled(),
+            }
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = getattr(node, "workeroutput", {}).get("adaptive_sampling")
+        if not output:
+            return
+        for key, value in output["counts"].items():
+            self.counts[key] += value
+        self.disagreements.extend(output["disagreements"])
+        self.worker_settled.extend(output["settled"])
+
+    def pytest_report_header(self, config):
+        return (
+            f"adaptive sampling: confidence {self.tracker.confidence}, "
+            f"sample rate {self.rate}, seed {self.seed}"
+        )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker:
+            return
+        settled = self._settled() + self.worker_settled
+        terminalreporter.write_line(
+            f"adaptive sampling: {self.counts['inferred']} case(s) inferred, "
+            f"{self.counts['sampled']} sampled, {self.counts['checked']} checked, "
+            f"{len(self.disagreements)} disagreed"
+        )
+        by_build: dict = {}
+        for test, build, op, kind, matching, executed in settled:
+            by_build.setdefault((test, build), []).append(f"op {op} {kind} ({matching}/{executed})")
+        for test, build in sorted(by_build, key=str):
+            terminalreporter.write_line(
+                f"  {test} build {build}: {', '.join(by_build[test, build])}"
+            )
+        for entry in self.disagreements:
+            terminalreporter.write_line(
+                f"  new behaviour: {entry['nodeid']} gave '{entry['observed']}', settled on '{entry['settled']}'"
+            )
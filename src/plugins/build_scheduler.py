@@ -0,0 +1,76 @@
+"""
+Build-aware test ordering and xdist scheduling.
+
+- Within each test module, collected tests are ordered by build, so
+  consecutive tests reuse the selected build and its cached completeness
+  probe while module-scoped fixtures are still set up once per module.
+- With --build-scheduling under xdist, every test for one build goes to the
+  same worker as one work unit, and the longest remaining build (by saved
+  durations) is handed out first, so builds balance across workers.
+- Per-test durations are saved to reports/.durations.json after each run.
+"""
+
+import pytest
+
+from src.utils.durations import build_of, save_durations
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--build-scheduling",
+        action="store_true",
+        default=False,
+        help="Under xdist, send each build's tests to one worker, longest builds first.",
+    )
+
+
+class DurationRecorder:
+    """Collect setup+call+teardown time per test and save it at session end."""
+
+    def __init__(self):
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        # Runs on the xdist controller for worker reports too
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(session.config, "workerinput"):
+            # The controller saves durations for the whole run
+            return
+        if session.config.getoption("shard", None):
+            # Shards plan from these; src.utils.sharding merge saves them
+            return
+        if self.durations:
+            save_durations(self.durations)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(DurationRecorder(), "duration-recorder")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """
+    Group each module's tests by build (stable: original order is kept within
+    a build). Modules keep their collection order and stay contiguous.
+    """
+    modules: dict = {}
+    for item in items:
+        modules.setdefault(item.path, len(modules))
+
+    def key(item):
+        build = build_of(item.nodeid)
+        return modules[item.path], build is not None, build or 0
+
+    items.sort(key=key)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config.getoption("build_scheduling"):
+        return None
+    # xdist's schedulers are only needed on the controller; workers skip them
+    from src.utils.build_scheduling import BuildScheduling
+
+    return BuildScheduling(config, log)
@@ -0,0 +1,167 @@
+"""
+Driver cassettes (see src/utils/cassette.py).
+
+- --record-cassettes[=DIR] records what each test using the `driver` fixture
+  sends to its browser. The result goes to DIR/<module>/<test>-<hash>.json
+  (default tests/cassettes), together with the AUT hash and the build
+  completeness the test started from. The capability map is cached in DIR
+  as well.
+- --replay-cassettes[=DIR] serves those tests a replay driver instead of a
+  browser. A test with no cassette, or one recorded against a different AUT
+  hash, is skipped. Re-recording refreshes the cassettes.
+
+Both modes turn adaptive waits off, so wait timeouts (and the commands that
+carry them) are the same in both. Each cassette starts from an empty element
+cache. Tests that share results across tests, such as the arithmetic batch,
+replay correctly only in the order they were recorded in.
+"""
+
+import os
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+from src.utils.cassette import CASSETTE_DIR
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--record-cassettes",
+        nargs="?",
+        const=CASSETTE_DIR,
+        default=None,
+        metavar="DIR",
+        help=f"Record each browser test's WebDriver traffic as a cassette (default dir {CASSETTE_DIR}).",
+    )
+    parser.addoption(
+        "--replay-cassettes",
+        nargs="?",
+        const=CASSETTE_DIR,
+        default=None,
+        metavar="DIR",
+        help="Run browser tests against their recorded cassettes instead of a browser.",
+    )
+
+
+def pytest_configure(config):
+    record = config.getoption("record_cassettes")
+    replay = config.getoption("replay_cassettes")
+    if record and replay:
+        raise pytest.UsageError("--record-cassettes and --replay-cassettes cannot be combined")
+    if not (record or replay):
+        return
+    if record and config.getoption("backend", "selenium") != "selenium":
+        raise pytest.UsageError("--record-cassettes needs --backend=selenium")
+
+    from src.utils import waits
+
+    waits.ADAPTIVE_WAITS = False
+    mode = "record" if record else "replay"
+    config.pluginmanager.register(CassetteDeck(config, mode, record or replay), "cassette-deck")
+
+
+class CassetteDeck:
+    def __init__(self, config, mode: str, directory: str):
+        self.config = config
+        self.mode = mode
+        self.directory = directory
+        self.is_worker = hasattr(config, "workerinput")
+        self.counts = {"recorded": 0, "replayed": 0, "missing": 0, "stale": 0}
+        # Cassettes of the tests in progress, by nodeid
+        self.current = {}
+        self._aut_hashes: dict[str, str | None] = {}
+
+    def aut_hash(self, base_url: str) -> str | None:
+        if base_url not in self._aut_hashes:
+            from src.utils.capabilities import aut_content_hash
+
+            self._aut_hashes[base_url] = aut_content_hash(base_url)
+        return self._aut_hashes[base_url]
+
+    # Used by the driver fixture
+    @contextmanager
+    def record(self, item, driver, base_url: str):
+        from src.pages.calculator_page import _ELEMENT_CACHES
+        from src.utils.cassette import Cassette, cassette_path, record_commands
+
+        # Handles cached by earlier tests would skip lookups the replay has to make
+        _ELEMENT_CACHES.pop(driver, None)
+        cassette = Cassette(
+            item.nodeid,
+            self.aut_hash(base_url),
+            capabilities=dict(driver.caps or {}),
+            recorded_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        self.current[item.nodeid] = cassette
+        record_commands(driver, cassette)
+        try:
+            yield driver
+        finally:
+            cassette.recording = False
+            del self.current[item.nodeid]
+            cassette.save(cassette_path(item.nodeid, self.directory))
+            self.counts["recorded"] += 1
+
+    @contextmanager
+    def replay(self, item, base_url: str):
+        from src.utils.cassette import Cassette, cassette_path, replaying
+
+        path = cassette_path(item.nodeid, self.directory)
+        if not os.path.exists(path):
+            self.counts["missing"] += 1
+            pytest.skip(f"no cassette recorded for this test ({path})")
+        cassette = Cassette.load(path)
+        if cassette.is_stale(self.aut_hash(base_url)):
+            self.counts["stale"] += 1
+            pytest.skip(
+                "cassette was recorded against another AUT; re-record with --record-cassettes"
+            )
+
+        self.current[item.nodeid] = cassette
+        try:
+            with replaying(cassette) as driver:
+                yield driver
+        finally:
+            del self.current[item.nodeid]
+        self.counts["replayed"] += 1
+
+    # Hooks
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_call(self, item):
+        cassette = self.current.get(item.nodeid)
+        if cassette is None:
+            return
+        from src.pages.calculator_page import CalculatorPage
+
+        # Completeness probes are cached per worker, so a cassette only
+        # holds the probes its test made starting from this state
+        if self.mode == "record":
+            cassette.meta["completeness"] = dict(CalculatorPage._completeness_by_build)
+        else:
+            CalculatorPage._completeness_by_build.clear()
+            CalculatorPage._completeness_by_build.update(cassette.meta.get("completeness", {}))
+
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["cassettes"] = self.counts
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        for key, value in getattr(node, "workeroutput", {}).get("cassettes", {}).items():
+            self.counts[key] += value
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker:
+            return
+        counts = self.counts
+        if self.mode == "record":
+            terminalreporter.write_line(
+                f"cassettes: recorded {counts['recorded']} to {self.directory}"
+            )
+        else:
+            terminalreporter.write_line(
+                f"cassettes: replayed {counts['replayed']} from {self.directory}; skipped "
+                f"{counts['missing']} without a cassette and {counts['stale']} recorded against another AUT"
+            )
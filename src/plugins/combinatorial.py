@@ -0,0 +1,134 @@
+"""
+--coverage-strength=2|3|full: run a t-wise subset of the build x case matrix.
+
+Every parametrized test with a build and an operation (a case/row dict or
+op/a/b parameters) is described by its factors: build, op, integer_only
+and input class (src/utils/covering_array.py). Per test function, only the
+tests of a t-wise covering subset are kept; the rest are deselected before
+-k/-m and --shard apply, so the subset does not depend on those. Tests
+outside the matrix always run.
+
+The terminal summary and reports/interaction-coverage.json give, per test
+function, the tests kept and the interaction coverage achieved at the
+chosen strength and the one above it. `full` (the default) runs the whole
+product, as the scheduled CI run does.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.utils.covering_array import (
+    STRENGTHS,
+    covering_subset,
+    input_class,
+    interaction_coverage,
+    matrix_case,
+)
+
+COVERAGE_STRENGTH = os.getenv("COVERAGE_STRENGTH", "full")
+REPORT_PATH = os.path.join("reports", "interaction-coverage.json")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--coverage-strength",
+        choices=STRENGTHS,
+        default=COVERAGE_STRENGTH,
+        help="Run a pairwise (2) or 3-way subset of the build x case matrix, or all of it (full).",
+    )
+
+
+def pytest_configure(config):
+    strength = config.getoption("coverage_strength")
+    if strength != "full":
+        config.pluginmanager.register(CaseReducer(config, int(strength)), "case-reducer")
+
+
+def item_factors(item) -> dict | None:
+    """Factors of a build x case test, or None for tests outside the matrix."""
+    case = matrix_case(getattr(getattr(item, "callspec", None), "params", {}))
+    if case is None:
+        return None
+    factors = {"build": case["build"], "op": case["op"]}
+    if case["integer_only"] is not None:
+        factors["integer_only"] = bool(case["integer_only"])
+    if case["a"] is not None and case["b"] is not None:
+        factors["input"] = input_class(case["op"], case["a"], case["b"])
+    return factors
+
+
+class CaseReducer:
+    def __init__(self, config, strength: int):
+        self.config = config
+        self.strength = strength
+        self.is_worker = hasattr(config, "workerinput")
+        self.report: list[dict] | None = None
+
+    def pytest_collection_modifyitems(self, config, items):
+        groups: dict[tuple, list] = {}
+        for item in items:
+            factors = item_factors(item)
+            if factors is not None:
+                groups.setdefault((str(item.path), item.originalname), []).append((item, factors))
+
+        deselected = set()
+        self.report = []
+        for (path, name), members in groups.items():
+            rows = [factors for _, factors in members]
+            keep = covering_subset(rows, self.strength)
+            kept = set(keep)
+            deselected.update(id(item) for i, (item, _) in enumerate(members) if i not in kept)
+
+            coverage = {}
+            for strength in (self.strength, self.strength + 1):
+                if strength <= len(rows[0]):
+                    coverage[str(strength)] = interaction_coverage(rows, keep, strength)
+            self.report.append(
+                {
+                    "test": f"{os.path.relpath(path)}::{name}",
+                    "factors": sorted(rows[0]),
+                    "collected": len(rows),
+                    "kept": len(keep),
+                    "coverage": coverage,
+                }
+            )
+
+        if deselected:
+            config.hook.pytest_deselected(items=[item for item in items if id(item) in deselected])
+            items[:] = [item for item in items if id(item) not in deselected]
+
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            # Under xdist only workers collect; every worker reduces the same way
+            workeroutput["interaction_coverage"] = self.report
+            return
+        if self.report is None:
+            return
+        os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+        with open(REPORT_PATH, "w", encoding="utf-8") as f:
+            json.dump({"strength": self.strength, "tests": self.report}, f, indent=2)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        report = getattr(node, "workeroutput", {}).get("interaction_coverage")
+        if report is not None and self.report is None:
+            self.report = report
+
+    def pytest_report_header(self, config):
+        return f"coverage strength: {self.strength}-way subset of the build x case matrix"
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not self.report:
+            return
+        terminalreporter.write_line(f"interaction coverage ({self.strength}-way subset):")
+        for entry in self.report:
+            achieved = ", ".join(
+                f"{strength}-way {covered}/{total} ({covered / total:.0%})"
+                for strength, (covered, total) in entry["coverage"].items()
+            )
+            terminalreporter.write_line(
+                f"  {entry['test']}: {entry['kept']} of {entry['collected']} tests; {achieved}"
+            )
@@ -0,0 +1,105 @@
+"""
+Append every test outcome to the local results history (src/utils/history.py).
+
+Case details (build, op, inputs, expected) come from each test's parameters,
+the observed answer from record_property("actual", ...) in the test, and
+verdict and duration from the reports. The controller writes the whole run
+in one transaction at session end. Disable with --no-history.
+
+Only executed cases are recorded: outcomes replayed by --incremental,
+inferred by --adaptive-sampling or emulated by the engine carry no observed
+answer. The AUT fingerprint is the session's (shared with --incremental)
+and is only taken when build x case tests ran, so unit-test runs never
+fetch the AUT.
+"""
+
+import pytest
+
+from src.engine.calculator_engine import EMULATED_PROPERTY
+from src.utils.durations import build_of
+from src.utils.history import record_run
+from src.utils.result_cache import REPLAYED_PROPERTY, report_outcome, session_fingerprint
+from src.utils.sampling import INFERRED_PROPERTY
+
+CASE_PROPERTY = "history_case"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-history",
+        action="store_true",
+        default=False,
+        help="Do not append this run's outcomes to reports/history.sqlite.",
+    )
+
+
+def pytest_configure(config):
+    if not config.getoption("no_history"):
+        config.pluginmanager.register(HistoryRecorder(config), "history-recorder")
+
+
+def case_details(item) -> dict:
+    """Build, op, inputs and expected value of a parametrized test, where present."""
+    params = getattr(getattr(item, "callspec", None), "params", {})
+    case = params.get("case") or params.get("row") or params
+    details = {
+        "build": params.get("build", build_of(item.nodeid)),
+        "op": case.get("op"),
+        "a": case.get("a"),
+        "b": case.get("b"),
+        "integer_only": case.get("integer_only"),
+        "expected": case.get("expected"),
+    }
+    return {key: value for key, value in details.items() if value is not None}
+
+
+class HistoryRecorder:
+    def __init__(self, config):
+        self.config = config
+        self.is_worker = hasattr(config, "workerinput")
+        self.records: dict[str, dict] = {}
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            item.user_properties.append((CASE_PROPERTY, case_details(item)))
+
+    def pytest_runtest_logreport(self, report):
+        # Runs on the xdist controller for worker reports too
+        if self.is_worker:
+            return
+        properties = dict(report.user_properties)
+        if EMULATED_PROPERTY in properties:
+            # Engine answer for an emulated build, not a verdict on the AUT
+            return
+        if REPLAYED_PROPERTY in properties or INFERRED_PROPERTY in properties:
+            # Not executed: no observed answer, and the verdict is already recorded
+            return
+        record = self.records.get(report.nodeid)
+        if record is None:
+            record = {"nodeid": report.nodeid, "verdict": "passed", "duration": 0.0}
+            record.update(properties.get(CASE_PROPERTY, {}))
+            self.records[report.nodeid] = record
+
+        record["duration"] += report.duration
+        if "actual" in properties:
+            record["actual"] = str(properties["actual"])
+
+        if report.failed and report.when != "call":
+            record["verdict"] = "error"
+        elif record["verdict"] == "passed" and report.when != "teardown":
+            record["verdict"] = report_outcome(report)[0]
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        if self.is_worker or not self.records:
+            return
+        backend = self.config.getoption("backend")
+        matrix = any("build" in record for record in self.records.values())
+        aut_hash = session_fingerprint(self.config) if matrix else None
+        for record in self.records.values():
+            if "integer_only" in record:
+                record["integer_only"] = int(bool(record["integer_only"]))
+            for key in ("a", "b", "expected"):
+                if key in record:
+                    record[key] = str(record[key])
+        record_run(list(self.records.values()), backend, aut_hash)
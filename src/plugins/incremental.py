@@ -0,0 +1,192 @@
+"""
+Incremental runs: replay cached outcomes for unchanged cases.
+
+With --incremental each build x case test gets a cache key (see
+src/utils/result_cache.py). Tests whose key has an outcome younger than
+--incremental-max-age are not executed: their fixtures are skipped and the
+cached outcome is raised again in place of the test body, so pass / fail /
+xfail still flow through the normal report hooks into the terminal and
+Allure (tagged "cached"). Everything else runs as usual and its outcome is
+stored for next time.
+
+--incremental-max-age=0 forces a full run that refreshes the whole cache.
+
+A --shard run reads the shared cache but stores its outcomes in its shard
+directory; `python -m src.utils.sharding merge` folds them back in.
+"""
+
+import os
+import time
+
+import allure
+import pytest
+
+from src.engine.calculator_engine import EMULATED_PROPERTY
+from src.utils.durations import build_of
+from src.utils.failure_classifier import CLASS_PROPERTY, INFRA
+from src.utils.result_cache import (
+    KEY_PROPERTY,
+    PAGE_SOURCES,
+    REPLAYED_PROPERTY,
+    case_key,
+    file_hash,
+    is_fresh,
+    load_results,
+    report_outcome,
+    save_results,
+    session_fingerprint,
+)
+from src.utils.sampling import INFERRED_PROPERTY
+from src.utils.sharding import RESULT_CACHE
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--incremental",
+        action="store_true",
+        default=False,
+        help="Replay cached outcomes for cases whose AUT, inputs and code are unchanged.",
+    )
+    parser.addoption(
+        "--incremental-max-age",
+        type=float,
+        default=168,
+        help="Hours a cached outcome stays valid under --incremental (0 = re-run everything).",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("incremental"):
+        config.pluginmanager.register(IncrementalRunner(config), "incremental-runner")
+
+
+def _install_replay(item, entry: dict) -> None:
+    """Make 'item' reproduce a cached outcome without setting up fixtures."""
+
+    def replay():
+        allure.dynamic.tag("cached")
+        outcome, message = entry["outcome"], entry["message"]
+        if outcome == "failed":
+            pytest.fail(f"[cached outcome]\n{message}", pytrace=False)
+        if outcome == "xfailed":
+            pytest.xfail(message)
+        if outcome == "skipped":
+            pytest.skip(message)
+
+    # No fixtures means no browser lease and no page load
+    item.setup = lambda: None
+    if entry["when"] == "setup":
+        item.setup = replay
+    else:
+        item.runtest = replay
+
+
+class IncrementalRunner:
+    """Tags tests with cache keys, replays fresh hits and records new outcomes."""
+
+    def __init__(self, config):
+        self.backend = config.getoption("backend")
+        self.max_age = config.getoption("incremental_max_age") * 3600
+        self.is_worker = hasattr(config, "workerinput")
+
+        self.aut_hash = session_fingerprint(config)
+        self.page_hash = file_hash(PAGE_SOURCES[self.backend])
+        self.cached = load_results() if self.aut_hash else {}
+
+        self.outcomes: dict[str, dict] = {}
+        self.replayed = 0
+        self._source_hashes: dict[str, str] = {}
+
+    def _source_hash(self, item) -> str:
+        # The whole test file, so module-level fixtures and helpers count too
+        path = str(item.path)
+        if path not in self._source_hashes:
+            self._source_hashes[path] = file_hash(path)
+        return self._source_hashes[path]
+
+    def pytest_collection_modifyitems(self, items):
+        if not self.aut_hash:
+            return
+        for item in items:
+            if build_of(item.nodeid) is None:
+                # Only the build x case matrix is cached; framework unit
+                # tests depend on code the key does not cover
+                continue
+            params = getattr(getattr(item, "callspec", None), "params", {})
+            key = case_key(
+                self.aut_hash, self.backend, self.page_hash, params, self._source_hash(item)
+            )
+            item.user_properties.append((KEY_PROPERTY, key))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item):
+        key = dict(item.user_properties).get(KEY_PROPERTY)
+        entry = self.cached.get(key)
+        if is_fresh(entry, self.max_age):
+            _install_replay(item, entry)
+            item.user_properties.append((REPLAYED_PROPERTY, True))
+        # Fall through to the normal protocol either way
+
+    def pytest_runtest_logreport(self, report):
+        # Runs on the xdist controller for worker reports too
+        if self.is_worker:
+            return
+        properties = dict(report.user_properties)
+        key = properties.get(KEY_PROPERTY)
+        if key is None:
+            return
+
+        if properties.get(REPLAYED_PROPERTY):
+            if report.when == "teardown":
+                self.replayed += 1
+            return
+        if properties.get(INFERRED_PROPERTY):
+            # Inferred by --adaptive-sampling, not a verdict on the case
+            return
+        if EMULATED_PROPERTY in properties:
+            # Engine answer for an emulated build (see conftest.py)
+            return
+
+        entry = self.outcomes.setdefault(
+            key,
+            {
+                "nodeid": report.nodeid,
+                "outcome": "passed",
+                "when": "call",
+                "message": "",
+                "at": time.time(),
+            },
+        )
+        infra_fault = properties.get(CLASS_PROPERTY, "").startswith(INFRA)
+        if (report.failed and report.when != "call") or infra_fault:
+            # Setup/teardown errors and infrastructure faults are environment
+            # trouble, not a verdict on the case
+            entry["outcome"] = "error"
+            return
+        if entry["outcome"] == "passed" and report.when != "teardown":
+            outcome, message = report_outcome(report)
+            entry.update(outcome=outcome, when=report.when, message=message)
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            return
+        results = {
+            key: entry for key, entry in self.outcomes.items() if entry["outcome"] != "error"
+        }
+        if not results:
+            return
+        shard_dir = getattr(session.config, "_shard_dir", None)
+        if shard_dir:
+            save_results(results, self.max_age, os.path.join(shard_dir, RESULT_CACHE))
+        else:
+            save_results(results, self.max_age)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.aut_hash:
+            terminalreporter.write_line(
+                "incremental: AUT fingerprint unavailable, nothing replayed or cached"
+            )
+            return
+        terminalreporter.write_line(
+            f"incremental: {self.replayed} replayed from cache, {len(self.outcomes)} executed"
+        )
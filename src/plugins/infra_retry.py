@@ -0,0 +1,155 @@
+"""
+Retry infrastructure faults in place; report AUT defects as they are.
+
+Every failure is classified (src/utils/failure_classifier.py) and the class
+is put on the report as the "failure_class" user property. Browser tests get
+pytest-rerunfailures' flaky marker, restricted (only_rerun) to failures this
+plugin tags as retryable: infrastructure faults, while the worker still has
+retry budget left. The faulted browser is recycled by the driver fixture
+before the retry, so the test runs again on a fresh one.
+
+    --infra-retries N        retries per test (default 2, 0 = off)
+    --infra-retry-budget M   retries per worker for the whole run (default 10)
+"""
+
+import os
+import re
+from collections import Counter
+
+import pytest
+
+from src.utils.failure_classifier import CLASS_PROPERTY, INFRA, classify
+
+# Prefixed to a retryable failure's crash message; matched by only_rerun
+RETRY_TAG = "[infra-retry]"
+
+_BROWSER_FIXTURES = {"driver", "calc", "driver_pool"}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--infra-retries",
+        type=int,
+        default=int(os.getenv("INFRA_RETRIES", "2")),
+        help="Retry a test up to N times after an infrastructure fault (browser crash, lost session, page-load timeout).",
+    )
+    parser.addoption(
+        "--infra-retry-budget",
+        type=int,
+        default=int(os.getenv("INFRA_RETRY_BUDGET", "10")),
+        help="Infrastructure retries allowed per worker for the whole run.",
+    )
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(InfraRetry(config), "infra-retry")
+
+
+class InfraRetry:
+    def __init__(self, config):
+        self.config = config
+        self.is_worker = hasattr(config, "workerinput")
+        self.retries = max(0, config.getoption("infra_retries"))
+        self.budget = max(0, config.getoption("infra_retry_budget"))
+        # rerunfailures does the re-running; without it faults are only classified
+        self.enabled = bool(self.retries and config.pluginmanager.has_plugin("rerunfailures"))
+
+        self.marked: set[str] = set()
+        self.used = 0
+        self.by_kind: Counter = Counter()
+        self.by_test: Counter = Counter()
+        self.unretried: Counter = Counter()
+        self.exhausted_workers: list[str] = []
+
+    def pytest_collection_modifyitems(self, items):
+        if not self.enabled or self.config.getoption("backend", "selenium") != "selenium":
+            return
+        marker = pytest.mark.flaky(reruns=self.retries, only_rerun=[re.escape(RETRY_TAG)])
+        for item in items:
+            if (
+                _BROWSER_FIXTURES & set(item.fixturenames)
+                and item.get_closest_marker("flaky") is None
+            ):
+                item.add_marker(marker)
+                self.marked.add(item.nodeid)
+
+    # Innermost wrapper, so the tag is in place before rerunfailures looks
+    @pytest.hookimpl(hookwrapper=True, trylast=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+
+        if report.when == "teardown":
+            # The driver fixture has recycled the browser by now
+            item._infra_fault = False
+        if not (report.failed and call.excinfo is not None):
+            return
+
+        category, kind = classify(call.excinfo.value)
+        report.user_properties.append((CLASS_PROPERTY, f"{category}:{kind}"))
+        if category != INFRA:
+            return
+
+        # Tells the driver fixture to recycle this browser instead of pooling it
+        item._infra_fault = True
+        if self._may_retry(item) and getattr(report.longrepr, "reprcrash", None) is not None:
+            report.longrepr.reprcrash.message = (
+                f"{RETRY_TAG} {kind}: {report.longrepr.reprcrash.message}"
+            )
+            self.used += 1
+            self.by_kind[kind] += 1
+            self.by_test[item.nodeid] += 1
+        else:
+            self.unretried[kind] += 1
+
+    def _may_retry(self, item) -> bool:
+        return (
+            item.nodeid in self.marked
+            and self.used < self.budget
+            and getattr(item, "execution_count", 1) <= self.retries
+        )
+
+    # xdist: workers hand their counts to the controller
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["infra_retries"] = {
+                "used": self.used,
+                "by_kind": dict(self.by_kind),
+                "by_test": dict(self.by_test),
+                "unretried": dict(self.unretried),
+            }
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        counts = getattr(node, "workeroutput", {}).get("infra_retries")
+        if not counts:
+            return
+        self.used += counts["used"]
+        self.by_kind.update(counts["by_kind"])
+        self.by_test.update(counts["by_test"])
+        self.unretried.update(counts["unretried"])
+        if counts["used"] >= self.budget > 0:
+            self.exhausted_workers.append(node.workerinput["workerid"])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or not (self.used or self.unretried):
+            return
+        kinds = ", ".join(f"{kind}: {count}" for kind, count in self.by_kind.most_common())
+        terminalreporter.write_line(
+            f"infra retries: {self.used} across {len(self.by_test)} test(s)"
+            + (f" ({kinds})" if kinds else "")
+            + f"; budget {self.budget} per worker"
+        )
+        for nodeid, count in self.by_test.most_common(10):
+            terminalreporter.write_line(f"  {count}x {nodeid}")
+        if self.unretried:
+            left = ", ".join(f"{kind}: {count}" for kind, count in self.unretried.most_common())
+            terminalreporter.write_line(f"infra faults not retried: {left}")
+        if self.config.pluginmanager.has_plugin("dsession"):
+            if self.exhausted_workers:
+                terminalreporter.write_line(
+                    f"infra retry budget exhausted on: {', '.join(self.exhausted_workers)}"
+                )
+        elif self.used >= self.budget > 0:
+            terminalreporter.write_line("infra retry budget exhausted")
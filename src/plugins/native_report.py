@@ -0,0 +1,125 @@
+"""
+--native-report: a JVM-free HTML summary, written while the run is going.
+
+Every process (each xdist worker, or the single pytest process) appends one
+JSON line per finished test to reports/native/results-<worker>.jsonl,
+fsyncing in batches. The controller, which sees every report, re-renders
+reports/native/index.html every few seconds; at session end it merges the
+worker streams into results.jsonl and renders the final page from that.
+"""
+
+import glob
+import os
+import time
+
+import pytest
+
+from src.engine.calculator_engine import EMULATED_PROPERTY
+from src.utils.native_report import ResultStream, build_record, merge_streams, render_html
+from src.utils.result_cache import report_outcome
+
+EVIDENCE_PROPERTY = "evidence"
+
+# Seconds between live re-renders of index.html
+RENDER_INTERVAL = float(os.getenv("NATIVE_REPORT_INTERVAL", "3"))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--native-report",
+        nargs="?",
+        const=os.path.join("reports", "native"),
+        default=None,
+        metavar="DIR",
+        help="Stream results to DIR (default reports/native) and render a static HTML summary there.",
+    )
+
+
+def pytest_configure(config):
+    directory = config.getoption("native_report")
+    if directory:
+        config.pluginmanager.register(NativeReporter(config, directory), "native-reporter")
+
+
+class NativeReporter:
+    def __init__(self, config, directory: str):
+        self.config = config
+        self.directory = directory
+        self.worker = config.workerinput["workerid"] if hasattr(config, "workerinput") else "main"
+        self.is_controller = not hasattr(config, "workerinput")
+        self.html_path = os.path.join(directory, "index.html")
+
+        os.makedirs(directory, exist_ok=True)
+        if self.is_controller:
+            # Streams from a previous run would be merged into this one
+            for path in glob.glob(os.path.join(directory, "results-*.jsonl")):
+                os.remove(path)
+        # Opened on first write: a distributing controller runs no tests
+        self.stream = None
+        self.pending: dict[str, dict] = {}
+        self.live: dict[str, dict] = {}
+        self._last_render = 0.0
+
+    def _stream(self) -> ResultStream:
+        if self.stream is None:
+            self.stream = ResultStream(os.path.join(self.directory, f"results-{self.worker}.jsonl"))
+        return self.stream
+
+    # Per-test record, built up over setup/call/teardown
+    def _fold(self, store: dict, report) -> dict | None:
+        """Fold one phase report into 'store'; returns the record once the test is finished."""
+        record = store.get(report.nodeid)
+        if record is None:
+            record = build_record(report.nodeid, "passed", 0.0, worker=self.worker)
+            store[report.nodeid] = record
+        if report.outcome == "rerun":
+            # pytest-rerunfailures attempt (see --infra-retries); the retry follows
+            record["reruns"] = record.get("reruns", 0) + 1
+            return None
+        record["duration"] = round(record["duration"] + report.duration, 4)
+
+        outcome, message = report_outcome(report)
+        if report.failed and report.when != "call":
+            record["outcome"], record["message"] = "error", message[:2000]
+        elif record["outcome"] == "passed" and report.when != "teardown":
+            record["outcome"], record["message"] = outcome, message[:2000]
+        for name, value in report.user_properties:
+            if name == EVIDENCE_PROPERTY:
+                record["evidence"] = list(value)
+            elif name == EMULATED_PROPERTY:
+                record["emulated"] = True
+        return record if report.when == "teardown" else None
+
+    def pytest_runtest_logreport(self, report):
+        # Runs on the xdist controller for worker reports too; those are
+        # folded for the live page only, the worker streams its own
+        store = self.live if self.is_controller else self.pending
+        finished = self._fold(store, report)
+        if finished is not None and not self._distributing():
+            self._stream().write(finished)
+            if not self.is_controller:
+                del self.pending[report.nodeid]
+
+        if self.is_controller and time.monotonic() - self._last_render >= RENDER_INTERVAL:
+            self._render(list(self.live.values()), live=True)
+
+    def _distributing(self) -> bool:
+        return self.is_controller and self.config.pluginmanager.has_plugin("dsession")
+
+    def _render(self, records, live: bool) -> None:
+        render_html(records, self.html_path, live=live)
+        self._last_render = time.monotonic()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        if self.stream is not None:
+            self.stream.close()
+        if not self.is_controller:
+            return
+        streams = sorted(glob.glob(os.path.join(self.directory, "results-*.jsonl")))
+        records = merge_streams(streams, os.path.join(self.directory, "results.jsonl"))
+        self._render(records, live=False)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_controller and os.path.exists(self.html_path):
+            terminalreporter.write_line(f"native report: {os.path.abspath(self.html_path)}")
@@ -0,0 +1,119 @@
+"""
+--shard=i/N: run one duration-balanced slice of the collected tests.
+
+All N shard processes (on one machine or many) collect the same tests and
+partition them identically from the saved durations (see
+src/utils/sharding.py), so together they run every test exactly once.
+Shard i writes shard.json to --shard-dir (default reports/shards/<i>) with
+its assigned tests and their measured durations; saved durations are not
+updated by a shard, as that would change the partition for shards still
+starting. Under --incremental the shard's outcomes go to the same directory
+(src/plugins/incremental.py) rather than the shared cache. Combine the shards with `python -m src.utils.sharding merge`.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.utils.durations import load_durations
+from src.utils.sharding import MANIFEST, assign_shards, digest, parse_shard
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--shard",
+        default=None,
+        metavar="i/N",
+        help="Run shard i of N, balanced by saved per-test durations.",
+    )
+    parser.addoption(
+        "--shard-dir",
+        default=None,
+        help="Where the shard writes shard.json and its results (default reports/shards/<i>).",
+    )
+
+
+def pytest_configure(config):
+    spec = config.getoption("shard")
+    if not spec:
+        return
+    try:
+        index, total = parse_shard(spec)
+    except ValueError as exc:
+        raise pytest.UsageError(f"--shard: {exc}") from None
+    directory = config.getoption("shard_dir") or os.path.join("reports", "shards", str(index))
+    config._shard_dir = directory
+    config.pluginmanager.register(ShardRunner(config, index, total, directory), "shard-runner")
+
+
+class ShardRunner:
+    def __init__(self, config, index: int, total: int, directory: str):
+        self.config = config
+        self.index = index
+        self.total = total
+        self.directory = directory
+        self.is_worker = hasattr(config, "workerinput")
+
+        self.plan: dict | None = None
+        self.durations: dict[str, float] = {}
+
+    # After -k/-m deselection, so the shards split what is actually run
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        durations = load_durations()
+        nodeids = sorted(item.nodeid for item in items)
+        mine = set(assign_shards(nodeids, durations, self.total)[self.index - 1])
+
+        selected = [item for item in items if item.nodeid in mine]
+        deselected = [item for item in items if item.nodeid not in mine]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+        self.plan = {
+            "shard": self.index,
+            "total": self.total,
+            "collected": len(nodeids),
+            "collection_hash": digest(nodeids),
+            "durations_hash": digest(json.dumps(durations, sort_keys=True).splitlines()),
+            "assigned": sorted(mine),
+        }
+
+    def pytest_runtest_logreport(self, report):
+        # Runs on the xdist controller for worker reports too
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            # Under xdist only workers collect; every worker's plan is the same
+            workeroutput["shard_plan"] = self.plan
+            return
+        if self.plan is None:
+            return
+        manifest = dict(self.plan, durations=self.durations)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, MANIFEST)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        plan = getattr(node, "workeroutput", {}).get("shard_plan")
+        if plan and self.plan is None:
+            self.plan = plan
+
+    def pytest_report_header(self, config):
+        return (
+            f"shard {self.index}/{self.total} (manifest: {os.path.join(self.directory, MANIFEST)})"
+        )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.plan is not None and not self.is_worker:
+            terminalreporter.write_line(
+                f"shard {self.index}/{self.total}: ran {len(self.plan['assigned'])} "
+                f"of {self.plan['collected']} collected tests"
+            )
@@ -0,0 +1,160 @@
+"""
+Step tracing report (--trace-steps).
+
+Enables src/utils/instrumentation for the run and reports where the time
+went:
+
+- each test gets a "step-trace" Allure attachment listing its page steps
+  with wall time, wait vs. work time and WebDriver round trips
+- the terminal summary shows the N slowest steps (--trace-top) and the
+  time per build
+- --chrome-trace=PATH writes every span (steps, waits, commands) as a
+  Chrome trace-event file for chrome://tracing or https://ui.perfetto.dev
+
+Each process folds a test's spans into a SpanSummary once the test is
+done and drops them; only --chrome-trace keeps every span (up to
+TRACE_MAX_SPANS per process). Under xdist, workers hand their summary, and
+the kept spans, to the controller at session end.
+"""
+
+import json
+import os
+
+import allure
+import pytest
+
+from src.utils.durations import build_of
+from src.utils.instrumentation import MAX_SPANS, TRACER, SpanSummary, chrome_trace
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--trace-steps",
+        action="store_true",
+        default=False,
+        help="Trace page steps, waits and WebDriver commands and report the slowest steps.",
+    )
+    parser.addoption(
+        "--trace-top",
+        type=int,
+        default=15,
+        help="Number of slowest steps listed by --trace-steps.",
+    )
+    parser.addoption(
+        "--chrome-trace",
+        default=None,
+        metavar="PATH",
+        help="Write all traced spans as a Chrome trace-event JSON file (implies --trace-steps).",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("trace_steps") or config.getoption("chrome_trace"):
+        TRACER.enabled = True
+        TRACER.max_spans = MAX_SPANS if config.getoption("chrome_trace") else 0
+        config.pluginmanager.register(StepTraceReporter(config), "step-trace")
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:9.1f}"
+
+
+def format_steps(spans: list[dict]) -> str:
+    """One line per step: wall, wait and work time (ms), round trips and name."""
+    lines = [f"{'wall ms':>9} {'wait ms':>9} {'work ms':>9} {'trips':>5}  step"]
+    for s in spans:
+        indent = "  " * s["depth"]
+        lines.append(
+            f"{_ms(s['duration'])} {_ms(s['wait'])} {_ms(s['duration'] - s['wait'])} "
+            f"{s['round_trips']:>5}  {indent}{s['name']}"
+        )
+    return "\n".join(lines)
+
+
+class StepTraceReporter:
+    def __init__(self, config):
+        self.top = config.getoption("trace_top")
+        self.chrome_trace_path = config.getoption("chrome_trace")
+        self.is_worker = hasattr(config, "workerinput")
+        self.summary = SpanSummary(self.top)
+        # {worker id: spans} and spans left out, filled on the xdist controller
+        # for --chrome-trace
+        self.worker_spans: dict[str, list[dict]] = {}
+        self.worker_dropped = 0
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        TRACER.test = item.nodeid
+        yield
+        TRACER.test = None
+        self.summary.add(TRACER.pop_spans(item.nodeid), build_of(item.nodeid))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield
+        # Setup (page open/reset) and call steps; attached while the Allure test is open
+        steps = [s for s in TRACER.spans_for(item.nodeid) if s["kind"] != "command"]
+        if steps:
+            steps.sort(key=lambda s: s["start"])
+            allure.attach(
+                format_steps(steps), name="step-trace", attachment_type=allure.attachment_type.TEXT
+            )
+
+    def pytest_sessionfinish(self, session):
+        # Steps outside any test (session fixtures)
+        self.summary.add(TRACER.pop_spans(None), None)
+        workeroutput = getattr(session.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["trace_summary"] = self.summary.as_output()
+            workeroutput["trace_spans"] = TRACER.spans
+            workeroutput["trace_dropped"] = TRACER.dropped
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = getattr(node, "workeroutput", {})
+        if "trace_summary" in output:
+            self.summary.merge(output["trace_summary"])
+        if output.get("trace_spans"):
+            self.worker_spans[node.gateway.id] = output["trace_spans"]
+        self.worker_dropped += output.get("trace_dropped", 0)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker:
+            return
+        steps = self.summary.slowest
+        terminalreporter.section(f"slowest {len(steps)} steps")
+        terminalreporter.write_line(
+            f"{'wall ms':>9} {'wait ms':>9} {'work ms':>9} {'trips':>5}  step / test"
+        )
+        for s in steps:
+            terminalreporter.write_line(
+                f"{_ms(s['duration'])} {_ms(s['wait'])} {_ms(s['duration'] - s['wait'])} "
+                f"{s['round_trips']:>5}  {s['name']}  {s['test']}"
+            )
+
+        per_build = self.summary.per_build
+        terminalreporter.section("traced time per build")
+        terminalreporter.write_line(
+            f"{'build':>5} {'wall s':>8} {'wait s':>8} {'work s':>8} {'trips':>7}"
+        )
+        for build in sorted(per_build, key=lambda b: (b is None, b or 0)):
+            wall, wait, round_trips = per_build[build]
+            label = "-" if build is None else str(build)
+            terminalreporter.write_line(
+                f"{label:>5} {wall:8.2f} {wait:8.2f} {wall - wait:8.2f} {round_trips:>7}"
+            )
+
+        if self.chrome_trace_path:
+            by_worker = self.worker_spans or {"main": TRACER.spans}
+            events = [
+                event for worker, ws in by_worker.items() for event in chrome_trace(ws, pid=worker)
+            ]
+            os.makedirs(os.path.dirname(self.chrome_trace_path) or ".", exist_ok=True)
+            with open(self.chrome_trace_path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events}, f)
+            terminalreporter.write_line(f"chrome trace written to: {self.chrome_trace_path}")
+            dropped = self.worker_dropped + TRACER.dropped
+            if dropped:
+                terminalreporter.write_line(
+                    f"chrome trace: {dropped} span(s) past TRACE_MAX_SPANS={MAX_SPANS} per process left out"
+                )
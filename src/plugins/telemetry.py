@@ -0,0 +1,144 @@
+"""
+--telemetry[=HOST:PORT]: serve live run telemetry while the session runs.
+
+The controller (or the only process, without xdist) starts
+src/utils/telemetry.py's TelemetryServer (default 127.0.0.1 on a free
+port, printed at the start of the run):
+
+    curl -s http://127.0.0.1:PORT/metrics        # Prometheus text
+    curl -s http://127.0.0.1:PORT/metrics.json
+
+Each xdist worker gets the server's UDP address through workerinput and
+reports its current test and a stats sample every TELEMETRY_INTERVAL
+seconds: WebDriver commands per second, the RSS of its driver and browser
+and the evidence-capture backlog. Counting WebDriver commands is only
+switched on with --telemetry.
+"""
+
+import time
+
+import pytest
+
+from src.utils.durations import build_of
+from src.utils.sampling import INFERRED_PROPERTY
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--telemetry",
+        nargs="?",
+        const="127.0.0.1:0",
+        default=None,
+        metavar="HOST:PORT",
+        help="Serve live run telemetry (Prometheus /metrics and /metrics.json); default 127.0.0.1, free port.",
+    )
+
+
+def pytest_configure(config):
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        if workerinput.get("telemetry_ipc"):
+            reporter = TelemetryWorker(
+                config, workerinput["telemetry_ipc"], workerinput["workerid"]
+            )
+            config.pluginmanager.register(reporter, "telemetry-worker")
+        return
+
+    address = config.getoption("telemetry")
+    if not address:
+        return
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise pytest.UsageError(f"--telemetry: expected HOST:PORT, got {address!r}")
+    config.pluginmanager.register(TelemetryController(config, host, int(port)), "telemetry")
+
+
+def _outcome(report) -> str | None:
+    """Final outcome of a case from one phase report, or None while it is still running."""
+    if report.outcome == "rerun":
+        return None
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        if hasattr(report, "wasxfail"):
+            return "xfailed" if report.skipped else "xpassed"
+        if report.failed and report.when == "setup":
+            return "error"
+        return report.outcome
+    return None
+
+
+class TelemetryController:
+    def __init__(self, config, host: str, port: int):
+        from src.utils.telemetry import RunTelemetry, TelemetryServer
+
+        self.config = config
+        self.telemetry = RunTelemetry()
+        self.server = TelemetryServer(self.telemetry, host, port).start()
+
+    def pytest_sessionstart(self, session):
+        terminal = self.config.pluginmanager.get_plugin("terminalreporter")
+        if terminal is not None:
+            terminal.write_line(
+                f"telemetry: {self.server.url}/metrics ({self.server.url}/metrics.json)"
+            )
+        # Without xdist this process runs the tests and reports like a worker
+        if not self.config.pluginmanager.has_plugin("dsession"):
+            reporter = TelemetryWorker(self.config, self.server.ipc_address, "main")
+            self.config.pluginmanager.register(reporter, "telemetry-worker")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        node.workerinput["telemetry_ipc"] = self.server.ipc_address
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        self.telemetry.set_collected(len(ids))
+
+    def pytest_collection_finish(self, session):
+        self.telemetry.set_collected(len(session.items))
+
+    def pytest_runtest_logreport(self, report):
+        # Runs on the xdist controller for worker reports too
+        outcome = _outcome(report)
+        if outcome is not None:
+            inferred = INFERRED_PROPERTY in dict(report.user_properties)
+            self.telemetry.completed(report.nodeid, outcome, build_of(report.nodeid), inferred)
+
+    def pytest_unconfigure(self, config):
+        self.server.stop()
+
+
+class TelemetryWorker:
+    """Reports one test-running process to the controller's TelemetryServer."""
+
+    def __init__(self, config, address: str, worker: str):
+        from src.utils.instrumentation import COMMANDS
+        from src.utils.telemetry import WorkerReporter
+
+        self.config = config
+        self.commands = COMMANDS
+        self.commands.enabled = True
+        self._last = (time.monotonic(), self.commands.total)
+        self.reporter = WorkerReporter(address, worker, sample=self.sample).start()
+
+    def sample(self) -> dict:
+        from src.utils.telemetry import browser_rss_bytes
+
+        now, total = time.monotonic(), self.commands.total
+        then, before = self._last
+        self._last = (now, total)
+        evidence = getattr(self.config, "_evidence", None)
+        return {
+            "commands_total": total,
+            "commands_per_second": round((total - before) / max(now - then, 1e-6), 3),
+            "browser_rss_bytes": browser_rss_bytes(),
+            "evidence_backlog": evidence.backlog if evidence is not None else 0,
+        }
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self.reporter.send("start", test=nodeid)
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self.reporter.send("finish", test=nodeid)
+
+    def pytest_unconfigure(self, config):
+        self.reporter.stop()
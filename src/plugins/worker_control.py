@@ -0,0 +1,99 @@
+"""
+--worker-control=DIR: let `run_all_tests.py --workers=auto` steer xdist workers.
+
+Each worker writes DIR/<worker>.pid at startup, so the runner's monitor (see
+src/utils/worker_sizing.py) can measure its process tree. Between tests the
+worker obeys two orders left in DIR:
+
+- <worker>.park: wait until the file is removed before starting the next test
+- <worker>.recycle: recycle the browser after the next test (the file is
+  removed when taken)
+
+Orders are only read between tests, so no test is paused halfway through a
+wait.
+"""
+
+import contextlib
+import os
+import time
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--worker-control",
+        default=None,
+        metavar="DIR",
+        help="Directory where a supervising runner parks workers and recycles their browsers.",
+    )
+
+
+def pytest_configure(config):
+    directory = config.getoption("worker_control")
+    if directory:
+        config.pluginmanager.register(WorkerControl(config, directory), "worker-control")
+
+
+class WorkerControl:
+    def __init__(self, config, directory: str):
+        self.config = config
+        self.directory = directory
+        self.worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        self.parked_seconds = 0.0
+        self.recycles = 0
+        # {worker id: (parked seconds, recycles)}, filled on the xdist controller
+        self.totals: dict[str, tuple[float, int]] = {}
+        self.runs_tests = False
+
+    def pytest_sessionstart(self, session):
+        # xdist's controller (dsession, registered after this plugin) runs no tests
+        self.runs_tests = hasattr(
+            self.config, "workerinput"
+        ) or not self.config.pluginmanager.has_plugin("dsession")
+        if self.runs_tests:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path("pid"), "w", encoding="ascii") as f:
+                f.write(str(os.getpid()))
+
+    def _path(self, order: str) -> str:
+        return os.path.join(self.directory, f"{self.worker}.{order}")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item):
+        started = time.perf_counter()
+        while os.path.exists(self._path("park")):
+            time.sleep(0.5)
+        self.parked_seconds += time.perf_counter() - started
+
+        try:
+            os.remove(self._path("recycle"))
+        except FileNotFoundError:
+            return
+        # Read by the driver fixture when it hands the browser back
+        item._recycle_browser = True
+        self.recycles += 1
+
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if not self.runs_tests:
+            return
+        if workeroutput is not None:
+            workeroutput["worker_control"] = (self.parked_seconds, self.recycles)
+        else:
+            self.totals[self.worker] = (self.parked_seconds, self.recycles)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._path("pid"))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        totals = getattr(node, "workeroutput", {}).get("worker_control")
+        if totals:
+            self.totals[node.gateway.id] = tuple(totals)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        for worker, (parked, recycles) in sorted(self.totals.items()):
+            if parked >= 1 or recycles:
+                terminalreporter.write_line(
+                    f"worker control: {worker} parked {parked:.0f}s, {recycles} browser(s) recycled"
+                )
@@ -0,0 +1,172 @@
+/*
+ * Synthetic stand-in for the TestSheepNZ Basic Calculator.
+ *
+ * NOT the application under test. The public page could not be vendored
+ * when this was written, so element ids, operations and builds follow it
+ * but the defects of builds 1-8 below are invented. Use it to exercise
+ * the framework (unit tests, page-object benchmarks), never to judge a
+ * build. Build behaviour is deterministic:
+ *
+ *   0  Prototype - behaves correctly
+ *   1  Subtract uses the operands in reverse order (b - a)
+ *   2  Multiply drops the fractional part of both inputs
+ *   3  'Integers only' is ignored
+ *   4  Add joins the inputs as text ("1" + "1" = "11")
+ *   5  Results are rounded to the nearest whole number
+ *   6  The sign of the second number is dropped
+ *   7  Divide by zero is not caught and answers are cut to 2 decimal places
+ *   8  Concatenate joins the inputs in reverse order
+ *   9  Second number field and Calculate button are missing
+ *
+ * calculate() is pure (no DOM access) so it can also be loaded into a
+ * plain JavaScript engine and compared with the Python engine port.
+ */
+
+var OPERATIONS = ["Add", "Subtract", "Multiply", "Divide", "Concatenate"];
+var BUILDS = ["Prototype", "1", "2", "3", "4", "5", "6", "7", "8", "9"];
+
+function isNumber(text) {
+    return String(text).trim() !== "" && !isNaN(Number(text));
+}
+
+function calculate(build, op, a, b, integerOnly) {
+    build = Number(build);
+    op = Number(op);
+    a = String(a);
+    b = String(b);
+
+    if (op === 4) {
+        return { answer: build === 8 ? b + a : a + b, error: "" };
+    }
+
+    if (!isNumber(a)) {
+        return { answer: "", error: "Number 1 is not a number" };
+    }
+    if (!isNumber(b)) {
+        return { answer: "", error: "Number 2 is not a number" };
+    }
+
+    var x = Number(a);
+    var y = Number(b);
+    if (build === 6) {
+        y = Math.abs(y);
+    }
+
+    var result;
+    if (op === 0) {
+        result = build === 4 ? a + b : x + y;
+    } else if (op === 1) {
+        result = build === 1 ? y - x : x - y;
+    } else if (op === 2) {
+        result = build === 2 ? Math.trunc(x) * Math.trunc(y) : x * y;
+    } else if (op === 3) {
+        if (y === 0 && build !== 7) {
+            return { answer: "", error: "Divide by zero error!" };
+        }
+        result = x / y;
+        if (build === 7 && isFinite(result)) {
+            result = Math.trunc(result * 100) / 100;
+        }
+    } else {
+        return { answer: "", error: "Unknown operation" };
+    }
+
+    if (build === 5 && typeof result === "number") {
+        result = Math.round(result);
+    }
+    if (integerOnly && build !== 3 && typeof result === "number") {
+        result = Math.trunc(result);
+    }
+
+    return { answer: String(result), error: "" };
+}
+
+/* DOM wiring (skipped when loaded outside a browser) */
+
+function byId(id) {
+    return document.getElementById(id);
+}
+
+function showFor(id, visible) {
+    var el = byId(id);
+    if (el) {
+        el.style.display = visible ? "" : "none";
+    }
+}
+
+// Build 9 removes these rows from the DOM entirely; keep them to restore later.
+var detachedRows = {};
+
+function attachRow(id, attached) {
+    var row = byId(id);
+    if (!attached && row) {
+        var placeholder = document.createComment(id);
+        row.parentNode.replaceChild(placeholder, row);
+        detachedRows[id] = { row: row, placeholder: placeholder };
+    } else if (attached && !row && detachedRows[id]) {
+        var saved = detachedRows[id];
+        saved.placeholder.parentNode.replaceChild(saved.row, saved.placeholder);
+        delete detachedRows[id];
+    }
+}
+
+function applyBuild() {
+    var build = Number(byId("selectBuild").value);
+    attachRow("number2Row", build !== 9);
+    attachRow("calculateRow", build !== 9);
+    clearAnswer();
+}
+
+function applyOperation() {
+    var op = Number(byId("selectOperationDropdown").value);
+    showFor("integerRow", op !== 4);
+}
+
+function clearAnswer() {
+    byId("numberAnswerField").value = "";
+    byId("errorMsgField").textContent = "";
+}
+
+function onCalculate() {
+    var build = byId("selectBuild").value;
+    var op = byId("selectOperationDropdown").value;
+    var number2 = byId("number2Field");
+    var outcome = calculate(
+        build,
+        op,
+        byId("number1Field").value,
+        number2 ? number2.value : "",
+        byId("integerSelect").checked
+    );
+    byId("numberAnswerField").value = outcome.answer;
+    byId("errorMsgField").textContent = outcome.error;
+}
+
+function populate(selectId, labels) {
+    var select = byId(selectId);
+    labels.forEach(function (label, index) {
+        var option = document.createElement("option");
+        option.value = String(index);
+        option.textContent = label;
+        select.appendChild(option);
+    });
+}
+
+if (typeof document !== "undefined") {
+    document.addEventListener("DOMContentLoaded", function () {
+        populate("selectBuild", BUILDS);
+        populate("selectOperationDropdown", OPERATIONS);
+
+        byId("selectBuild").addEventListener("change", applyBuild);
+        byId("selectOperationDropdown").addEventListener("change", applyOperation);
+        byId("calculateButton").addEventListener("click", onCalculate);
+        byId("clearButton").addEventListener("click", clearAnswer);
+
+        applyBuild();
+        applyOperation();
+    });
+}
+
+if (typeof module !== "undefined") {
+    module.exports = { calculate: calculate, OPERATIONS: OPERATIONS, BUILDS: BUILDS };
+}
@@ -0,0 +1,150 @@
+import argparse
+import os
+import re
+import sys
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+_SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Vendored copy of the public calculator (HTML, scripts, styles), written by
+# `python -m src.utils.aut_server vendor`; served by --offline runs
+AUT_DIR = os.path.join(_SRC_DIR, "aut")
+AUT_PAGE = "BasicCalculator.html"
+
+# Synthetic stand-in with the same element ids and invented build defects.
+# For framework tests and page-object benchmarks only, never for verdicts.
+SYNTHETIC_DIR = os.path.join(_SRC_DIR, "synthetic")
+
+# src/href references in the vendored page (scripts, stylesheets, images)
+_ASSET_RE = re.compile(r"""\b(?:src|href)\s*=\s*["']([^"'#]+)["']""", re.IGNORECASE)
+
+
+def is_vendored(directory: str = AUT_DIR) -> bool:
+    """Whether a copy of the public calculator has been vendored into 'directory'."""
+    return os.path.isfile(os.path.join(directory, AUT_PAGE))
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request to stderr."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AUTServer:
+    """
+    Serve a copy of the calculator from a background thread on an ephemeral port.
+
+    Used by the --offline pytest option (the vendored AUT_DIR) so runs do
+    not depend on the public site (no network latency, works on air-gapped
+    runners). Pass directory=SYNTHETIC_DIR to serve the synthetic fixture.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, directory: str = AUT_DIR):
+        self.host = host
+        self.port = port
+        self.directory = directory
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Full URL of the calculator page on the running server."""
+        return f"http://{self.host}:{self.port}/{AUT_PAGE}"
+
+    def start(self) -> "AUTServer":
+        if not is_vendored(self.directory):
+            raise FileNotFoundError(
+                f"no {AUT_PAGE} in {self.directory}; vendor the public calculator with "
+                "`python -m src.utils.aut_server vendor`"
+            )
+        handler = partial(_QuietHandler, directory=self.directory)
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="aut-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+
+# Vendoring
+def vendor(url: str, directory: str = AUT_DIR) -> tuple[list[str], list[str]]:
+    """
+    Save the page at 'url' as AUT_PAGE in 'directory', with every same-origin
+    script, stylesheet and image it references at the same relative path.
+
+    Returns:
+        (saved paths, references left out): off-origin references are not
+        vendored and still need the network (or are blocked by the lean
+        browser profile).
+    """
+    import urllib.parse
+    import urllib.request
+
+    def fetch(address: str) -> bytes:
+        with urllib.request.urlopen(address, timeout=30) as response:
+            return response.read()
+
+    page = fetch(url)
+    origin = urllib.parse.urlsplit(url)
+    base_dir = origin.path.rsplit("/", 1)[0] + "/"
+    files = {AUT_PAGE: page}
+    skipped = []
+    for reference in dict.fromkeys(_ASSET_RE.findall(page.decode("utf-8", "replace"))):
+        target = urllib.parse.urlsplit(urllib.parse.urljoin(url, reference))
+        if (target.scheme, target.netloc) != (origin.scheme, origin.netloc):
+            skipped.append(reference)
+            continue
+        if not target.path.startswith(base_dir) or target.path == origin.path:
+            skipped.append(reference)
+            continue
+        relative = urllib.parse.unquote(target.path[len(base_dir) :])
+        if not relative or relative.endswith("/") or ".." in relative.split("/"):
+            skipped.append(reference)
+            continue
+        files[relative] = fetch(urllib.parse.urlunsplit(target._replace(query="", fragment="")))
+
+    saved = []
+    for relative, content in files.items():
+        path = os.path.join(directory, *relative.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        saved.append(path)
+    return saved, skipped
+
+
+def main(argv=None) -> int:
+    from src.utils.web import BASE_URL
+
+    parser = argparse.ArgumentParser(description="Vendor the public calculator for --offline runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    vendor_parser = commands.add_parser(
+        "vendor", help=f"Save the AUT page and its assets into {AUT_DIR}."
+    )
+    vendor_parser.add_argument(
+        "--url", default=BASE_URL, help="Page to vendor (default: BASE_URL)."
+    )
+    args = parser.parse_args(argv)
+
+    saved, skipped = vendor(args.url)
+    for path in saved:
+        print(f"saved {os.path.relpath(path)}")
+    for reference in skipped:
+        print(f"not vendored (other origin or outside the page's directory): {reference}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
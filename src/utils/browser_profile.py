@@ -0,0 +1,148 @@
+"""
+Browser profiles for create_driver(), chosen with BROWSER_PROFILE.
+
+- default: the plain headless browser.
+- lean: only the calculator's own HTML, CSS and JS are loaded.
+  - Other hosts are unreachable. Chrome maps every hostname except the AUT's
+    to NOTFOUND with --host-resolver-rules. Firefox sends everything except
+    the AUT through a dead proxy.
+  - Images, fonts and media are blocked on the AUT host as well: over CDP
+    Network.setBlockedURLs on Chrome, through prefs on Firefox.
+  - Background networking, extensions, GPU compositing and component updates
+    are turned off.
+  - The HTTP disk cache lives under reports/.cache/browser/ and survives
+    between runs. There is one directory per live browser (xdist worker and
+    cache slot), because neither browser's cache is safe to share between
+    live browser processes: pool browsers and a background replacement each
+    hold a slot until their driver is gone.
+
+Everything here is plain data, so it can be checked without a browser.
+"""
+
+import os
+import threading
+from urllib.parse import urlparse
+
+PROFILES = ("default", "lean")
+BROWSER_PROFILE = os.getenv("BROWSER_PROFILE", "default").lower()
+BROWSER_CACHE_DIR = os.getenv("BROWSER_CACHE_DIR", os.path.join("reports", ".cache", "browser"))
+
+# Loopback hosts stay reachable for the --offline AUT server
+LOCAL_HOSTS = ("localhost", "127.0.0.1")
+
+# Resource types the calculator does not need (Network.setBlockedURLs wildcards)
+_IMAGES = ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp")
+_FONTS = ("woff", "woff2", "ttf", "otf", "eot")
+_MEDIA = ("mp3", "mp4", "webm", "ogg", "wav")
+BLOCKED_URL_PATTERNS = [f"*.{ext}" for ext in _IMAGES + _FONTS + _MEDIA]
+
+CHROME_LEAN_ARGUMENTS = [
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-gpu",
+    "--disable-gpu-compositing",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+]
+
+FIREFOX_LEAN_PREFS = {
+    # Images, web fonts and media
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "media.autoplay.default": 5,
+    # Background networking and updates
+    "app.update.auto": False,
+    "app.update.enabled": False,
+    "extensions.update.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.search.update": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+    # GPU compositing
+    "layers.acceleration.disabled": True,
+    "gfx.webrender.software": True,
+    # Disk cache on, in the directory set by lean_firefox_prefs()
+    "browser.cache.disk.enable": True,
+}
+
+
+def profile_name(name: str = BROWSER_PROFILE) -> str:
+    if name not in PROFILES:
+        raise RuntimeError(
+            f"Unsupported BROWSER_PROFILE: {name} (expected one of {', '.join(PROFILES)})"
+        )
+    return name
+
+
+def allowed_hosts(base_url: str) -> list[str]:
+    """Hosts the lean profile can reach: the AUT's and loopback."""
+    host = urlparse(base_url).hostname
+    return ([host] if host and host not in LOCAL_HOSTS else []) + list(LOCAL_HOSTS)
+
+
+# Cache slots held by this process's live browsers
+_SLOTS: set[int] = set()
+_SLOTS_LOCK = threading.Lock()
+
+
+def claim_cache_slot() -> int:
+    """The lowest cache slot no live browser of this process holds; free it with release_cache_slot()."""
+    with _SLOTS_LOCK:
+        slot = next(n for n in range(len(_SLOTS) + 1) if n not in _SLOTS)
+        _SLOTS.add(slot)
+        return slot
+
+
+def release_cache_slot(slot: int) -> None:
+    with _SLOTS_LOCK:
+        _SLOTS.discard(slot)
+
+
+def cache_dir(browser: str, slot: int = 0, root: str = BROWSER_CACHE_DIR) -> str:
+    """Disk cache directory of one browser, e.g. reports/.cache/browser/chrome-gw0-1 for slot 1 on gw0."""
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    return os.path.abspath(os.path.join(root, f"{browser}-{worker}-{slot}"))
+
+
+def lean_chrome_arguments(base_url: str, disk_cache: str) -> list[str]:
+    rules = ", ".join(["MAP * ~NOTFOUND"] + [f"EXCLUDE {host}" for host in allowed_hosts(base_url)])
+    return CHROME_LEAN_ARGUMENTS + [
+        f"--host-resolver-rules={rules}",
+        f"--disk-cache-dir={disk_cache}",
+    ]
+
+
+def lean_firefox_prefs(base_url: str, disk_cache: str) -> dict:
+    prefs = dict(FIREFOX_LEAN_PREFS)
+    prefs["browser.cache.disk.parent_directory"] = disk_cache
+    # Anything not on the AUT host goes to a proxy that refuses connections
+    prefs.update(
+        {
+            "network.proxy.type": 1,
+            "network.proxy.http": "127.0.0.1",
+            "network.proxy.http_port": 9,
+            "network.proxy.ssl": "127.0.0.1",
+            "network.proxy.ssl_port": 9,
+            "network.proxy.no_proxies_on": ", ".join(allowed_hosts(base_url)),
+        }
+    )
+    return prefs
+
+
+def block_resources(driver) -> None:
+    """Block images, fonts and media for this Chrome session over CDP."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
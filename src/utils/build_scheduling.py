@@ -0,0 +1,46 @@
+"""
+The --build-scheduling xdist scheduler (see src/plugins/build_scheduler.py).
+
+Kept out of the plugin module so xdist workers, which never schedule, do not
+import xdist.scheduler.
+"""
+
+from xdist.scheduler import LoadScopeScheduling
+
+from src.utils.durations import build_of, estimate, load_durations, median_duration
+
+
+class BuildScheduling(LoadScopeScheduling):
+    """
+    LoadScopeScheduling where a scope is one calculator build.
+
+    Work units are handed out longest-first (LPT), using saved durations,
+    so one slow build does not end up last on an otherwise idle worker.
+    """
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self._durations = load_durations()
+        self._default = median_duration(self._durations)
+        # A scope's tests never change, so each scope is costed once
+        self._costs: dict[str, float] = {}
+
+    def _split_scope(self, nodeid: str) -> str:
+        build = build_of(nodeid)
+        if build is None:
+            return super()._split_scope(nodeid)
+        return f"build-{build}"
+
+    def _unit_cost(self, scope: str) -> float:
+        cost = self._costs.get(scope)
+        if cost is None:
+            work_unit = self.workqueue[scope]
+            cost = sum(estimate(nodeid, self._durations, self._default) for nodeid in work_unit)
+            self._costs[scope] = cost
+        return cost
+
+    def _assign_work_unit(self, node) -> None:
+        if self.workqueue:
+            heaviest = max(self.workqueue, key=self._unit_cost)
+            self.workqueue.move_to_end(heaviest, last=False)
+        super()._assign_work_unit(node)
@@ -0,0 +1,114 @@
+"""
+Per-build capability map: which calculator controls each build actually has.
+
+Discovered once per session by visiting every build in the page (one script
+call), and cached on disk keyed by a hash of the AUT's HTML and scripts, so
+later runs against an unchanged AUT skip discovery entirely. Tests consult
+the map to xfail incomplete builds instantly instead of waiting on probes.
+"""
+
+import hashlib
+import json
+import os
+import re
+from urllib.parse import urljoin
+
+CACHE_DIR = os.path.join("reports", ".cache")
+
+_SCRIPT_SRC_RE = re.compile(r"""<script[^>]+src=["']([^"']+)["']""", re.IGNORECASE)
+
+# Visits every build in #selectBuild and records which controls exist.
+# Leaves the page on build 0.
+CAPABILITIES_JS = """
+function byId(id) { return document.getElementById(id); }
+function fire(el, type) { el.dispatchEvent(new Event(type, { bubbles: true })); }
+
+var select = byId("selectBuild");
+var builds = Array.prototype.map.call(select.options, function (o) { return o.value; });
+var map = {};
+
+builds.forEach(function (build) {
+    select.value = build;
+    fire(select, "change");
+
+    var ops = byId("selectOperationDropdown");
+    var controls = {
+        number1: !!byId("number1Field"),
+        number2: !!byId("number2Field"),
+        calculate: !!byId("calculateButton"),
+        answer: !!byId("numberAnswerField"),
+        integer_only: !!byId("integerSelect")
+    };
+    map[build] = {
+        complete: controls.number1 && controls.number2 && controls.calculate,
+        controls: controls,
+        operations: ops ? Array.prototype.map.call(ops.options, function (o) { return o.value; }) : []
+    };
+});
+
+select.value = builds[0];
+fire(select, "change");
+return map;
+"""
+
+
+def aut_content_hash(base_url: str, timeout: float = 10) -> str | None:
+    """
+    Hash the AUT page and every script it loads.
+
+    Returns None when the AUT cannot be fetched (callers then skip the disk cache).
+    """
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(base_url, timeout=timeout) as resp:
+            html = resp.read()
+        digest = hashlib.sha256(html)
+        for src in _SCRIPT_SRC_RE.findall(html.decode("utf-8", errors="replace")):
+            with urllib.request.urlopen(urljoin(base_url, src), timeout=timeout) as resp:
+                digest.update(resp.read())
+        return digest.hexdigest()
+    except (OSError, ValueError):
+        return None
+
+
+def _normalise(raw: dict) -> dict[int, dict]:
+    return {int(build): caps for build, caps in raw.items()}
+
+
+def load_capabilities(content_hash: str, cache_dir: str = CACHE_DIR) -> dict[int, dict] | None:
+    path = os.path.join(cache_dir, f"capabilities-{content_hash}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return _normalise(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+def save_capabilities(
+    content_hash: str, capabilities: dict[int, dict], cache_dir: str = CACHE_DIR
+) -> None:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"capabilities-{content_hash}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({str(b): caps for b, caps in capabilities.items()}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def load_or_discover(discover, base_url: str, cache_dir: str = CACHE_DIR) -> dict[int, dict]:
+    """
+    Return the capability map for the AUT at base_url, from the disk cache
+    when the AUT is unchanged, otherwise by calling discover() (which should
+    return an opened page's capabilities()).
+    """
+    content_hash = aut_content_hash(base_url)
+    if content_hash:
+        cached = load_capabilities(content_hash, cache_dir)
+        if cached is not None:
+            return cached
+
+    capabilities = _normalise(discover())
+    if content_hash:
+        save_capabilities(content_hash, capabilities, cache_dir)
+    return capabilities
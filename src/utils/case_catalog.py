@@ -0,0 +1,233 @@
+"""
+Compiled, indexed test-data catalog.
+
+Case files (JSON array, JSONL or CSV) are read as a stream, each row is
+compiled once (typed op/build/integer_only, expected-value alternatives
+split and normalized up front) and the result is indexed by op, build and
+tag. The compiled catalog is pickled under reports/.cache keyed by a hash
+of the source file, so every xdist worker after the first just maps the
+cached file instead of parsing and normalizing the data again.
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import re
+from collections import defaultdict
+
+from src.utils.capabilities import CACHE_DIR
+
+# Bump when compile_row() output changes, to invalidate cached catalogs
+CATALOG_VERSION = 1
+
+# Optional row selection, e.g. CASE_FILTER="op=3" or CASE_FILTER="op=0,tag=fuzz"
+CASE_FILTER = os.getenv("CASE_FILTER", "")
+
+_LOADED: dict[str, "CaseCatalog"] = {}
+
+
+def normalize_text(text: str) -> str:
+    """Loose form of an answer or message used for substring matching."""
+    text = text.lower().strip()
+    text = text.replace("zero", "0")
+    text = re.sub(r"[!.,]", "", text)
+    text = re.sub(r"\s+", " ", text)
+    return text
+
+
+def _as_number(text: str) -> float | None:
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in {"1", "true", "yes"}
+
+
+# Streaming readers
+def _iter_json_array(f, chunk_size: int = 1 << 16):
+    """Yield the elements of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    opened = False
+
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if not opened and buffer:
+            if buffer[0] != "[":
+                raise ValueError("Case file must contain a JSON array")
+            buffer = buffer[1:]
+            opened = True
+            continue
+        if opened and buffer.startswith("]"):
+            return
+        if opened and buffer:
+            try:
+                value, end = decoder.raw_decode(buffer)
+                # A value ending exactly at the buffer edge may be cut short
+                if end < len(buffer) or eof:
+                    yield value
+                    buffer = buffer[end:]
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        if eof:
+            if opened:
+                raise ValueError("Unterminated JSON array in case file")
+            return
+        chunk = f.read(chunk_size)
+        eof = chunk == ""
+        buffer += chunk
+
+
+def iter_rows(path: str):
+    """Stream raw rows (dicts) from a .json, .jsonl or .csv case file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif extension == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            yield from _iter_json_array(f)
+    else:
+        raise ValueError(f"Unsupported case file type: {path}")
+
+
+# Compilation
+def compile_row(raw: dict, index: int) -> dict:
+    """
+    Typed, pre-normalized form of one raw row.
+
+    The original keys stay available (desc, op, a, b, expected, notes), so
+    tests read compiled rows like the raw data.
+    """
+    expected = str(raw.get("expected", ""))
+    options = tuple(e.strip() for e in expected.split("|"))
+    build = raw.get("build")
+    tags = raw.get("tags") or ()
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(";") if t.strip()]
+
+    return {
+        "index": index,
+        "desc": raw.get("desc", ""),
+        "notes": raw.get("notes", ""),
+        "build": int(build) if build not in (None, "") else None,
+        "op": int(raw["op"]),
+        "a": str(raw["a"]),
+        "b": str(raw["b"]),
+        "integer_only": _as_bool(raw.get("integer_only", False)),
+        "expected": expected,
+        "expected_options": options,
+        "expected_normalized": tuple(normalize_text(e) for e in options),
+        "expected_numbers": tuple(n for n in map(_as_number, options) if n is not None),
+        "tags": tuple(tags),
+    }
+
+
+class CaseCatalog:
+    """Compiled rows plus op / build / tag indexes."""
+
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.by_op: dict[int, list[int]] = defaultdict(list)
+        self.by_build: dict[int | None, list[int]] = defaultdict(list)
+        self.by_tag: dict[str, list[int]] = defaultdict(list)
+
+        for row in rows:
+            self.by_op[row["op"]].append(row["index"])
+            self.by_build[row["build"]].append(row["index"])
+            for tag in row["tags"]:
+                self.by_tag[tag].append(row["index"])
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def select(
+        self, op: int | None = None, build: int | None = None, tag: str | None = None
+    ) -> list[dict]:
+        """
+        Rows matching every given criterion, in file order.
+
+        Rows without a build apply to every build, so they match any 'build'.
+        """
+        selected = None
+        if op is not None:
+            selected = set(self.by_op.get(int(op), ()))
+        if build is not None:
+            matches = set(self.by_build.get(int(build), ())) | set(self.by_build.get(None, ()))
+            selected = matches if selected is None else selected & matches
+        if tag is not None:
+            matches = set(self.by_tag.get(tag, ()))
+            selected = matches if selected is None else selected & matches
+
+        if selected is None:
+            return list(self.rows)
+        return [self.rows[i] for i in sorted(selected)]
+
+
+def case_filter(spec: str = CASE_FILTER) -> dict:
+    """Parse "op=3,tag=fuzz" into CaseCatalog.select() keyword arguments."""
+    criteria = {}
+    for part in spec.split(","):
+        if "=" in part:
+            key, value = (p.strip() for p in part.split("=", 1))
+            if key not in ("op", "build", "tag"):
+                raise ValueError(f"Unknown CASE_FILTER key: {key}")
+            criteria[key] = value if key == "tag" else int(value)
+    return criteria
+
+
+# Caching
+def _source_hash(path: str) -> str:
+    digest = hashlib.sha256(f"v{CATALOG_VERSION}".encode("ascii"))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_catalog(path: str, cache_dir: str = CACHE_DIR) -> CaseCatalog:
+    """
+    Return the compiled catalog for a case file.
+
+    Order of preference: this process's copy, the pickled catalog for the
+    file's current hash, and finally a fresh streaming compile (which is
+    then cached for the next worker / run).
+    """
+    digest = _source_hash(path)
+    if digest in _LOADED:
+        return _LOADED[digest]
+
+    cache_path = os.path.join(cache_dir, f"catalog-{digest}.pickle")
+    try:
+        with open(cache_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            catalog = pickle.loads(data)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+        catalog = CaseCatalog([compile_row(raw, i) for i, raw in enumerate(iter_rows(path))])
+
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+
+    _LOADED[digest] = catalog
+    return catalog
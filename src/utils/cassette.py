@@ -0,0 +1,267 @@
+"""
+Record WebDriver traffic into cassettes and replay it without a browser.
+
+A cassette holds every command one test sent through its driver's command
+executor, with the response and how long it took:
+
+    {"version": 1, "test": nodeid, "aut_hash": ..., "completeness": {...},
+     "scripts": {digest: source}, "interactions": [[command, params, response, seconds], ...]}
+
+Scripts are stored once and referenced by digest, screenshots are replaced
+by a 1x1 PNG, and the session id is dropped, which keeps cassettes small
+and comparable between recordings.
+
+replaying() builds a real selenium WebDriver whose executor answers from a
+cassette, so CalculatorPage runs unchanged against it. Responses are handed
+out in order; a command that does not match the next recorded one raises
+CassetteMismatch. Wait loops may poll once more or once less than during
+recording, so a repeated poll gets the previous answer again, and surplus
+recorded polls are skipped. While replaying, selenium's wait loop runs on a
+virtual clock: it advances by each command's recorded duration, and a poll
+interval passes instantly. A two-second probe of a broken build therefore
+replays in milliseconds, with the same number of polls as when recorded.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+
+CASSETTE_DIR = os.getenv("CASSETTE_DIR", os.path.join("tests", "cassettes"))
+CASSETTE_VERSION = 1
+
+# W3C commands whose 'script' parameter is stored by digest
+_SCRIPT_COMMANDS = ("w3cExecuteScript", "w3cExecuteScriptAsync")
+_SCREENSHOT_COMMANDS = ("screenshot", "elementScreenshot")
+# Answered by the replay executor itself
+_NEW_SESSION = "newSession"
+_QUIT = "quit"
+_SESSION_ID = "replay"
+
+# 1x1 transparent PNG stored in place of real screenshots
+_PLACEHOLDER_PNG = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+
+class CassetteMismatch(AssertionError):
+    """The code under test sent a command the cassette did not record."""
+
+
+def script_digest(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+def cassette_path(nodeid: str, directory: str = CASSETTE_DIR) -> str:
+    """tests/test_x.py::test_y[a-b] -> <directory>/test_x/test_y_a-b_-<hash>.json"""
+    module, _, name = nodeid.partition("::")
+    module_dir = os.path.splitext(os.path.basename(module))[0]
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)[:100]
+    digest = hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(directory, module_dir, f"{safe}-{digest}.json")
+
+
+class Cassette:
+    def __init__(self, test: str = "", aut_hash: str | None = None, **meta):
+        self.test = test
+        self.aut_hash = aut_hash
+        self.meta = meta
+        self.scripts: dict[str, str] = {}
+        self.interactions: list[list] = []
+        self.recording = False
+
+    # Recording
+    def normalize(self, command: str, params: dict | None) -> dict:
+        """Comparable, JSON-safe copy of a command's parameters."""
+        params = json.loads(json.dumps(params or {}, default=str))
+        params.pop("sessionId", None)
+        if command in _SCRIPT_COMMANDS and "script" in params:
+            digest = script_digest(params["script"])
+            self.scripts.setdefault(digest, params["script"])
+            params["script"] = digest
+        return params
+
+    def add(self, command: str, params: dict, response, seconds: float) -> None:
+        response = json.loads(json.dumps(response, default=str))
+        if (
+            command in _SCREENSHOT_COMMANDS
+            and isinstance(response, dict)
+            and "status" not in response
+        ):
+            response["value"] = _PLACEHOLDER_PNG
+        self.interactions.append([command, params, response, round(seconds, 4)])
+
+    # Files
+    def save(self, path: str) -> None:
+        record = {
+            "version": CASSETTE_VERSION,
+            "test": self.test,
+            "aut_hash": self.aut_hash,
+            **self.meta,
+            "scripts": self.scripts,
+            "interactions": self.interactions,
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        if record.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{path}: unsupported cassette version {record.get('version')}")
+        scripts = record.pop("scripts")
+        interactions = record.pop("interactions")
+        record.pop("version")
+        cassette = cls(**record)
+        cassette.scripts = scripts
+        cassette.interactions = interactions
+        return cassette
+
+    def is_stale(self, aut_hash: str | None) -> bool:
+        """Recorded against another AUT; an unknown current hash never makes it stale."""
+        return aut_hash is not None and self.aut_hash != aut_hash
+
+
+def record_commands(driver, cassette: Cassette) -> Cassette:
+    """
+    Add every command 'driver' sends to 'cassette' while cassette.recording
+    is set. Hooks the command executor once, like instrument_driver(); later
+    calls only switch the cassette.
+    """
+    executor = driver.command_executor
+    if not hasattr(executor, "_cassette"):
+        execute = executor.execute
+
+        def recording_execute(command, params=None):
+            current = executor._cassette
+            if current is None or not current.recording:
+                return execute(command, params)
+            # The executor consumes path parameters, so normalize first
+            request = current.normalize(command, params)
+            started = time.perf_counter()
+            response = execute(command, params)
+            current.add(command, request, response, time.perf_counter() - started)
+            return response
+
+        executor.execute = recording_execute
+    executor._cassette = cassette
+    cassette.recording = True
+    return cassette
+
+
+# Replay
+class VirtualClock:
+    """Stands in for the time module in selenium's wait loop; sleeping advances it instead of blocking."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class ReplayExecutor:
+    """Command executor that answers from a cassette."""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self.clock = VirtualClock()
+        self.position = 0
+        self._last: list | None = None
+
+    def execute(self, command: str, params: dict | None = None):
+        if command == _NEW_SESSION:
+            return {
+                "value": {
+                    "sessionId": _SESSION_ID,
+                    "capabilities": self.cassette.meta.get("capabilities", {}),
+                }
+            }
+        if command == _QUIT:
+            return {"value": None}
+
+        request = [command, self.cassette.normalize(command, params)]
+        interactions = self.cassette.interactions
+        # Surplus polls recorded before the next new command
+        while (
+            self._last is not None
+            and self.position < len(interactions)
+            and interactions[self.position][:2] == self._last[:2]
+            and request != interactions[self.position][:2]
+        ):
+            self.position += 1
+
+        if self.position < len(interactions) and interactions[self.position][:2] == request:
+            entry = interactions[self.position]
+            self.position += 1
+        elif self._last is not None and self._last[:2] == request:
+            # One more poll than recorded
+            entry = self._last
+        else:
+            expected = (
+                interactions[self.position][:2]
+                if self.position < len(interactions)
+                else "end of cassette"
+            )
+            raise CassetteMismatch(
+                f"{self.cassette.test}: interaction {self.position}: expected {expected}, got {request}"
+            )
+
+        self._last = entry
+        self.clock.now += entry[3]
+        return copy.deepcopy(entry[2])
+
+    def close(self) -> None:
+        pass
+
+
+def replay_driver(executor: ReplayExecutor):
+    """A selenium WebDriver whose commands are answered by 'executor'."""
+    from selenium.webdriver.common.options import ArgOptions
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    return WebDriver(command_executor=executor, options=ArgOptions())
+
+
+@contextmanager
+def replaying(cassette: Cassette):
+    """Yield a replay driver for 'cassette', with selenium's waits on its virtual clock."""
+    from selenium.webdriver.support import wait as wait_module
+
+    executor = ReplayExecutor(cassette)
+    original = wait_module.time
+    wait_module.time = executor.clock
+    try:
+        yield replay_driver(executor)
+    finally:
+        wait_module.time = original
+
+
+def stale_cassettes(aut_hash: str | None, directory: str = CASSETTE_DIR) -> list[str]:
+    """Cassettes under 'directory' recorded against a different AUT."""
+    stale = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            # capabilities-<hash>.json is the capability map saved next to the cassettes
+            if not name.endswith(".json") or name.startswith("capabilities-"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                if Cassette.load(path).is_stale(aut_hash):
+                    stale.append(path)
+            except (OSError, ValueError, KeyError):
+                stale.append(path)
+    return stale
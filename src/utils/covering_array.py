@@ -0,0 +1,109 @@
+"""
+t-wise (pairwise, 3-way, ...) reduction of the build x case matrix.
+
+Each test of the matrix is described by its factors: build, operation,
+integer_only and the class of its inputs (input_class()). A t-wise set
+covers every combination of t factor values that occurs anywhere in the
+full product; most defects need only one or two factors to line up, so
+it finds them with a fraction of the tests.
+
+The data ties factors together (a case fixes op, integer_only and input
+class at once), so instead of constructing rows freely the way classic
+covering-array tools do, covering_subset() picks tests out of the
+collected product: a greedy set cover that repeatedly takes the test
+covering the most combinations not covered yet. Gains only ever shrink,
+so it re-evaluates lazily off a heap. The choice depends only on the rows
+and their order, so every xdist worker and shard picks the same tests.
+"""
+
+import heapq
+from itertools import combinations
+
+STRENGTHS = ("2", "3", "full")
+
+INPUT_CLASSES = ("int", "float", "negative", "sci-notation", "non-numeric", "zero-divisor")
+
+
+def _number(text: str) -> float | None:
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def input_class(op: int, a: str, b: str) -> str:
+    """
+    Dominant class of a case's inputs; when several apply, the one most
+    likely to change the outcome wins (non-numeric over a zero divisor over
+    scientific notation over a negative over a float).
+    """
+    numbers = [_number(str(v).strip()) for v in (a, b)]
+    if None in numbers:
+        return "non-numeric"
+    if int(op) == 3 and numbers[1] == 0:
+        return "zero-divisor"
+    if any("e" in str(v).lower() for v in (a, b)):
+        return "sci-notation"
+    if any(n < 0 for n in numbers):
+        return "negative"
+    if any("." in str(v) for v in (a, b)):
+        return "float"
+    return "int"
+
+
+def matrix_case(params: dict) -> dict | None:
+    """
+    The case a build x case test runs, from its parameters: a case/row dict
+    or op/a/b/expected parameters, plus the build. None outside the matrix.
+    """
+    if "build" not in params:
+        return None
+    case = next((v for v in params.values() if isinstance(v, dict) and "op" in v), params)
+    if "op" not in case:
+        return None
+    return {
+        "build": params["build"],
+        "op": int(case["op"]),
+        "a": case.get("a"),
+        "b": case.get("b"),
+        "integer_only": case.get("integer_only"),
+        "expected": case.get("expected"),
+    }
+
+
+def interactions(row: dict, strength: int) -> frozenset:
+    """Every combination of 'strength' (factor, value) pairs in 'row'."""
+    items = sorted(row.items())
+    return frozenset(combinations(items, min(strength, len(items))))
+
+
+def covering_subset(rows: list[dict], strength: int) -> list[int]:
+    """
+    Indexes (ascending) of a small subset of 'rows' that covers every
+    'strength'-way combination of factor values present in 'rows'.
+    """
+    covers = [interactions(row, strength) for row in rows]
+    uncovered = set().union(*covers)
+    heap = [(-len(c), i) for i, c in enumerate(covers)]
+    heapq.heapify(heap)
+
+    selected = []
+    while uncovered and heap:
+        _, index = heapq.heappop(heap)
+        gain = len(covers[index] & uncovered)
+        if gain == 0:
+            continue
+        if heap and gain < -heap[0][0]:
+            # Stale: somebody else may now cover more
+            heapq.heappush(heap, (-gain, index))
+            continue
+        selected.append(index)
+        uncovered -= covers[index]
+    return sorted(selected)
+
+
+def interaction_coverage(rows: list[dict], selected: list[int], strength: int) -> tuple[int, int]:
+    """(covered, total) 'strength'-way combinations of 'rows' reached by the 'selected' ones."""
+    total = set().union(*(interactions(row, strength) for row in rows))
+    covered = set().union(*(interactions(rows[i], strength) for i in selected))
+    return len(covered), len(total)
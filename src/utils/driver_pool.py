@@ -0,0 +1,161 @@
+import contextlib
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+
+from src.utils.web import create_driver
+
+# Pool sizing (per pytest/xdist worker)
+POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "1"))
+MAX_USES = int(os.getenv("DRIVER_MAX_USES", "100"))
+
+
+def is_healthy(driver) -> bool:
+    """
+    Cheap liveness probe for a browser returned to the pool.
+
+    Args:
+        driver: Selenium WebDriver instance.
+
+    Returns:
+        True if the session still has a window and the document has loaded
+        far enough to be scripted; False on any driver error (crash, wedged tab,
+        lost session).
+    """
+    try:
+        _ = driver.current_window_handle
+        state = driver.execute_script("return document.readyState")
+        return state in ("interactive", "complete")
+    except Exception:
+        return False
+
+
+class DriverPool:
+    """
+    A small pool of pre-spawned WebDriver instances for one worker.
+
+    Each test leases one browser. On return the browser is probed; it is
+    recycled (quit and replaced in the background) when the probe fails,
+    when the caller reports it broken, or after max_uses leases. This keeps
+    a single wedged browser from failing every later test on the worker.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_uses: int = MAX_USES, factory=create_driver):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.factory = factory
+
+        self.recycled = 0
+        self._idle = []
+        # Keyed by the driver itself: id()s are reused once a driver is collected
+        self._uses = weakref.WeakKeyDictionary()
+        self._pending = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    # Lifecycle
+    def start(self) -> "DriverPool":
+        """Spawn the initial browsers."""
+        for _ in range(self.size):
+            self._add(self.factory())
+        return self
+
+    def close(self) -> None:
+        """Quit every idle browser. Leased browsers are quit when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for drv in idle:
+            self._quit(drv)
+
+    # Leasing
+    def acquire(self):
+        """
+        Take an idle browser, waiting for a background replacement if one is
+        already being spawned, or spawning one inline if the pool is empty.
+        """
+        with self._cond:
+            while not self._idle and self._pending:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+
+        drv = self.factory()
+        with self._cond:
+            self._uses[drv] = 0
+        return drv
+
+    def release(self, driver, broken: bool = False) -> None:
+        """
+        Return a browser to the pool, recycling it when it is broken,
+        unhealthy or has reached max_uses.
+        """
+        with self._cond:
+            uses = self._uses.get(driver, 0) + 1
+            self._uses[driver] = uses
+            closed = self._closed
+
+        if closed:
+            self._discard(driver)
+            return
+
+        if broken or uses >= self.max_uses or not is_healthy(driver):
+            self._discard(driver)
+            self.recycled += 1
+            self._spawn_replacement()
+            return
+
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self):
+        """Context manager wrapper around acquire()/release()."""
+        drv = self.acquire()
+        try:
+            yield drv
+        finally:
+            self.release(drv)
+
+    # Internals
+    def _add(self, driver) -> None:
+        with self._cond:
+            self._uses[driver] = 0
+            self._idle.append(driver)
+            self._cond.notify()
+
+    def _discard(self, driver) -> None:
+        with self._cond:
+            self._uses.pop(driver, None)
+        self._quit(driver)
+
+    def _spawn_replacement(self) -> None:
+        with self._cond:
+            self._pending += 1
+
+        def spawn():
+            try:
+                drv = self.factory()
+            except Exception:
+                drv = None
+            with self._cond:
+                self._pending -= 1
+                keep = drv is not None and not self._closed
+                if keep:
+                    self._uses[drv] = 0
+                    self._idle.append(drv)
+                self._cond.notify_all()
+            # Quit outside the lock: a browser shutdown must not block acquire()
+            if drv is not None and not keep:
+                self._quit(drv)
+
+        threading.Thread(target=spawn, name="driver-pool-spawn", daemon=True).start()
+
+    @staticmethod
+    def _quit(driver) -> None:
+        # Browser already gone; nothing left to clean up
+        with contextlib.suppress(Exception):
+            driver.quit()
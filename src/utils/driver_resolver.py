@@ -0,0 +1,212 @@
+"""
+Locate the chromedriver / geckodriver binary without a network round trip.
+
+Resolution order:
+  1. CHROMEDRIVER_PATH / GECKODRIVER_PATH from the environment
+  2. reports/.cache/drivers.lock.json, keyed by browser and major version
+     (the last driver resolved for the browser when its version is unknown)
+  3. a driver already on PATH
+  4. Selenium Manager (bundled with selenium, works from its own cache)
+  5. webdriver_manager (network download), as a last resort
+
+Steps 2-5 run under a file lock, so when several xdist workers start at once
+one of them resolves the driver and the rest read its lockfile entry.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+
+DRIVER_CACHE_DIR = os.path.join("reports", ".cache")
+LOCKFILE_PATH = os.path.join(DRIVER_CACHE_DIR, "drivers.lock.json")
+
+# Seconds after which a lock left behind by a killed process is broken
+STALE_LOCK_SECONDS = 120
+
+_DRIVERS = {"chrome": "chromedriver", "firefox": "geckodriver"}
+_ENV_OVERRIDES = {"chrome": "CHROMEDRIVER_PATH", "firefox": "GECKODRIVER_PATH"}
+_BROWSER_BINARIES = {
+    "chrome": ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"),
+    "firefox": ("firefox",),
+}
+_VERSION_RE = re.compile(r"(\d+)\.\d+")
+
+# Last resolution in this process: {"browser", "version", "path", "source", "seconds"}
+RESOLUTION: dict = {}
+
+# browser_version() per browser; the installed browser does not change mid-run
+_BROWSER_VERSIONS: dict[str, str] = {}
+
+
+def browser_version(browser: str) -> str:
+    """
+    Major version of the installed browser (e.g. "129"), or "unknown" when
+    it cannot be determined locally. Asked once per process.
+    """
+    if browser not in _BROWSER_VERSIONS:
+        _BROWSER_VERSIONS[browser] = _installed_version(browser)
+    return _BROWSER_VERSIONS[browser]
+
+
+def _installed_version(browser: str) -> str:
+    for name in _BROWSER_BINARIES.get(browser, ()):
+        binary = shutil.which(name)
+        if not binary:
+            continue
+        try:
+            output = subprocess.run(
+                [binary, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION_RE.search(output)
+        if match:
+            return match.group(1)
+    return "unknown"
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = 60, poll: float = 0.1):
+    """
+    Portable inter-process lock: whoever creates 'path' exclusively holds it.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError as exc:
+            try:
+                if time.time() - os.path.getmtime(path) > STALE_LOCK_SECONDS:
+                    os.remove(path)
+                    continue
+            except OSError:
+                # Released between the two calls; just retry
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock {path}") from exc
+            time.sleep(poll)
+    try:
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        os.close(fd)
+        yield
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+
+def _is_executable(path: str | None) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _load_lockfile(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_lockfile(path: str, entries: dict) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _selenium_manager(browser: str) -> str | None:
+    try:
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+        return SeleniumManager().binary_paths(["--browser", browser]).get("driver_path")
+    except Exception:
+        return None
+
+
+def _webdriver_manager(browser: str) -> str:
+    if browser == "chrome":
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        return ChromeDriverManager().install()
+
+    from webdriver_manager.firefox import GeckoDriverManager
+
+    return GeckoDriverManager().install()
+
+
+def _locked_path(entries: dict, browser: str, version: str) -> str | None:
+    """
+    The lockfile's driver for this browser version; with the version
+    unknown, the driver resolved last for the browser.
+    """
+    if version != "unknown":
+        path = entries.get(f"{browser}-{version}", {}).get("path")
+        return path if _is_executable(path) else None
+    known = [
+        entry
+        for key, entry in entries.items()
+        if key.startswith(f"{browser}-") and _is_executable(entry.get("path"))
+    ]
+    return max(known, key=lambda entry: entry.get("at", 0))["path"] if known else None
+
+
+def _resolve(browser: str, version: str, lockfile: str) -> tuple[str, str]:
+    key = f"{browser}-{version}"
+
+    path = _locked_path(_load_lockfile(lockfile), browser, version)
+    if path:
+        return path, "lockfile"
+
+    with file_lock(f"{lockfile}.lock"):
+        # Another worker may have resolved it while we waited
+        entries = _load_lockfile(lockfile)
+        path = _locked_path(entries, browser, version)
+        if path:
+            return path, "lockfile"
+
+        path, source = shutil.which(_DRIVERS[browser]), "path"
+        if not _is_executable(path):
+            path, source = _selenium_manager(browser), "selenium-manager"
+        if not _is_executable(path):
+            path, source = _webdriver_manager(browser), "webdriver-manager"
+
+        entries[key] = {"path": path, "source": source, "at": time.time()}
+        _save_lockfile(lockfile, entries)
+        return path, source
+
+
+def resolve_driver(browser: str, lockfile: str = LOCKFILE_PATH) -> str:
+    """
+    Return the path of the driver binary for 'browser' ("chrome" or "firefox").
+
+    Records where it came from and how long it took in RESOLUTION.
+    """
+    if browser not in _DRIVERS:
+        raise RuntimeError(f"Unsupported browser: {browser}")
+
+    started = time.perf_counter()
+    version = "unknown"
+
+    override = os.getenv(_ENV_OVERRIDES[browser])
+    if _is_executable(override):
+        path, source = override, "env"
+    else:
+        version = browser_version(browser)
+        path, source = _resolve(browser, version, lockfile)
+
+    RESOLUTION.update(
+        browser=browser,
+        version=version,
+        path=path,
+        source=source,
+        seconds=round(time.perf_counter() - started, 3),
+    )
+    return path
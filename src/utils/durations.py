@@ -0,0 +1,58 @@
+import json
+import os
+import re
+
+# Historical per-test durations (seconds), keyed by pytest nodeid
+DURATIONS_PATH = os.path.join("reports", ".durations.json")
+
+# Build axis as it appears in test ids: a whole "build-N" parameter id, e.g.
+# "test_x[build-3]", "test_x[add floats-build-3]" or "test_x[build-3-row1]"
+_BUILD_RE = re.compile(r"(?:^|-)build-(\d+)(?=-|$)")
+
+
+def build_of(nodeid: str) -> int | None:
+    """Return the calculator build a test id targets, or None if it has no build axis."""
+    _, bracket, params = nodeid.partition("[")
+    if not bracket:
+        return None
+    match = _BUILD_RE.search(params.removesuffix("]"))
+    return int(match.group(1)) if match else None
+
+
+def load_durations(path: str = DURATIONS_PATH) -> dict[str, float]:
+    """Load saved durations; a missing or unreadable file means no history yet."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations: dict[str, float], path: str = DURATIONS_PATH) -> None:
+    """Merge 'durations' into the saved history (new values win)."""
+    merged = load_durations(path)
+    merged.update(durations)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=0, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def median_duration(durations: dict[str, float]) -> float:
+    """Median of all known durations, or 1 s with no history at all."""
+    known = sorted(durations.values())
+    return known[len(known) // 2] if known else 1.0
+
+
+def estimate(nodeid: str, durations: dict[str, float], default: float | None = None) -> float:
+    """
+    Expected duration of a test: its history if known, otherwise 'default'
+    (median_duration() when not given).
+    """
+    if nodeid in durations:
+        return durations[nodeid]
+    if default is None:
+        default = median_duration(durations)
+    return default
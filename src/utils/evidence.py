@@ -0,0 +1,142 @@
+"""
+Evidence capture for failed / xfailed / xpassed tests.
+
+Screenshots are taken in memory (base64, no write-then-read), identical
+screenshots and page sources are stored once by content hash, and the
+file writes run on a background thread pool so the worker goes straight
+on to the next test.
+"""
+
+import base64
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+
+from src.utils.durations import build_of
+
+SCREENSHOT_DIR = os.path.join("reports", "screenshots")
+PAGE_SOURCE_DIR = os.path.join("reports", "page-sources")
+
+# --evidence policies
+POLICIES = ("full", "first-per-build", "none")
+
+
+class EvidenceCollector:
+    """
+    Capture screenshots and page sources and attach them to Allure.
+
+    The Allure attachment is made with allure.attach() on the test's own
+    thread (Allure tracks the running test per thread). The local copy the
+    native report links to is named after the content hash and written once,
+    in the background, however many tests reference it.
+    """
+
+    def __init__(self, config, policy: str = "full", max_workers: int = 2) -> None:
+        self.config = config
+        self.policy = policy
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="evidence")
+        self._written: set[str] = set()
+        self._builds_seen: set = set()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    # Policy
+    def should_capture(self, nodeid: str) -> bool:
+        if self.policy == "none":
+            return False
+        if self.policy == "first-per-build":
+            build = build_of(nodeid)
+            if build in self._builds_seen:
+                return False
+            self._builds_seen.add(build)
+        return True
+
+    # Capture
+    def capture(self, item, driver) -> list[str]:
+        """
+        Grab evidence from 'driver' for 'item' and queue it for storage.
+        Returns the paths the screenshot and page source will be stored at.
+        """
+        if not self.should_capture(item.nodeid):
+            return []
+
+        test_name = item.name
+        paths = []
+
+        try:
+            png_b64 = driver.get_screenshot_as_base64()
+            paths.append(
+                self._store(
+                    base64.b64decode(png_b64),
+                    "png",
+                    f"screenshot-{test_name}",
+                    allure.attachment_type.PNG,
+                )
+            )
+        except Exception:
+            # Do not break the test run if screenshot capture fails
+            pass
+
+        try:
+            html_source = driver.page_source
+            paths.append(
+                self._store(
+                    html_source.encode("utf-8"),
+                    "html",
+                    f"page-source-{test_name}",
+                    allure.attachment_type.HTML,
+                )
+            )
+        except Exception:
+            pass
+        return paths
+
+    @property
+    def backlog(self) -> int:
+        """Blobs queued but not written yet."""
+        return self._pending
+
+    def close(self) -> None:
+        """Wait for queued writes to finish."""
+        self._executor.shutdown(wait=True)
+
+    # Internals
+    def _store(self, data: bytes, extension: str, name: str, attachment_type) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        local_path = _local_path(digest, extension)
+
+        # A no-op unless allure-pytest is reporting
+        allure.attach(data, name=name, attachment_type=attachment_type)
+
+        if local_path not in self._written:
+            self._written.add(local_path)
+            with self._pending_lock:
+                self._pending += 1
+            self._executor.submit(self._write, data, local_path).add_done_callback(
+                self._written_one
+            )
+        return local_path
+
+    def _written_one(self, future) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+
+    def _write(self, data: bytes, path: str) -> None:
+        if os.path.exists(path):
+            # Another xdist worker already stored this blob
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def _local_path(digest: str, extension: str) -> str:
+    """Where a blob is kept outside Allure (linked from the native report)."""
+    directory = SCREENSHOT_DIR if extension == "png" else PAGE_SOURCE_DIR
+    return os.path.join(directory, f"{digest}.{extension}")
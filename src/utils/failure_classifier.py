@@ -0,0 +1,117 @@
+"""
+Tell infrastructure faults apart from defects in the calculator under test.
+
+Infrastructure: the browser or its driver went away (crash, lost session,
+closed window) or the page never loaded (driver.get timed out). These say
+nothing about the build and are worth retrying on a fresh browser. A
+connection error only counts when it came through the WebDriver command
+executor; the same error while resolving or downloading a driver is a
+setup fault that a retry cannot fix.
+
+Everything else is the AUT's: wrong answers (assertion failures), missing
+controls (NoSuchElementException, wait timeouts on a loaded page) and so on.
+
+Exceptions are matched by class name and message, so classifying a failure
+never imports selenium or urllib3.
+"""
+
+import os
+
+INFRA = "infra"
+AUT = "aut"
+
+# User property carrying "<category>:<kind>" on failed reports
+CLASS_PROPERTY = "failure_class"
+
+# Kinds of infrastructure fault
+SESSION_LOST = "session-lost"
+DRIVER_CRASH = "driver-crash"
+PAGE_LOAD_TIMEOUT = "page-load-timeout"
+
+_SESSION_LOST_TYPES = {"InvalidSessionIdException", "NoSuchWindowException"}
+_SESSION_LOST_MESSAGES = (
+    "invalid session id",
+    "session deleted",
+    "chrome not reachable",
+    "disconnected:",
+    "target window already closed",
+    "browsing context has been discarded",
+    "tab crashed",
+)
+
+_DRIVER_CRASH_TYPES = {"SessionNotCreatedException"}
+# Connection errors: a driver crash only when raised in the command executor
+_CONNECTION_ERROR_TYPES = {
+    "MaxRetryError",
+    "NewConnectionError",
+    "ProtocolError",
+    "RemoteDisconnected",
+    "ConnectionRefusedError",
+    "ConnectionResetError",
+    "BrokenPipeError",
+}
+
+_PAGE_LOAD_MESSAGES = ("timed out receiving message from renderer",)
+
+# Frame of WebDriver.get(), i.e. a navigation (CalculatorPage.open/reset)
+_NAVIGATION_FILE = os.path.join("remote", "webdriver.py")
+# Frames of RemoteConnection, which sends every command to the driver
+_EXECUTOR_FILE = os.path.join("remote", "remote_connection.py")
+
+
+def _chain(exc):
+    """The exception and everything it was raised from or during."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def _raised_while_navigating(tb) -> bool:
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        if code.co_name == "get" and code.co_filename.endswith(_NAVIGATION_FILE):
+            return True
+        tb = tb.tb_next
+    return False
+
+
+def _raised_in_executor(exc) -> bool:
+    """Whether any exception in the chain passed through a RemoteConnection frame."""
+    for error in _chain(exc):
+        tb = error.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename.endswith(_EXECUTOR_FILE):
+                return True
+            tb = tb.tb_next
+    return False
+
+
+def classify(exc: BaseException) -> tuple[str, str]:
+    """
+    Classify a test failure.
+
+    Returns:
+        (INFRA, kind) with kind one of SESSION_LOST, DRIVER_CRASH or
+        PAGE_LOAD_TIMEOUT, or (AUT, <exception class name>).
+    """
+    for error in _chain(exc):
+        names = {cls.__name__ for cls in type(error).__mro__}
+        message = str(error).lower()
+        is_driver_error = "WebDriverException" in names
+
+        if names & _SESSION_LOST_TYPES or (
+            is_driver_error and any(text in message for text in _SESSION_LOST_MESSAGES)
+        ):
+            return INFRA, SESSION_LOST
+        if names & _DRIVER_CRASH_TYPES or (
+            names & _CONNECTION_ERROR_TYPES and _raised_in_executor(exc)
+        ):
+            return INFRA, DRIVER_CRASH
+        if "TimeoutException" in names and (
+            any(text in message for text in _PAGE_LOAD_MESSAGES)
+            or _raised_while_navigating(error.__traceback__)
+        ):
+            return INFRA, PAGE_LOAD_TIMEOUT
+    return AUT, type(exc).__name__
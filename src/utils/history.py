@@ -0,0 +1,207 @@
+"""
+Local history of every case outcome, in SQLite (reports/history.sqlite).
+
+One row per test per run: build, op, inputs, expected, actual, verdict,
+duration and the AUT fingerprint. Indexes on (nodeid, recorded) and
+(build, recorded) keep the trend queries below fast at hundreds of
+thousands of rows, without touching Allure's JSON files.
+
+    python -m src.utils.history changed --days 7
+    python -m src.utils.history slowest --limit 5
+    python -m src.utils.history flips --min-runs 3
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+HISTORY_PATH = os.getenv("HISTORY_DB", os.path.join("reports", "history.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id    INTEGER PRIMARY KEY,
+    started   REAL NOT NULL,
+    backend   TEXT,
+    aut_hash  TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id        INTEGER NOT NULL REFERENCES runs(run_id),
+    recorded      REAL NOT NULL,
+    nodeid        TEXT NOT NULL,
+    build         INTEGER,
+    op            INTEGER,
+    a             TEXT,
+    b             TEXT,
+    integer_only  INTEGER,
+    expected      TEXT,
+    actual        TEXT,
+    verdict       TEXT NOT NULL,
+    duration      REAL,
+    aut_hash      TEXT
+);
+CREATE INDEX IF NOT EXISTS results_by_case ON results (nodeid, recorded);
+CREATE INDEX IF NOT EXISTS results_by_build ON results (build, recorded);
+"""
+
+COLUMNS = (
+    "nodeid",
+    "build",
+    "op",
+    "a",
+    "b",
+    "integer_only",
+    "expected",
+    "actual",
+    "verdict",
+    "duration",
+)
+
+
+def connect(path: str = HISTORY_PATH) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def record_run(
+    records: list[dict], backend: str, aut_hash: str | None, path: str = HISTORY_PATH
+) -> int:
+    """
+    Append one run's records (dicts with COLUMNS keys; missing keys are NULL)
+    in a single transaction. Returns the new run id.
+    """
+    now = time.time()
+    with connect(path) as connection:
+        run_id = connection.execute(
+            "INSERT INTO runs (started, backend, aut_hash) VALUES (?, ?, ?)",
+            (now, backend, aut_hash),
+        ).lastrowid
+        connection.executemany(
+            f"INSERT INTO results (run_id, recorded, aut_hash, {', '.join(COLUMNS)}) "
+            f"VALUES (?, ?, ?, {', '.join('?' for _ in COLUMNS)})",
+            (
+                (run_id, now, aut_hash, *(record.get(column) for column in COLUMNS))
+                for record in records
+            ),
+        )
+    connection.close()
+    return run_id
+
+
+# Queries
+def changed_since(connection: sqlite3.Connection, since: float) -> list[tuple]:
+    """
+    Builds whose behaviour changed since 'since' (epoch seconds): cases whose
+    latest verdict or answer differs from their last one before that time.
+
+    Returns (build, changed_cases, examples) rows, most changes first.
+    """
+    return connection.execute(
+        """
+        WITH latest AS (
+            SELECT nodeid, build, verdict, actual, MAX(recorded) FROM results
+            WHERE recorded >= :since GROUP BY nodeid
+        ),
+        previous AS (
+            SELECT nodeid, verdict, actual, MAX(recorded) FROM results
+            WHERE recorded < :since GROUP BY nodeid
+        )
+        SELECT latest.build, COUNT(*), GROUP_CONCAT(latest.nodeid, '  ')
+        FROM latest JOIN previous USING (nodeid)
+        WHERE latest.verdict != previous.verdict
+           OR IFNULL(latest.actual, '') != IFNULL(previous.actual, '')
+        GROUP BY latest.build
+        ORDER BY COUNT(*) DESC, latest.build
+        """,
+        {"since": since},
+    ).fetchall()
+
+
+def slowest_per_build(connection: sqlite3.Connection, limit: int = 5) -> list[tuple]:
+    """The 'limit' slowest cases of each build by mean duration: (build, nodeid, mean, runs)."""
+    return connection.execute(
+        """
+        SELECT build, nodeid, mean, runs FROM (
+            SELECT build, nodeid, AVG(duration) AS mean, COUNT(*) AS runs,
+                   ROW_NUMBER() OVER (PARTITION BY build ORDER BY AVG(duration) DESC) AS rank
+            FROM results GROUP BY build, nodeid
+        )
+        WHERE rank <= :limit
+        ORDER BY build, mean DESC
+        """,
+        {"limit": limit},
+    ).fetchall()
+
+
+def flip_rates(connection: sqlite3.Connection, min_runs: int = 2, limit: int = 20) -> list[tuple]:
+    """
+    How often each case's verdict changes between consecutive runs:
+    (nodeid, build, flips, runs, flip_rate), flakiest first.
+    """
+    return connection.execute(
+        """
+        SELECT nodeid, build, SUM(flipped) AS flips, COUNT(*) AS runs,
+               CAST(SUM(flipped) AS REAL) / (COUNT(*) - 1) AS rate
+        FROM (
+            SELECT nodeid, build,
+                   verdict != LAG(verdict, 1, verdict) OVER (PARTITION BY nodeid ORDER BY recorded) AS flipped
+            FROM results
+        )
+        GROUP BY nodeid
+        HAVING COUNT(*) >= MAX(:min_runs, 2) AND flips > 0
+        ORDER BY rate DESC, runs DESC
+        LIMIT :limit
+        """,
+        {"min_runs": min_runs, "limit": limit},
+    ).fetchall()
+
+
+# Command line
+def _label(build) -> str:
+    return "-" if build is None else str(build)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query the local results history.")
+    parser.add_argument("--db", default=HISTORY_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    changed = commands.add_parser("changed", help="Builds whose behaviour changed recently.")
+    changed.add_argument("--days", type=float, default=7)
+
+    slowest = commands.add_parser("slowest", help="Slowest cases per build.")
+    slowest.add_argument("--limit", type=int, default=5)
+
+    flips = commands.add_parser("flips", help="Cases whose verdict changes between runs.")
+    flips.add_argument("--min-runs", type=int, default=2)
+    flips.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"No history at {args.db} yet")
+        return 1
+    connection = connect(args.db)
+
+    if args.command == "changed":
+        rows = changed_since(connection, time.time() - args.days * 86400)
+        if not rows:
+            print(f"No build changed behaviour in the last {args.days:g} days")
+        for build, count, examples in rows:
+            print(f"build {_label(build)}: {count} case(s) changed, e.g. {examples.split('  ')[0]}")
+    elif args.command == "slowest":
+        for build, nodeid, mean, runs in slowest_per_build(connection, args.limit):
+            print(f"build {_label(build)}: {mean * 1000:8.1f} ms  ({runs} runs)  {nodeid}")
+    else:
+        for nodeid, build, flipped, runs, rate in flip_rates(connection, args.min_runs, args.limit):
+            print(f"{rate:6.1%}  {flipped}/{runs - 1} flips  build {_label(build)}  {nodeid}")
+
+    connection.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
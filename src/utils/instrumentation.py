@@ -0,0 +1,224 @@
+"""
+Lightweight tracing of page steps, waits and WebDriver commands.
+
+Off by default (and then a single attribute check per call). When enabled
+(--trace-steps), every call of a @traced function and every command sent
+through an instrumented driver's command executor is recorded as a span:
+
+  - kind: "step" (page-object method), "wait" (src/utils/waits) or "command"
+  - wall time, plus for each span the WebDriver round trips and the wait
+    time spent inside it; work time is wall time minus wait time
+
+Spans are held per test until the test is done (pop_spans), and the full
+list in Tracer.spans only up to max_spans; a long run is summarised with
+SpanSummary instead.
+"""
+
+import functools
+import heapq
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Spans kept in Tracer.spans (for --chrome-trace); later ones are counted in 'dropped'
+MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "200000"))
+
+
+class Tracer:
+    """Collects spans for the current process."""
+
+    def __init__(self, max_spans: int = MAX_SPANS) -> None:
+        self.enabled = False
+        self.test: str | None = None
+        self.max_spans = max_spans
+        self.spans: list[dict] = []
+        self.dropped = 0
+        self._by_test: dict[str | None, list[dict]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list[dict]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, kind: str, name: str):
+        if not self.enabled:
+            yield None
+            return
+
+        stack = self._stack()
+        record = {
+            "kind": kind,
+            "name": name,
+            "test": self.test,
+            "start": time.time(),
+            "round_trips": 0,
+            "wait": 0.0,
+            "depth": len(stack),
+            "tid": threading.get_ident(),
+        }
+        stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["duration"] = time.perf_counter() - started
+            stack.pop()
+
+            if kind == "command":
+                record["round_trips"] += 1
+            elif kind == "wait":
+                record["wait"] = record["duration"]
+
+            if stack:
+                parent = stack[-1]
+                parent["round_trips"] += record["round_trips"]
+                if parent["kind"] != "wait":
+                    # A wait's own wait time is its whole duration
+                    parent["wait"] += record["wait"]
+
+            with self._lock:
+                if len(self.spans) < self.max_spans:
+                    self.spans.append(record)
+                else:
+                    self.dropped += 1
+                self._by_test[record["test"]].append(record)
+
+    def spans_for(self, test: str | None) -> list[dict]:
+        with self._lock:
+            return list(self._by_test.get(test, ()))
+
+    def pop_spans(self, test: str | None) -> list[dict]:
+        """Spans of 'test' (None: outside any test), no longer held per test."""
+        with self._lock:
+            return self._by_test.pop(test, [])
+
+
+TRACER = Tracer()
+
+
+class SpanSummary:
+    """
+    The 'top' slowest steps and the wall, wait and round-trip totals per
+    build of top-level spans: what the --trace-steps summary needs, without
+    keeping every span.
+    """
+
+    def __init__(self, top: int) -> None:
+        self.top = top
+        self.slowest: list[dict] = []
+        # {build: [wall, wait, round trips]}
+        self.per_build: dict[int | None, list] = {}
+
+    def add(self, spans: list[dict], build: int | None) -> None:
+        """Fold in the spans of one test ('build' as parsed from its node id)."""
+        steps = [s for s in spans if s["kind"] == "step"]
+        self.slowest = heapq.nlargest(self.top, self.slowest + steps, key=lambda s: s["duration"])
+        for s in spans:
+            # Top-level spans only, so nested steps/waits are not counted twice
+            if s["depth"] == 0 and s["test"]:
+                totals = self.per_build.setdefault(build, [0.0, 0.0, 0])
+                totals[0] += s["duration"]
+                totals[1] += s["wait"]
+                totals[2] += s["round_trips"]
+
+    def as_output(self) -> dict:
+        """Plain lists for xdist's workeroutput."""
+        return {
+            "slowest": self.slowest,
+            "per_build": [[build, *totals] for build, totals in self.per_build.items()],
+        }
+
+    def merge(self, output: dict) -> None:
+        """Add a summary sent by as_output()."""
+        self.slowest = heapq.nlargest(
+            self.top, self.slowest + output["slowest"], key=lambda s: s["duration"]
+        )
+        for build, wall, wait, round_trips in output["per_build"]:
+            totals = self.per_build.setdefault(build, [0.0, 0.0, 0])
+            totals[0] += wall
+            totals[1] += wait
+            totals[2] += round_trips
+
+
+class CommandCounter:
+    """Counts WebDriver commands for --telemetry; off by default."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.total = 0
+
+
+COMMANDS = CommandCounter()
+
+
+def traced(kind: str = "step"):
+    """Record each call of the decorated function as a span of 'kind'."""
+
+    def decorator(fn):
+        name = fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return fn(*args, **kwargs)
+            with TRACER.span(kind, name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_driver(driver):
+    """
+    Record every WebDriver command 'driver' sends as a "command" span, and
+    count it in COMMANDS.
+
+    Hooks the command executor, so element calls, scripts, alerts and
+    navigation are all counted. Safe to call repeatedly; a no-op while
+    tracing and command counting are both disabled.
+    """
+    executor = getattr(driver, "command_executor", None)
+    if (
+        not (TRACER.enabled or COMMANDS.enabled)
+        or executor is None
+        or getattr(executor, "_traced", False)
+    ):
+        return driver
+
+    execute = executor.execute
+
+    def traced_execute(command, params=None):
+        COMMANDS.total += 1
+        with TRACER.span("command", command):
+            return execute(command, params)
+
+    executor.execute = traced_execute
+    executor._traced = True
+    return driver
+
+
+def chrome_trace(spans: list[dict], pid: int | str = 0) -> list[dict]:
+    """Convert spans to Chrome trace-event "complete" events (chrome://tracing, Perfetto)."""
+    return [
+        {
+            "name": s["name"],
+            "cat": s["kind"],
+            "ph": "X",
+            "ts": s["start"] * 1e6,
+            "dur": s["duration"] * 1e6,
+            "pid": pid,
+            "tid": s["tid"],
+            "args": {
+                "test": s["test"],
+                "round_trips": s["round_trips"],
+                "wait_ms": round(s["wait"] * 1000, 3),
+            },
+        }
+        for s in spans
+    ]
@@ -0,0 +1,194 @@
+"""
+Result streams and the static HTML summary used by --native-report.
+
+Each process appends one JSON line per finished test to its own file,
+fsyncing in batches rather than per record; the files are merged into
+results.jsonl at session end. The HTML summary is a per-build grid of
+outcomes (with links to evidence), rendered in plain Python.
+"""
+
+import html
+import json
+import os
+import re
+import time
+from collections import Counter, defaultdict
+
+from src.utils.durations import build_of
+
+OUTCOMES = ("passed", "xfailed", "xpassed", "failed", "error", "skipped")
+
+_BUILD_TOKEN_RE = re.compile(r"build-\d+")
+
+
+class ResultStream:
+    """Append-only JSONL writer with batched fsync."""
+
+    def __init__(self, path: str, batch_size: int = 200, interval: float = 2.0) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.interval = interval
+        self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115 - closed in close()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, sort_keys=True) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= self.batch_size or time.monotonic() - self._last_sync >= self.interval:
+            self.sync()
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+def read_records(path: str) -> list[dict]:
+    """Records of one stream; a torn last line (killed worker) is ignored."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def merge_streams(paths: list[str], output: str) -> list[dict]:
+    """Merge per-worker streams into one file, ordered by test id."""
+    records = sorted((r for path in paths for r in read_records(path)), key=lambda r: r["nodeid"])
+    tmp_path = f"{output}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+    os.replace(tmp_path, output)
+    return records
+
+
+# HTML summary
+_STYLE = """
+body { font-family: sans-serif; margin: 1.5em; }
+table { border-collapse: collapse; font-size: 13px; }
+th, td { border: 1px solid #ccc; padding: 3px 6px; text-align: center; }
+td.name { text-align: left; font-family: monospace; }
+.passed { background: #c8e6c9; } .xfailed { background: #fff3c4; } .xpassed { background: #ffe0b2; }
+.failed, .error { background: #ffcdd2; } .skipped { background: #e0e0e0; }
+a { color: inherit; }
+"""
+
+
+def _row_name(nodeid: str) -> str:
+    return _BUILD_TOKEN_RE.sub("build-*", nodeid)
+
+
+def render_html(
+    records: list[dict], output: str, title: str = "Calculator test summary", live: bool = False
+) -> None:
+    """
+    Write the per-build grid: one row per test (build axis folded into
+    columns), one cell per build, coloured by outcome and linking to the
+    first evidence file. 'live' adds an auto-refresh while the run is going.
+    """
+    builds = sorted({r["build"] for r in records if r["build"] is not None})
+    emulated = {r["build"] for r in records if r.get("emulated")}
+    grid: dict[str, dict] = defaultdict(dict)
+    other: list[dict] = []
+    totals: dict = defaultdict(Counter)
+
+    for r in records:
+        totals[r["build"]][r["outcome"]] += 1
+        if r["build"] is None:
+            other.append(r)
+        else:
+            grid[_row_name(r["nodeid"])][r["build"]] = r
+
+    report_dir = os.path.dirname(os.path.abspath(output))
+
+    def cell(r: dict | None) -> str:
+        if r is None:
+            return "<td></td>"
+        label = {
+            "passed": "✓",
+            "xfailed": "x",
+            "xpassed": "X!",
+            "failed": "✗",
+            "error": "E",
+            "skipped": "s",
+        }.get(r["outcome"], "?")
+        reruns = f" after {r['reruns']} rerun(s)" if r.get("reruns") else ""
+        tip = html.escape(
+            f"{r['outcome']} {r['duration']:.2f}s{reruns} {r.get('message', '')}"[:500], quote=True
+        )
+        if r.get("evidence"):
+            href = html.escape(
+                os.path.relpath(os.path.abspath(r["evidence"][0]), report_dir), quote=True
+            )
+            label = f'<a href="{href}">{label}</a>'
+        return f'<td class="{r["outcome"]}" title="{tip}">{label}</td>'
+
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        "<meta http-equiv='refresh' content='3'>" if live else "",
+        f"<title>{html.escape(title)}</title><style>{_STYLE}</style></head><body>",
+        f"<h1>{html.escape(title)}</h1>",
+        f"<p>{len(records)} tests{' (run in progress)' if live else ''}</p>",
+        (
+            f"<p>Builds marked * ran on the engine backend's emulated defects, not the AUT: "
+            f"{', '.join(map(str, sorted(emulated)))}</p>"
+            if emulated
+            else ""
+        ),
+        "<h2>Per build</h2><table><tr><th>build</th>",
+        "".join(f"<th>{o}</th>" for o in OUTCOMES),
+        "</tr>",
+    ]
+    for build in builds + ([None] if None in totals else []):
+        label = "other" if build is None else f"{build}{'*' if build in emulated else ''}"
+        parts.append(f"<tr><td>{label}</td>")
+        parts.append("".join(f'<td class="{o}">{totals[build][o] or ""}</td>' for o in OUTCOMES))
+        parts.append("</tr>")
+    parts.append("</table>")
+
+    parts.append("<h2>Cases</h2><table><tr><th>test</th>")
+    parts.append("".join(f"<th>{b}{'*' if b in emulated else ''}</th>" for b in builds))
+    parts.append("</tr>")
+    for name in sorted(grid):
+        parts.append(f'<tr><td class="name">{html.escape(name)}</td>')
+        parts.append("".join(cell(grid[name].get(b)) for b in builds))
+        parts.append("</tr>")
+    parts.append("</table>")
+
+    if other:
+        parts.append("<h2>Other tests</h2><table><tr><th>test</th><th>outcome</th></tr>")
+        for r in sorted(other, key=lambda r: r["nodeid"]):
+            parts.append(f'<tr><td class="name">{html.escape(r["nodeid"])}</td>{cell(r)}</tr>')
+        parts.append("</table>")
+    parts.append("</body></html>")
+
+    tmp_path = f"{output}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
+    os.replace(tmp_path, output)
+
+
+def build_record(
+    nodeid: str, outcome: str, duration: float, message: str = "", evidence=(), worker: str = "main"
+) -> dict:
+    return {
+        "nodeid": nodeid,
+        "build": build_of(nodeid),
+        "outcome": outcome,
+        "duration": round(duration, 4),
+        "message": message[:2000],
+        "evidence": list(evidence),
+        "worker": worker,
+    }
@@ -0,0 +1,65 @@
+"""
+Page-load timing for CalculatorPage.open(), from the browser's Navigation and
+Resource Timing entries.
+
+Every open() appends one entry to LOADS for the current process; summarize()
+turns a list of them into the medians shown in the terminal summary and the
+benchmarks, so runs with BROWSER_PROFILE=default and =lean can be compared.
+"""
+
+import statistics
+
+# Times in ms from navigation start; 'load' is null while the load event has
+# not fired yet (the page load strategy is "eager"). Blocked requests never
+# complete, so they are not counted as requests.
+NAVIGATION_TIMING_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) { return null; }
+const resources = performance.getEntriesByType('resource').filter(r => r.responseEnd > 0);
+return {
+  ttfb: nav.responseStart - nav.startTime,
+  dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+  load: nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+  requests: resources.length + 1,
+  transfer_bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0), nav.transferSize || 0),
+  from_cache: resources.filter(r => r.transferSize === 0 && r.decodedBodySize > 0).length,
+};
+"""
+
+LOADS: list[dict] = []
+
+
+def record(timing: dict | None, profile: str) -> None:
+    if timing:
+        LOADS.append(dict(timing, profile=profile))
+
+
+def summarize(loads: list[dict]) -> dict | None:
+    """Medians over 'loads' (None for no loads), plus the profile(s) they were taken with."""
+    if not loads:
+        return None
+
+    def median(key):
+        values = [load[key] for load in loads if load.get(key) is not None]
+        return statistics.median(values) if values else None
+
+    return {
+        "loads": len(loads),
+        "profile": ",".join(sorted({load["profile"] for load in loads})),
+        "ttfb_ms": median("ttfb"),
+        "dom_content_loaded_ms": median("dom_content_loaded"),
+        "load_ms": median("load"),
+        "requests": median("requests"),
+        "transfer_bytes": median("transfer_bytes"),
+        "from_cache": sum(load["from_cache"] for load in loads),
+    }
+
+
+def format_summary(summary: dict) -> str:
+    load = "n/a" if summary["load_ms"] is None else f"{summary['load_ms']:.0f} ms"
+    return (
+        f"page loads ({summary['profile']} profile): {summary['loads']}, median "
+        f"TTFB {summary['ttfb_ms']:.0f} ms, DOMContentLoaded {summary['dom_content_loaded_ms']:.0f} ms, "
+        f"load {load}, {summary['requests']:g} requests, {summary['transfer_bytes'] / 1024:.1f} KiB; "
+        f"{summary['from_cache']} resources from disk cache"
+    )
@@ -0,0 +1,125 @@
+"""
+On-disk cache of test outcomes, keyed by everything that can change one.
+
+A key combines:
+  - the AUT fingerprint (HTML + scripts fetched from the session's base URL,
+    which is the local server under --offline, or the in-process
+    implementation for --backend=engine)
+  - the test's parameters (the case row from arithmetic_cases.json or
+    edge_cases.csv, plus the build)
+  - the page object the backend uses and the test's source file
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from src.utils.capabilities import CACHE_DIR, aut_content_hash
+from src.utils.web import BASE_URL
+
+RESULTS_PATH = os.path.join(CACHE_DIR, "results.json")
+
+# user_properties set by src/plugins/incremental.py
+KEY_PROPERTY = "incremental_key"
+REPLAYED_PROPERTY = "incremental_replayed"
+
+_PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages")
+_ENGINE_SOURCE = os.path.join(os.path.dirname(_PAGES_DIR), "engine", "calculator_engine.py")
+
+PAGE_SOURCES = {
+    "selenium": os.path.join(_PAGES_DIR, "calculator_page.py"),
+    "engine": os.path.join(_PAGES_DIR, "engine_page.py"),
+}
+
+
+def file_hash(*paths: str) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def aut_fingerprint(backend: str, base_url: str) -> str | None:
+    """
+    Hash of the calculator the run will exercise, or None when it cannot be
+    determined (the AUT is unreachable), in which case nothing is cached.
+    """
+    if backend == "engine":
+        return file_hash(_ENGINE_SOURCE)
+    return aut_content_hash(base_url)
+
+
+def session_fingerprint(config) -> str | None:
+    """aut_fingerprint of the session's backend and base URL, computed once per process."""
+    if not hasattr(config, "_aut_fingerprint"):
+        config._aut_fingerprint = aut_fingerprint(
+            config.getoption("backend"), getattr(config, "_base_url", BASE_URL)
+        )
+    return config._aut_fingerprint
+
+
+def case_key(
+    aut_hash: str, backend: str, page_hash: str, params: dict, test_source_hash: str
+) -> str:
+    """Cache key for one parametrized test ('page_hash': file_hash of PAGE_SOURCES[backend])."""
+    payload = json.dumps(
+        {
+            "aut": aut_hash,
+            "backend": backend,
+            "page": page_hash,
+            "params": params,
+            "test": test_source_hash,
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def report_outcome(report) -> tuple[str, str]:
+    """(outcome, message) of one phase report, with xfail/xpass told apart."""
+    if hasattr(report, "wasxfail"):
+        return ("xfailed" if report.skipped else "xpassed"), report.wasxfail
+    if report.skipped:
+        longrepr = report.longrepr
+        return "skipped", longrepr[2] if isinstance(longrepr, tuple) else str(longrepr)
+    if report.failed:
+        return "failed", report.longreprtext
+    return "passed", ""
+
+
+def load_results(path: str = RESULTS_PATH) -> dict[str, dict]:
+    """Load cached outcomes ({key: entry}); a missing or unreadable file is an empty cache."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_results(results: dict[str, dict], max_age: float, path: str = RESULTS_PATH) -> None:
+    """
+    Merge 'results' into the cache (new entries win) and drop entries older
+    than 'max_age' seconds, which would be re-run anyway.
+    """
+    merged = load_results(path)
+    merged.update(results)
+
+    now = time.time()
+    merged = {
+        key: entry
+        for key, entry in merged.items()
+        if key in results or now - entry["at"] <= max_age
+    }
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=0, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_fresh(entry: dict | None, max_age: float) -> bool:
+    return entry is not None and time.time() - entry["at"] <= max_age
@@ -0,0 +1,98 @@
+"""
+Sequential sampling of the build x case matrix (--adaptive-sampling).
+
+A defective build tends to fail the same way over and over: every multiply
+truncated, every subtraction blank. Once that is settled, running the rest
+of its cases only repeats what is already known. SignatureTracker keeps,
+per key (a test function, build and operation), how many executed cases
+ended in each known-defect signature (the kind of wrong answer, see
+failure_kind()) and how many did not. A key is settled on a signature when
+it was seen at least MIN_CASES times and Laplace's rule of succession,
+
+    P(next case shows it) = (matching + 1) / (executed + 2),
+
+reaches the confidence asked for. With the default 0.75, two matching
+cases and nothing else settle it; 0.9 takes eight. Passing cases and real
+failures count against every signature, and real failures never settle
+anything, so only xfailed (known-defect) outcomes are ever inferred.
+
+The remaining cases of a settled key are inferred rather
+than executed, except for a random sample (sampled()) that still runs to
+catch new behaviour; a sampled case that disagrees unsettles it again.
+"""
+
+import hashlib
+import os
+from collections import Counter
+from datetime import date
+
+MIN_CASES = 2
+
+SAMPLING_CONFIDENCE = float(os.getenv("SAMPLING_CONFIDENCE", "0.75"))
+SAMPLING_RATE = float(os.getenv("SAMPLING_RATE", "0.2"))
+
+# user_properties set on inferred and sampled tests
+INFERRED_PROPERTY = "sampling_inferred"
+SAMPLED_PROPERTY = "sampling_sampled"
+
+# Outcomes that count against every signature
+PASSED = "passed"
+FAILED = "failed"
+
+
+def _number(text: str) -> float | None:
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def failure_kind(a: str, b: str, expected: str, actual: str) -> str:
+    """Kind of wrong answer: empty, text, concatenated, truncated or wrong-number."""
+    actual = (actual or "").strip()
+    if actual == "":
+        return "empty"
+    got, want = _number(actual), _number(str(expected))
+    if got is None or want is None:
+        return "text"
+    if actual == f"{a}{b}":
+        return "concatenated"
+    if want != int(want) and got == int(want):
+        return "truncated"
+    return "wrong-number"
+
+
+def sampled(nodeid: str, seed: str, rate: float) -> bool:
+    """Whether 'nodeid' runs although inferred; stable for a seed, different across seeds."""
+    digest = hashlib.sha1(f"{seed}:{nodeid}".encode()).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32 < rate
+
+
+def default_seed() -> str:
+    """Today's date: one sample per day, reproducible with --sampling-seed."""
+    return date.today().isoformat()
+
+
+class SignatureTracker:
+    def __init__(self, confidence: float = SAMPLING_CONFIDENCE, min_cases: int = MIN_CASES):
+        self.confidence = confidence
+        self.min_cases = min_cases
+        # {key: Counter({signature or PASSED/FAILED: executed cases})}
+        self.evidence: dict[tuple, Counter] = {}
+
+    def observe(self, key: tuple, outcome: str) -> None:
+        self.evidence.setdefault(key, Counter())[outcome] += 1
+
+    def settled(self, key: tuple) -> tuple[str, int, int] | None:
+        """(signature, matching cases, executed cases) once settled, else None."""
+        counts = self.evidence.get(key)
+        if not counts:
+            return None
+        signatures = [(n, kind) for kind, n in counts.items() if kind not in (PASSED, FAILED)]
+        if not signatures:
+            return None
+        matching, kind = max(signatures)
+        executed = sum(counts.values())
+        if matching >= self.min_cases and (matching + 1) / (executed + 2) >= self.confidence:
+            return kind, matching, executed
+        return None
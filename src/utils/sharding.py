@@ -0,0 +1,205 @@
+"""
+Split the test matrix into duration-balanced shards and merge their results.
+
+Every shard process collects the same tests and computes the same partition
+(longest-processing-time-first over saved durations), then runs its own part
+(see src/plugins/sharding.py). Each shard leaves a directory with
+shard.json (what it ran, how long each test took and what the partition was
+computed from), plus optional allure-results/, native/results.jsonl and,
+under --incremental, results-cache.json. Merge the directories with:
+
+    python -m src.utils.sharding merge reports/shards/* --output reports
+
+which checks that the shards agree and that every test ran exactly once,
+then combines the Allure results, native report, durations and result cache.
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import shutil
+import sys
+
+from src.utils.durations import DURATIONS_PATH, estimate, median_duration, save_durations
+from src.utils.result_cache import RESULTS_PATH, load_results, save_results
+
+MANIFEST = "shard.json"
+# Where a shard run with --incremental stores its outcomes
+RESULT_CACHE = "results-cache.json"
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """'i/N' (1-based) -> (i, N)."""
+    try:
+        index, total = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {spec!r}") from None
+    if not 1 <= index <= total:
+        raise ValueError(f"shard index must be between 1 and {total}, got {index}")
+    return index, total
+
+
+def digest(values) -> str:
+    return hashlib.sha256("\n".join(values).encode("utf-8")).hexdigest()
+
+
+def assign_shards(nodeids: list[str], durations: dict[str, float], total: int) -> list[list[str]]:
+    """
+    Partition 'nodeids' into 'total' shards of similar expected duration.
+
+    Longest tests first, each to the currently lightest shard (ties go to the
+    lowest shard number), so the result depends only on the inputs.
+    """
+    default = median_duration(durations)
+    ordered = sorted(nodeids, key=lambda nodeid: (-estimate(nodeid, durations, default), nodeid))
+    shards: list[list[str]] = [[] for _ in range(total)]
+    heap = [(0.0, index) for index in range(total)]
+    for nodeid in ordered:
+        load, index = heapq.heappop(heap)
+        shards[index].append(nodeid)
+        heapq.heappush(heap, (load + estimate(nodeid, durations, default), index))
+    return shards
+
+
+# Merge
+def load_manifests(shard_dirs: list[str]) -> list[dict]:
+    manifests = []
+    for directory in shard_dirs:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["dir"] = directory
+        manifests.append(manifest)
+    return sorted(manifests, key=lambda m: m["shard"])
+
+
+def check_coverage(manifests: list[dict]) -> list[str]:
+    """Problems that mean the merged run is not the whole matrix exactly once."""
+    if not manifests:
+        return ["no shards to merge"]
+    problems = []
+    total = manifests[0]["total"]
+    present = [m["shard"] for m in manifests]
+    missing = sorted(set(range(1, total + 1)) - set(present))
+    if missing:
+        problems.append(f"missing shard(s): {', '.join(map(str, missing))} of {total}")
+    if len(present) != len(set(present)):
+        problems.append("the same shard was given more than once")
+    for key, what in (
+        ("collection_hash", "collected different tests"),
+        ("durations_hash", "planned from different durations"),
+    ):
+        if len({m[key] for m in manifests}) > 1:
+            problems.append(f"shards {what}; partitions do not line up")
+
+    seen: dict[str, int] = {}
+    for manifest in manifests:
+        for nodeid in manifest["assigned"]:
+            if nodeid in seen:
+                problems.append(f"{nodeid} ran in shards {seen[nodeid]} and {manifest['shard']}")
+            seen[nodeid] = manifest["shard"]
+    if not missing and len(seen) != manifests[0]["collected"]:
+        problems.append(f"{len(seen)} tests ran, {manifests[0]['collected']} were collected")
+    return problems
+
+
+def _merge_allure(manifests: list[dict], output_dir: str) -> int:
+    """Copy every shard's Allure results into one directory; returns files copied."""
+    copied = 0
+    for manifest in manifests:
+        source = os.path.join(manifest["dir"], "allure-results")
+        if not os.path.isdir(source):
+            continue
+        os.makedirs(output_dir, exist_ok=True)
+        for name in os.listdir(source):
+            target = os.path.join(output_dir, name)
+            # Result files are uuid-named and attachments content-named, so a
+            # name clash is the same file (environment.properties and the like)
+            if not os.path.exists(target):
+                shutil.copy2(os.path.join(source, name), target)
+                copied += 1
+    return copied
+
+
+def _merge_native(manifests: list[dict], output_dir: str) -> int:
+    from src.utils.native_report import merge_streams, render_html
+
+    streams = [
+        path
+        for path in (os.path.join(m["dir"], "native", "results.jsonl") for m in manifests)
+        if os.path.exists(path)
+    ]
+    if not streams:
+        return 0
+    os.makedirs(output_dir, exist_ok=True)
+    records = merge_streams(streams, os.path.join(output_dir, "results.jsonl"))
+    render_html(records, os.path.join(output_dir, "index.html"))
+    return len(records)
+
+
+def _merge_result_cache(manifests: list[dict], path: str) -> int:
+    merged: dict[str, dict] = {}
+    for manifest in manifests:
+        for key, entry in load_results(os.path.join(manifest["dir"], RESULT_CACHE)).items():
+            if key not in merged or entry["at"] > merged[key]["at"]:
+                merged[key] = entry
+    if merged:
+        save_results(merged, float("inf"), path)
+    return len(merged)
+
+
+def merge(
+    shard_dirs: list[str],
+    output: str = "reports",
+    durations_path: str = DURATIONS_PATH,
+    results_path: str = RESULTS_PATH,
+) -> tuple[dict, list[str]]:
+    """
+    Combine shard directories into 'output'. Returns (counts, problems);
+    results are merged even when coverage problems are found.
+    """
+    manifests = load_manifests(shard_dirs)
+    problems = check_coverage(manifests)
+
+    durations: dict[str, float] = {}
+    for manifest in manifests:
+        durations.update(manifest["durations"])
+    if durations:
+        save_durations(durations, durations_path)
+
+    counts = {
+        "shards": len(manifests),
+        "tests": sum(len(m["assigned"]) for m in manifests),
+        "durations": len(durations),
+        "allure_files": _merge_allure(manifests, os.path.join(output, "allure-results")),
+        "native_records": _merge_native(manifests, os.path.join(output, "native")),
+        "cached_results": _merge_result_cache(manifests, results_path),
+        "test_seconds": {m["shard"]: sum(m["durations"].values()) for m in manifests},
+    }
+    return counts, problems
+
+
+# Command line
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Merge the results of sharded runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge_parser = commands.add_parser("merge", help="Combine shard directories into one report.")
+    merge_parser.add_argument("shard_dirs", nargs="+", help="Directories containing shard.json.")
+    merge_parser.add_argument("--output", default="reports")
+    args = parser.parse_args(argv)
+
+    counts, problems = merge(args.shard_dirs, args.output)
+    print(
+        f"Merged {counts['shards']} shard(s): {counts['tests']} tests, {counts['allure_files']} Allure files, "
+        f"{counts['native_records']} native records, {counts['durations']} durations"
+    )
+    for shard, seconds in counts["test_seconds"].items():
+        print(f"  shard {shard}: {seconds:.1f}s of tests")
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
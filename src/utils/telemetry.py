@@ -0,0 +1,355 @@
+"""
+Live run telemetry: a local HTTP endpoint with the run's progress.
+
+RunTelemetry holds the state of a run:
+- cases collected and completed, by outcome;
+- rolling cases per second, overall and per build;
+- per worker: the current test and how long it has been running, driver
+  commands per second, the RSS of the worker's driver and browser
+  processes, and the evidence-capture backlog.
+
+TelemetryServer serves the state from background threads:
+
+    GET /metrics        Prometheus text format (0.0.4)
+    GET /metrics.json   the same figures as JSON
+
+Workers report over UDP to a socket next to the HTTP server: a datagram
+when a test starts and finishes, and a stats sample every
+TELEMETRY_INTERVAL seconds (WorkerReporter). Sending never blocks a
+worker, and a lost datagram is corrected by the next one. Completed cases
+are counted from the controller's own report hooks, not from datagrams.
+"""
+
+import contextlib
+import json
+import os
+import socket
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TELEMETRY_INTERVAL = float(os.getenv("TELEMETRY_INTERVAL", "1.0"))
+# Seconds of completed cases the rolling rates are computed over
+TELEMETRY_WINDOW = float(os.getenv("TELEMETRY_WINDOW", "30"))
+
+_MAX_DATAGRAM = 65507
+# Fields of a worker's "stats" datagram
+_WORKER_STATS = (
+    "pid",
+    "commands_total",
+    "commands_per_second",
+    "browser_rss_bytes",
+    "evidence_backlog",
+)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RunTelemetry:
+    """Thread-safe state of one run, fed by pytest hooks and worker datagrams."""
+
+    def __init__(self, window: float = TELEMETRY_WINDOW, clock=time.monotonic):
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+
+        self.collected = 0
+        self.outcomes: dict[str, str] = {}
+        self.inferred = 0
+        # (finished at, build) of recently completed cases
+        self._recent: deque = deque()
+        self.workers: dict[str, dict] = {}
+
+    # Controller side
+    def set_collected(self, count: int) -> None:
+        with self._lock:
+            self.collected = max(self.collected, count)
+
+    def completed(self, nodeid: str, outcome: str, build=None, inferred: bool = False) -> None:
+        """Record a finished case; a rerun replaces its earlier outcome."""
+        with self._lock:
+            if nodeid not in self.outcomes:
+                self._recent.append((self._clock(), build))
+                self.inferred += inferred
+            self.outcomes[nodeid] = outcome
+
+    # Worker side (datagrams)
+    def worker_event(self, event: dict) -> None:
+        worker = str(event.get("worker", "main"))
+        with self._lock:
+            state = self.workers.setdefault(worker, {"test": None, "test_started": None})
+            state["last_seen"] = self._clock()
+            kind = event.get("event")
+            if kind == "start":
+                state["test"] = event.get("test")
+                state["test_started"] = self._clock()
+            elif kind == "finish" and state["test"] == event.get("test"):
+                state["test"] = state["test_started"] = None
+            elif kind == "stats":
+                for key in _WORKER_STATS:
+                    if key in event:
+                        state[key] = event[key]
+
+    # Views
+    def snapshot(self) -> dict:
+        now = self._clock()
+        with self._lock:
+            while self._recent and self._recent[0][0] < now - self.window:
+                self._recent.popleft()
+            span = min(self.window, max(now - self.started, 1e-6))
+            per_build = Counter(str(build) for _, build in self._recent if build is not None)
+            completed = len(self.outcomes)
+            workers = {}
+            for worker, state in sorted(self.workers.items()):
+                workers[worker] = {
+                    "test": state["test"],
+                    "test_seconds": (
+                        None if state["test"] is None else round(now - state["test_started"], 3)
+                    ),
+                    "seconds_since_report": round(now - state["last_seen"], 3),
+                    **{key: state[key] for key in _WORKER_STATS if key in state},
+                }
+            return {
+                "elapsed_seconds": round(now - self.started, 3),
+                "cases": {
+                    "collected": self.collected,
+                    "completed": completed,
+                    "remaining": max(self.collected - completed, 0),
+                    "inferred": self.inferred,
+                    "by_outcome": dict(Counter(self.outcomes.values())),
+                },
+                "cases_per_second": round(len(self._recent) / span, 3),
+                "build_cases_per_second": {
+                    b: round(n / span, 3) for b, n in sorted(per_build.items())
+                },
+                "workers": workers,
+            }
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prometheus(snapshot: dict, prefix: str = "calculator_run") -> str:
+    """Prometheus text exposition of a RunTelemetry snapshot."""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for labels, value in samples:
+            rendered = ",".join(f'{key}="{_label(v)}"' for key, v in labels.items())
+            lines.append(
+                f"{prefix}_{name}{{{rendered}}} {value}" if rendered else f"{prefix}_{name} {value}"
+            )
+
+    cases = snapshot["cases"]
+    workers = snapshot["workers"]
+    metric("cases_collected", "gauge", "Cases collected for this run.", [({}, cases["collected"])])
+    metric(
+        "cases_completed_total",
+        "counter",
+        "Cases completed, by outcome.",
+        [({"outcome": outcome}, n) for outcome, n in sorted(cases["by_outcome"].items())],
+    )
+    metric("cases_remaining", "gauge", "Cases not completed yet.", [({}, cases["remaining"])])
+    metric(
+        "cases_inferred_total",
+        "counter",
+        "Cases inferred by --adaptive-sampling.",
+        [({}, cases["inferred"])],
+    )
+    metric(
+        "cases_per_second",
+        "gauge",
+        "Rolling completion rate.",
+        [({}, snapshot["cases_per_second"])],
+    )
+    metric(
+        "build_cases_per_second",
+        "gauge",
+        "Rolling completion rate per build.",
+        [({"build": build}, rate) for build, rate in snapshot["build_cases_per_second"].items()],
+    )
+    metric(
+        "worker_test_seconds",
+        "gauge",
+        "How long each worker has been running its current test.",
+        [
+            ({"worker": w, "test": s["test"]}, s["test_seconds"])
+            for w, s in workers.items()
+            if s["test"]
+        ],
+    )
+    for key, name, kind, help_text in (
+        (
+            "commands_total",
+            "worker_driver_commands_total",
+            "counter",
+            "WebDriver commands sent by each worker.",
+        ),
+        (
+            "commands_per_second",
+            "worker_driver_commands_per_second",
+            "gauge",
+            "WebDriver commands per second.",
+        ),
+        (
+            "browser_rss_bytes",
+            "worker_browser_rss_bytes",
+            "gauge",
+            "RSS of each worker's driver and browser.",
+        ),
+        (
+            "evidence_backlog",
+            "worker_evidence_backlog",
+            "gauge",
+            "Screenshots and DOMs waiting to be written.",
+        ),
+    ):
+        samples = [({"worker": w}, s[key]) for w, s in workers.items() if s.get(key) is not None]
+        if samples:
+            metric(name, kind, help_text, samples)
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        snapshot = self.server.telemetry.snapshot()
+        if path == "/metrics":
+            body, content_type = prometheus(snapshot).encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+        elif path in ("/", "/metrics.json"):
+            body, content_type = json.dumps(snapshot).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TelemetryServer:
+    """HTTP endpoint for 'telemetry' plus the UDP socket workers report to."""
+
+    def __init__(self, telemetry: RunTelemetry, host: str = "127.0.0.1", port: int = 0):
+        self.telemetry = telemetry
+        self.host = host
+        self.port = port
+        self._httpd = None
+        self._udp = None
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ipc_address(self) -> str:
+        """host:port of the UDP socket, for WorkerReporter."""
+        host, port = self._udp.getsockname()[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "TelemetryServer":
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.telemetry = self.telemetry
+        self.port = self._httpd.server_address[1]
+
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.bind((self.host, 0))
+        self._udp.settimeout(0.2)
+
+        for name, target in (
+            ("telemetry-http", self._httpd.serve_forever),
+            ("telemetry-ipc", self._receive),
+        ):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def _receive(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data = self._udp.recv(_MAX_DATAGRAM)
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            try:
+                self.telemetry.worker_event(json.loads(data))
+            except (ValueError, TypeError, AttributeError):
+                continue
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        for thread in self._threads:
+            thread.join()
+        if self._udp:
+            self._udp.close()
+
+
+class WorkerReporter:
+    """
+    Sends one worker's test starts/finishes and periodic stats to a
+    TelemetryServer. 'sample' returns the stats dict; it runs on the
+    reporter's thread every 'interval' seconds.
+    """
+
+    def __init__(
+        self, address: str, worker: str, sample=dict, interval: float = TELEMETRY_INTERVAL
+    ):
+        host, _, port = address.rpartition(":")
+        self.address = (host, int(port))
+        self.worker = worker
+        self.sample = sample
+        self.interval = interval
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def send(self, event: str, **fields) -> None:
+        message = json.dumps({"event": event, "worker": self.worker, **fields}, default=str)
+        # Telemetry must never break the run
+        with contextlib.suppress(OSError):
+            self._socket.sendto(message.encode("utf-8")[:_MAX_DATAGRAM], self.address)
+
+    def start(self) -> "WorkerReporter":
+        self._thread = threading.Thread(target=self._run, name="telemetry-reporter", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while True:
+            self.send("stats", pid=os.getpid(), **self.sample())
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._socket.close()
+
+
+def browser_rss_bytes(pid: int | None = None) -> int | None:
+    """RSS of the processes below 'pid' (its driver and browser), or None without /proc."""
+    from src.utils.worker_sizing import process_table, tree
+
+    pid = pid or os.getpid()
+    table = process_table()
+    if pid not in table:
+        return None
+    return int(sum(table[p][1] for p in tree(pid, table) if p != pid) * 1024 * 1024)
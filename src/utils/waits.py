@@ -1,12 +1,136 @@
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import math
+import os
+import time
+from collections import defaultdict, deque
+
+from selenium.common.exceptions import (
+    NoAlertPresentException,
+    TimeoutException,
+    UnexpectedAlertPresentException,
+)
+
+from src.utils.instrumentation import traced
 
 # Default explicit wait timeout (seconds)
 DEFAULT_TIMEOUT = 5
 
+# Poll interval for driver-side waits (WebDriverWait defaults to 0.5 s)
+POLL_FREQUENCY = 0.05
+
+# Adaptive timeouts: once a key has MIN_SAMPLES observations, waits use
+# p99 * HEADROOM, clamped to [MIN_TIMEOUT, the caller's default].
+ADAPTIVE_WAITS = os.getenv("ADAPTIVE_WAITS", "true").lower() in {"1", "true", "yes"}
+MIN_SAMPLES = 20
+HEADROOM = 3.0
+MIN_TIMEOUT = 1.0
+
+# In-page wait: resolves on the first DOM mutation (or 10 ms tick, for
+# property changes such as input.value that mutations do not report)
+# after which the condition holds.
+_WAIT_FOR_JS = """
+var condition = new Function("args", arguments[0]);
+var args = arguments[1];
+var timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+
+function check() {
+    try { return condition(args); } catch (e) { return null; }
+}
+
+var result = check();
+if (result) {
+    done(result);
+    return;
+}
+
+var finished = false;
+function finish(value) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearInterval(ticker);
+    clearTimeout(timer);
+    done(value);
+}
+function recheck() {
+    var value = check();
+    if (value) { finish(value); }
+}
+
+var observer = new MutationObserver(recheck);
+observer.observe(document.documentElement, {
+    subtree: true, childList: true, attributes: true, characterData: true
+});
+var ticker = setInterval(recheck, 10);
+var timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+
+# Latency statistics
+class LatencyStats:
+    """
+    Rolling wait latencies per key (usually a locator tuple).
+
+    Used to tune each wait's timeout from its observed p99 instead of a fixed
+    DEFAULT_TIMEOUT for every element.
+    """
+
+    def __init__(self, window: int = 500):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, key, seconds: float) -> None:
+        self._samples[key].append(seconds)
+
+    def percentile(self, key, pct: float = 99.0) -> float | None:
+        samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, math.ceil(pct / 100.0 * len(samples)) - 1)
+        return samples[max(0, index)]
+
+    def timeout_for(self, key, default: float, minimum: float = MIN_TIMEOUT) -> float:
+        """
+        Return the timeout to use for 'key'.
+
+        Falls back to 'default' until enough samples exist or when adaptive
+        waits are disabled (ADAPTIVE_WAITS=false).
+        """
+        if not ADAPTIVE_WAITS or len(self._samples.get(key, ())) < MIN_SAMPLES:
+            return default
+        p99 = self.percentile(key)
+        return max(minimum, min(default, p99 * HEADROOM))
+
+    def summary(self) -> dict:
+        """p50/p99/count per key, for reporting."""
+        return {
+            key: {
+                "count": len(samples),
+                "p50": self.percentile(key, 50),
+                "p99": self.percentile(key, 99),
+            }
+            for key, samples in self._samples.items()
+        }
+
+
+# Shared by every wait in this process (one per xdist worker)
+LATENCY = LatencyStats()
+
+
+def _timed_until(driver, key, condition, timeout):
+    if timeout is None:
+        timeout = LATENCY.timeout_for(key, DEFAULT_TIMEOUT)
+    # selenium.webdriver is imported on first wait, not at collection time
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    start = time.perf_counter()
+    result = WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(condition)
+    LATENCY.record(key, time.perf_counter() - start)
+    return result
+
 
 # Waits
-def wait_visible(driver, locator, timeout: int = DEFAULT_TIMEOUT):
+@traced("wait")
+def wait_visible(driver, locator, timeout: float | None = None):
     """
     Wait until the element located by 'locator' is visible on the page.
 
@@ -14,16 +138,20 @@ def wait_visible(driver, locator, timeout: int = DEFAULT_TIMEOUT):
         driver: Selenium WebDriver instance.
         locator: Tuple (By.<METHOD>, "selector") identifying the element.
         timeout: Maximum time (in seconds) to wait before raising TimeoutException.
+            Defaults to the locator's adaptive timeout (see LatencyStats).
 
     Returns:
         WebElement once it becomes visible.
     """
-    return WebDriverWait(driver, timeout).until(
-        EC.visibility_of_element_located(locator)
+    from selenium.webdriver.support import expected_conditions as EC
+
+    return _timed_until(
+        driver, ("visible",) + tuple(locator), EC.visibility_of_element_located(locator), timeout
     )
 
 
-def wait_clickable(driver, locator, timeout: int = DEFAULT_TIMEOUT):
+@traced("wait")
+def wait_clickable(driver, locator, timeout: float | None = None):
     """
     Wait until the element located by 'locator' is clickable.
 
@@ -31,10 +159,78 @@ def wait_clickable(driver, locator, timeout: int = DEFAULT_TIMEOUT):
         driver: Selenium WebDriver instance.
         locator: Tuple (By.<METHOD>, "selector") identifying the element.
         timeout: Maximum time (in seconds) to wait before raising TimeoutException.
+            Defaults to the locator's adaptive timeout (see LatencyStats).
 
     Returns:
         WebElement once it becomes clickable.
     """
-    return WebDriverWait(driver, timeout).until(
-        EC.element_to_be_clickable(locator)
+    from selenium.webdriver.support import expected_conditions as EC
+
+    return _timed_until(
+        driver, ("clickable",) + tuple(locator), EC.element_to_be_clickable(locator), timeout
     )
+
+
+@traced("wait")
+def wait_for_js(driver, condition_js: str, args=None, timeout: float = DEFAULT_TIMEOUT):
+    """
+    Wait inside the page until a JavaScript condition is truthy.
+
+    The condition is re-evaluated on every DOM mutation (MutationObserver)
+    and on a 10 ms in-page tick, so it resolves as soon as it becomes true
+    rather than on the next driver poll.
+
+    Args:
+        driver: Selenium WebDriver instance.
+        condition_js: Function body evaluated with 'args' in scope; return a truthy value to finish.
+        args: JSON-serialisable value passed to the condition as 'args'.
+        timeout: Maximum time (in seconds) to wait before raising TimeoutException.
+
+    Returns:
+        The condition's truthy return value.
+    """
+    result = driver.execute_async_script(_WAIT_FOR_JS, condition_js, args, int(timeout * 1000))
+    if not result:
+        raise TimeoutException(f"JavaScript condition not met within {timeout}s")
+    return result
+
+
+@traced("wait")
+def wait_for_alert_or_js(
+    driver,
+    key,
+    condition_js: str,
+    args=None,
+    timeout: float = DEFAULT_TIMEOUT,
+    minimum: float = 0.25,
+):
+    """
+    Wait until either an alert opens or a JavaScript condition becomes true,
+    whichever fires first.
+
+    The timeout adapts to the p99 latency recorded under 'key'. When neither
+    signal fires in time, ("timeout", None) is returned rather than raising,
+    because an unchanged page is a valid outcome for some builds.
+
+    Returns:
+        ("alert", text), ("condition", value) or ("timeout", None).
+    """
+    budget = LATENCY.timeout_for(key, timeout, minimum=minimum)
+    start = time.perf_counter()
+    try:
+        value = wait_for_js(driver, condition_js, args, budget)
+        LATENCY.record(key, time.perf_counter() - start)
+        return "condition", value
+    except UnexpectedAlertPresentException as e:
+        LATENCY.record(key, time.perf_counter() - start)
+        text = e.alert_text
+        try:
+            alert = driver.switch_to.alert
+            text = text or alert.text
+            alert.accept()
+        except NoAlertPresentException:
+            # Driver already dismissed it (unhandledPromptBehavior); text came with the error
+            pass
+        return "alert", text
+    except TimeoutException:
+        return "timeout", None
@@ -1,17 +1,39 @@
 import os
-from dotenv import load_dotenv
+import weakref
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
+from src.utils.browser_profile import (
+    BROWSER_PROFILE,
+    block_resources,
+    cache_dir,
+    claim_cache_slot,
+    lean_chrome_arguments,
+    lean_firefox_prefs,
+    profile_name,
+    release_cache_slot,
+)
+from src.utils.driver_resolver import resolve_driver
 
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 
-# Load environment variables from .env if present
-load_dotenv()
+def _find_dotenv() -> str | None:
+    """The nearest .env at or above this module's directory (where load_dotenv() looks)."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+# Load environment variables from .env if present; python-dotenv is only
+# imported when there is a file to load
+_DOTENV_PATH = _find_dotenv()
+if _DOTENV_PATH:
+    from dotenv import load_dotenv
+
+    load_dotenv(_DOTENV_PATH)
 
 # Default environment values
 BASE_URL = os.getenv("BASE_URL", "https://testsheepnz.github.io/BasicCalculator.html")
@@ -20,6 +42,29 @@ HEADLESS = os.getenv("HEADLESS", "true").lower() in {"1", "true", "yes"}
 
 
 def create_driver():
+    lean = profile_name(BROWSER_PROFILE) == "lean"
+    # The lean profile's disk cache: one directory per live browser (see browser_profile.py)
+    slot = claim_cache_slot() if lean else None
+    try:
+        driver = _start_browser(lean, slot)
+    except BaseException:
+        if slot is not None:
+            release_cache_slot(slot)
+        raise
+    if slot is not None:
+        weakref.finalize(driver, release_cache_slot, slot)
+    return driver
+
+
+def _start_browser(lean: bool, slot: int | None):
+    # Selenium's webdriver package is imported here, on the first browser,
+    # so collection and engine-backend runs never load it
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+
     # Chrome setup
     if BROWSER == "chrome":
         options = ChromeOptions()
@@ -36,16 +81,26 @@ def create_driver():
         # Consistent window size across environments
         options.add_argument("--window-size=1280,900")
 
-        service = ChromeService(ChromeDriverManager().install())
+        # Only the calculator's own HTML/CSS/JS, persistent disk cache (see browser_profile.py)
+        if lean:
+            for argument in lean_chrome_arguments(BASE_URL, cache_dir("chrome", slot)):
+                options.add_argument(argument)
+
+        service = ChromeService(resolve_driver("chrome"))
         driver = webdriver.Chrome(service=service, options=options)
+        if lean:
+            block_resources(driver)
 
     # Firefox setup
     elif BROWSER == "firefox":
         options = FirefoxOptions()
         if HEADLESS:
             options.add_argument("-headless")
+        if lean:
+            for name, value in lean_firefox_prefs(BASE_URL, cache_dir("firefox", slot)).items():
+                options.set_preference(name, value)
 
-        service = FirefoxService(GeckoDriverManager().install())
+        service = FirefoxService(resolve_driver("firefox"))
         driver = webdriver.Firefox(service=service, options=options)
 
     # Unsupported browser handling
@@ -54,4 +109,7 @@ def create_driver():
 
     # Reasonable timeout to handle public site delays
     driver.set_page_load_timeout(30)
+
+    # Upper bound for in-page async waits (execute_async_script)
+    driver.set_script_timeout(30)
     return driver
@@ -0,0 +1,324 @@
+"""
+Size and supervise the xdist workers for `run_all_tests.py --workers=auto`.
+
+1. calibrate() runs a fixed slice of the real matrix (CALIBRATION_SLICE) on
+   one worker, repeated for at least CALIBRATION_SECONDS, and samples the
+   process tree: cases per second, CPU used per worker and the peak memory
+   of one worker with its browser.
+2. choose_workers() takes the largest count that neither oversubscribes the
+   CPUs nor eats into the memory reserve (so nothing swaps), capped at the
+   number of builds, since --build-scheduling hands out one build per worker.
+3. WorkerMonitor watches the run: a worker whose process tree (worker,
+   driver and browser) grows past the memory ceiling has its browser
+   recycled, and when free memory drops under the reserve or the load
+   average climbs too high, the largest worker is parked between tests until
+   things recover. Orders go through files in the control directory and are
+   carried out by src/plugins/worker_control.py inside each worker.
+
+Process and memory figures come from /proc; elsewhere sizing falls back to
+the CPU count and the run is not supervised.
+"""
+
+import contextlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+
+from src.engine.calculator_engine import ALL_BUILDS
+
+WORKER_CONTROL_DIR = os.path.join("reports", ".workers")
+
+# Memory kept free for the OS and the controller (MB)
+MEMORY_RESERVE_MB = int(os.getenv("WORKER_MEMORY_RESERVE_MB", "1024"))
+# A worker's tree above this is recycled (MB); 0 means twice the calibrated size
+WORKER_MEMORY_CEILING_MB = int(os.getenv("WORKER_MEMORY_CEILING_MB", "0"))
+# Park a worker when the 1-minute load average per CPU goes above this
+LOAD_CEILING = float(os.getenv("WORKER_LOAD_CEILING", "2.0"))
+# Calibration: one build of the arithmetic matrix, the unit --build-scheduling
+# hands a worker, run for at least this many seconds
+CALIBRATION_SLICE = [
+    "tests/test_data_driven_arithmetic.py::test_arithmetic_all_builds",
+    "-k",
+    "build-0",
+]
+CALIBRATION_SECONDS = float(os.getenv("WORKER_CALIBRATION_SECONDS", "20"))
+
+_PAGE_MB = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024) if hasattr(os, "sysconf") else 0.0
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_OUTCOMES_RE = re.compile(r"(\d+) (passed|failed|errors?|skipped|xfailed|xpassed)")
+
+
+# Machine
+def cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def memory_mb() -> tuple[float, float] | None:
+    """(total, available) MB from /proc/meminfo, or None where there is none."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            fields = {line.split(":")[0]: int(line.split()[1]) for line in f}
+    except (OSError, ValueError, IndexError):
+        return None
+    return fields["MemTotal"] / 1024, fields["MemAvailable"] / 1024
+
+
+def load_per_cpu() -> float | None:
+    try:
+        return os.getloadavg()[0] / cpu_count()
+    except (AttributeError, OSError):
+        return None
+
+
+def process_table() -> dict[int, tuple[int, float, float]]:
+    """{pid: (ppid, rss MB, CPU seconds)} for every process, or {} without /proc."""
+    table = {}
+    try:
+        pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return table
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", encoding="ascii", errors="replace") as f:
+                # The command name may contain spaces; fields resume after ')'
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{pid}/statm", encoding="ascii") as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        ppid, utime, stime = int(fields[1]), int(fields[11]), int(fields[12])
+        table[pid] = (ppid, rss_pages * _PAGE_MB, (utime + stime) / _CLOCK_TICKS)
+    return table
+
+
+def tree(pid: int, table: dict) -> list[int]:
+    """'pid' and all of its descendants present in 'table'."""
+    children: dict[int, list[int]] = {}
+    for child, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(child)
+    found, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        if current in table:
+            found.append(current)
+        stack.extend(children.get(current, ()))
+    return found
+
+
+def tree_rss(pid: int, table: dict) -> float:
+    return sum(table[p][1] for p in tree(pid, table))
+
+
+# Calibration
+def _measure(cmd: list[str], interval: float) -> tuple[int, float, float, float]:
+    """One run of 'cmd': (cases, seconds, CPU seconds below the controller, peak RSS MB)."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    output: list[str] = []
+    reader = threading.Thread(target=lambda: output.extend(proc.stdout), daemon=True)
+    reader.start()
+
+    peak_rss = 0.0
+    cpu_seconds: dict[int, float] = {}
+    while proc.poll() is None:
+        table = process_table()
+        below = [pid for pid in tree(proc.pid, table) if pid != proc.pid]
+        peak_rss = max(peak_rss, sum(table[pid][1] for pid in below))
+        for pid in below:
+            cpu_seconds[pid] = max(cpu_seconds.get(pid, 0.0), table[pid][2])
+        time.sleep(interval)
+    reader.join()
+    seconds = time.perf_counter() - started
+
+    cases = sum(int(count) for count, _ in _OUTCOMES_RE.findall("".join(output[-5:])))
+    return cases, seconds, sum(cpu_seconds.values()), peak_rss
+
+
+def calibrate(cmd: list[str], interval: float = 0.2, min_seconds: float = 0.0) -> dict:
+    """
+    Run 'cmd' (a one-worker pytest run) and measure it, again and again
+    until the runs add up to 'min_seconds', so a short slice still yields a
+    steady rate. The per-worker figures are for everything below the pytest
+    controller: the worker, its driver and its browser.
+    """
+    cases, seconds, cpu, peak_rss = 0, 0.0, 0.0, 0.0
+    while True:
+        run_cases, run_seconds, run_cpu, run_rss = _measure(cmd, interval)
+        cases += run_cases
+        seconds += run_seconds
+        cpu += run_cpu
+        peak_rss = max(peak_rss, run_rss)
+        # A run without cases would not get any closer to a steady rate
+        if seconds >= min_seconds or not run_cases:
+            break
+    return {
+        "cases": cases,
+        "seconds": seconds,
+        "cases_per_second": cases / seconds if seconds else 0.0,
+        "cpu_per_worker": cpu / seconds if cpu and seconds else None,
+        "worker_rss_mb": peak_rss or None,
+    }
+
+
+def choose_workers(
+    cpus: int,
+    memory: tuple[float, float] | None,
+    calibration: dict,
+    reserve_mb: float = MEMORY_RESERVE_MB,
+    max_workers: int = len(ALL_BUILDS),
+) -> tuple[int, dict]:
+    """
+    Worker count and the limits behind it. Throughput grows with workers
+    until the CPUs are busy or memory runs out, so take the lower bound.
+    """
+    # A worker waiting on its browser uses less than a core; never plan
+    # for more than four per core
+    cpu_per_worker = max(calibration.get("cpu_per_worker") or 1.0, 0.25)
+    limits = {"cpu": max(1, int(cpus / cpu_per_worker)), "builds": max_workers}
+    if memory and calibration.get("worker_rss_mb"):
+        _, available = memory
+        limits["memory"] = max(1, int((available - reserve_mb) / calibration["worker_rss_mb"]))
+    workers = min(limits.values())
+    return workers, {
+        "workers": workers,
+        "limited_by": min(limits, key=limits.get),
+        "limits": limits,
+        "cpus": cpus,
+        "memory_mb": memory,
+        "calibration": calibration,
+    }
+
+
+# Supervision
+def _control_path(directory: str, worker: str, order: str) -> str:
+    return os.path.join(directory, f"{worker}.{order}")
+
+
+def worker_pids(directory: str) -> dict[str, int]:
+    """{worker id: pid} as registered by src/plugins/worker_control.py."""
+    pids = {}
+    for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else ():
+        if name.endswith(".pid"):
+            try:
+                with open(os.path.join(directory, name), encoding="ascii") as f:
+                    pids[name[: -len(".pid")]] = int(f.read())
+            except (OSError, ValueError):
+                continue
+    return pids
+
+
+class WorkerMonitor:
+    """Background thread that recycles and parks workers through control files."""
+
+    def __init__(
+        self,
+        directory: str,
+        ceiling_mb: float,
+        reserve_mb: float = MEMORY_RESERVE_MB,
+        load_ceiling: float = LOAD_CEILING,
+        interval: float = 2.0,
+        log=print,
+        read_memory=memory_mb,
+        read_load=load_per_cpu,
+        read_processes=process_table,
+    ):
+        self.directory = directory
+        self.ceiling_mb = ceiling_mb
+        self.reserve_mb = reserve_mb
+        self.load_ceiling = load_ceiling
+        self.interval = interval
+        self.log = log
+        self._read_memory = read_memory
+        self._read_load = read_load
+        self._read_processes = read_processes
+
+        self.events: list[dict] = []
+        self.peak_rss: dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "WorkerMonitor":
+        self._thread = threading.Thread(target=self._run, name="worker-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for worker in worker_pids(self.directory):
+            self._clear(worker, "park")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> None:
+        table = self._read_processes()
+        rss = {
+            worker: tree_rss(pid, table)
+            for worker, pid in worker_pids(self.directory).items()
+            if pid in table
+        }
+        for worker, mb in rss.items():
+            self.peak_rss[worker] = max(self.peak_rss.get(worker, 0.0), mb)
+            if mb > self.ceiling_mb and self._order(worker, "recycle"):
+                self._event("recycle", worker, f"{mb:.0f} MB > {self.ceiling_mb:.0f} MB ceiling")
+
+        memory = self._read_memory()
+        load = self._read_load()
+        available = memory[1] if memory else None
+        short_of_memory = available is not None and available < self.reserve_mb
+        overloaded = load is not None and load > self.load_ceiling
+        running = [w for w in rss if not os.path.exists(_control_path(self.directory, w, "park"))]
+        parked = [w for w in rss if w not in running]
+
+        if (short_of_memory or overloaded) and len(running) > 1:
+            worker = max(running, key=rss.get)
+            self._order(worker, "park")
+            reason = f"{available:.0f} MB free" if short_of_memory else f"load {load:.1f} per CPU"
+            self._event("park", worker, reason)
+        elif parked and not short_of_memory and not overloaded:
+            # Resume one at a time, and only with room for another worker
+            worker = min(parked, key=rss.get)
+            if available is None or available - rss[worker] > self.reserve_mb:
+                self._clear(worker, "park")
+                self._event(
+                    "resume", worker, "" if available is None else f"{available:.0f} MB free"
+                )
+
+    def _order(self, worker: str, order: str) -> bool:
+        """Leave an order for 'worker'; False if one is already pending."""
+        path = _control_path(self.directory, worker, order)
+        if os.path.exists(path):
+            return False
+        with open(path, "w", encoding="ascii") as f:
+            f.write(str(time.time()))
+        return True
+
+    def _clear(self, worker: str, order: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(_control_path(self.directory, worker, order))
+
+    def _event(self, action: str, worker: str, reason: str) -> None:
+        self.events.append(
+            {"at": time.time(), "action": action, "worker": worker, "reason": reason}
+        )
+        self.log(f"workers: {action} {worker} ({reason})")
+
+
+def save_log(path: str, config: dict, monitor: "WorkerMonitor | None") -> None:
+    """Write the chosen configuration and what the monitor did to 'path' (JSON)."""
+    record = dict(config)
+    if monitor is not None:
+        record["events"] = monitor.events
+        record["peak_worker_rss_mb"] = monitor.peak_rss
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2, sort_keys=True)
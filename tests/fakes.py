@@ -0,0 +1,143 @@
+"""Stand-ins for WebDriver shared by the framework unit tests."""
+
+import base64
+
+PNG = base64.b64encode(b"\x89PNG fake image").decode("ascii")
+
+
+class FakeExecutor:
+    def execute(self, command, params=None):
+        return {"value": None}
+
+
+class FakeDriver:
+    """
+    Minimal stand-in for a WebDriver: a liveness probe for the driver pool,
+    screenshot and page source for evidence capture, and a command executor
+    for instrumentation. Set 'alive' to False to simulate a lost session.
+    """
+
+    def __init__(self, screenshot=PNG, page_source="<html></html>"):
+        self.alive = True
+        self.quit_called = False
+        self.screenshot = screenshot
+        self.page_source = page_source
+        self.screenshots_taken = 0
+        self.command_executor = FakeExecutor()
+
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise RuntimeError("session lost")
+        return "window-1"
+
+    def execute_script(self, script, *args):
+        return "complete"
+
+    def execute(self, command, params=None):
+        return self.command_executor.execute(command, params)
+
+    def get_screenshot_as_base64(self):
+        self.screenshots_taken += 1
+        return self.screenshot
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeChrome(FakeDriver):
+    """Stands in for webdriver.Chrome: keeps the options and CDP commands it was given."""
+
+    def __init__(self, service=None, options=None):
+        super().__init__()
+        self.options = options
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+
+class FakeElement:
+    """A WebElement handle; set 'stale' to make it raise like one from a replaced DOM."""
+
+    def __init__(self):
+        self.stale = False
+        self.clicks = 0
+
+    def _check(self):
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        if self.stale:
+            raise StaleElementReferenceException("stale element reference")
+
+    def is_displayed(self):
+        self._check()
+        return True
+
+    def is_enabled(self):
+        self._check()
+        return True
+
+    def click(self):
+        self._check()
+        self.clicks += 1
+
+
+class FakePageDriver(FakeDriver):
+    """
+    A driver sitting on the calculator page: find_element() hands out one
+    FakeElement per selector (recording every lookup), execute_script()
+    returns 'script_result' (or raises 'script_error'), execute_async_script()
+    records its arguments and returns 'async_result', get() records the URL
+    and switch_to.alert reports no alert.
+    """
+
+    def __init__(self, url="http://aut/"):
+        super().__init__()
+        self.current_url = url
+        self.elements = {}
+        self.lookups = []
+        self.script_result = True
+        self.script_error = None
+        self.scripts_run = 0
+        self.visited = []
+        self.async_result = []
+        self.async_calls = []
+        self.script_timeout = None
+
+    def find_element(self, by, value):
+        self.lookups.append(value)
+        return self.elements.setdefault(value, FakeElement())
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+    def execute_script(self, script, *args):
+        self.scripts_run += 1
+        if self.script_error is not None:
+            raise self.script_error
+        return self.script_result
+
+    def execute_async_script(self, script, *args):
+        self.async_calls.append(args)
+        return self.async_result
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    @property
+    def switch_to(self):
+        return self
+
+    @property
+    def alert(self):
+        from selenium.common.exceptions import NoAlertPresentException
+
+        raise NoAlertPresentException()
@@ -0,0 +1,98 @@
+import asyncio
+import itertools
+import json
+import re
+
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+from src.engine.calculator_engine import ALL_BUILDS, INCOMPLETE_BUILDS, calculate  # noqa: E402
+from src.pages.async_calculator_page import run_matrix  # noqa: E402
+from src.pages.engine_page import EngineCalculatorPage  # noqa: E402
+
+# Build and case list as embedded by AsyncCalculatorPage.run_cases()
+_CASES_ARGS_RE = re.compile(r"\.apply\(null, \[(\".*?\"), (\[.*\]), resolve\]\)", re.DOTALL)
+
+
+class FakeChrome:
+    """
+    Just enough of the DevTools protocol to exercise the async page:
+    contexts, targets, sessions, navigation and Runtime.evaluate, with the
+    calculator itself answered by the Python engine.
+    """
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.contexts = set()
+        self.max_open_contexts = 0
+
+    async def handler(self, websocket):
+        async for raw in websocket:
+            message = json.loads(raw)
+            result = await self.answer(message["method"], message["params"])
+            await websocket.send(json.dumps({"id": message["id"], "result": result}))
+
+    async def answer(self, method, params):
+        if method == "Target.createBrowserContext":
+            context_id = f"context-{next(self.ids)}"
+            self.contexts.add(context_id)
+            self.max_open_contexts = max(self.max_open_contexts, len(self.contexts))
+            return {"browserContextId": context_id}
+        if method == "Target.createTarget":
+            return {"targetId": f"target-{next(self.ids)}"}
+        if method == "Target.attachToTarget":
+            return {"sessionId": f"session-{params['targetId']}"}
+        if method == "Target.disposeBrowserContext":
+            self.contexts.discard(params["browserContextId"])
+            return {}
+        if method == "Runtime.evaluate":
+            match = _CASES_ARGS_RE.search(params["expression"])
+            if not match:
+                return {"result": {"value": True}}
+            # Yield so several contexts are genuinely in flight together
+            await asyncio.sleep(0.01)
+            return {
+                "result": {
+                    "value": self.run_cases(json.loads(match.group(1)), json.loads(match.group(2)))
+                }
+            }
+        return {}
+
+    @staticmethod
+    def run_cases(build, cases):
+        raw = []
+        for op, a, b, integer_only in cases:
+            if int(build) in INCOMPLETE_BUILDS:
+                raw.append(
+                    {"missing": True, "alert": None, "answer": None, "error": "", "body": ""}
+                )
+                continue
+            answer, error = calculate(int(build), int(op), a, b, integer_only and op != "4")
+            raw.append(
+                {"missing": False, "alert": None, "answer": answer, "error": error, "body": ""}
+            )
+        return raw
+
+
+def test_run_matrix_fans_builds_out_across_contexts():
+    cases = [
+        ("0", "1.5", "2", False),
+        ("3", "7", "2", True),
+        ("4", "foo", "bar", False),
+        ("3", "1", "0", False),
+    ]
+    work = {build: cases for build in ALL_BUILDS}
+    chrome = FakeChrome()
+
+    async def scenario():
+        async with websockets.serve(chrome.handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            return await run_matrix(f"ws://127.0.0.1:{port}", "http://aut/", work, contexts=4)
+
+    results = asyncio.run(scenario())
+
+    engine = EngineCalculatorPage()
+    assert results == {build: engine.run_cases(build, cases) for build in ALL_BUILDS}
+    assert chrome.max_open_contexts == 4
+    assert not chrome.contexts
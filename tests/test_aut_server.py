@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from src.utils.aut_server import AUT_PAGE, SYNTHETIC_DIR, AUTServer, is_vendored, vendor
+
+
+def test_vendor_saves_the_page_and_its_same_origin_assets(tmp_path):
+    server = AUTServer(directory=SYNTHETIC_DIR).start()
+    try:
+        saved, skipped = vendor(server.url, str(tmp_path))
+    finally:
+        server.stop()
+
+    assert sorted(os.path.relpath(path, tmp_path) for path in saved) == sorted(
+        os.listdir(SYNTHETIC_DIR)
+    )
+    assert skipped == []
+    for name in os.listdir(SYNTHETIC_DIR):
+        with open(os.path.join(SYNTHETIC_DIR, name), "rb") as f:
+            assert (tmp_path / name).read_bytes() == f.read()
+    assert is_vendored(str(tmp_path))
+
+
+def test_server_refuses_a_directory_without_the_page(tmp_path):
+    with pytest.raises(FileNotFoundError, match=AUT_PAGE):
+        AUTServer(directory=str(tmp_path)).start()
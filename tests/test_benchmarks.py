@@ -0,0 +1,36 @@
+import pytest
+
+from benchmarks.run_benchmarks import compare
+
+
+def result(**metrics):
+    return {"metrics": {name: dict(metric) for name, metric in metrics.items()}}
+
+
+def test_compare_flags_regressions_in_the_worse_direction():
+    baseline = result(
+        **{
+            "method.calculate": {"value": 0.100, "better": "lower"},
+            "method.open": {"value": 0.500, "better": "lower"},
+            "matrix.n2.cases_per_second": {"value": 100.0, "better": "higher"},
+            "driver.startup": {"value": 1.0, "better": "lower"},
+        }
+    )
+    current = result(
+        **{
+            "method.calculate": {"value": 0.130, "better": "lower"},  # 30% slower
+            "method.open": {"value": 0.300, "better": "lower"},  # faster
+            "matrix.n2.cases_per_second": {
+                "value": 80.0,
+                "better": "higher",
+            },  # 20% less throughput
+        }
+    )
+
+    rows = {row["metric"]: row for row in compare(baseline, current, threshold=0.15)}
+
+    assert set(rows) == {"method.calculate", "method.open", "matrix.n2.cases_per_second"}
+    assert rows["method.calculate"]["regressed"]
+    assert rows["matrix.n2.cases_per_second"]["regressed"]
+    assert not rows["method.open"]["regressed"]
+    assert rows["method.calculate"]["change"] == pytest.approx(0.30)
@@ -0,0 +1,108 @@
+import gc
+
+import pytest
+from fakes import FakeChrome
+
+from src.utils import page_load, web
+from src.utils.browser_profile import (
+    BLOCKED_URL_PATTERNS,
+    lean_chrome_arguments,
+    lean_firefox_prefs,
+    profile_name,
+)
+
+
+@pytest.fixture
+def fake_chrome(monkeypatch):
+    import selenium.webdriver
+
+    monkeypatch.setattr(web, "BROWSER", "chrome")
+    monkeypatch.setattr(web, "resolve_driver", lambda browser: "/usr/bin/true")
+    monkeypatch.setattr(selenium.webdriver, "Chrome", FakeChrome)
+
+
+def test_lean_profile_only_reaches_the_aut_host():
+    args = lean_chrome_arguments("https://testsheepnz.github.io/BasicCalculator.html", "/cache")
+
+    assert (
+        "--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE testsheepnz.github.io, "
+        "EXCLUDE localhost, EXCLUDE 127.0.0.1"
+    ) in args
+    assert "--disk-cache-dir=/cache" in args
+    assert "--disable-background-networking" in args
+
+    prefs = lean_firefox_prefs("http://127.0.0.1:8000/BasicCalculator.html", "/cache")
+    assert prefs["network.proxy.no_proxies_on"] == "localhost, 127.0.0.1"
+    assert prefs["browser.cache.disk.parent_directory"] == "/cache"
+    assert prefs["permissions.default.image"] == 2
+
+    with pytest.raises(RuntimeError):
+        profile_name("fast")
+
+
+def test_create_driver_applies_the_lean_profile(fake_chrome, monkeypatch):
+    monkeypatch.setattr(web, "BROWSER_PROFILE", "default")
+    plain = web.create_driver()
+    monkeypatch.setattr(web, "BROWSER_PROFILE", "lean")
+    lean = web.create_driver()
+
+    assert plain.cdp == []
+    assert not any(arg.startswith("--host-resolver-rules") for arg in plain.options.arguments)
+    assert set(plain.options.arguments) < set(lean.options.arguments)
+    assert ("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}) in lean.cdp
+
+
+def test_live_browsers_never_share_a_disk_cache(fake_chrome, monkeypatch):
+    monkeypatch.setattr(web, "BROWSER_PROFILE", "lean")
+
+    def disk_cache(driver):
+        return next(arg for arg in driver.options.arguments if arg.startswith("--disk-cache-dir="))
+
+    first, second = web.create_driver(), web.create_driver()
+    assert disk_cache(first) != disk_cache(second)
+
+    # A replacement takes the slot a quit browser left
+    released = disk_cache(first)
+    del first
+    gc.collect()
+    assert disk_cache(web.create_driver()) == released
+
+
+def test_page_load_summary_takes_medians():
+    loads = [
+        {
+            "ttfb": 5,
+            "dom_content_loaded": 40,
+            "load": None,
+            "requests": 3,
+            "transfer_bytes": 4096,
+            "from_cache": 0,
+        },
+        {
+            "ttfb": 7,
+            "dom_content_loaded": 20,
+            "load": 30,
+            "requests": 3,
+            "transfer_bytes": 2048,
+            "from_cache": 2,
+        },
+        {
+            "ttfb": 6,
+            "dom_content_loaded": 30,
+            "load": 50,
+            "requests": 3,
+            "transfer_bytes": 0,
+            "from_cache": 2,
+        },
+    ]
+    summary = page_load.summarize([dict(load, profile="lean") for load in loads])
+
+    assert summary["loads"] == 3
+    assert summary["dom_content_loaded_ms"] == 30
+    assert summary["load_ms"] == 40
+    assert summary["transfer_bytes"] == 2048
+    assert summary["from_cache"] == 4
+    assert page_load.format_summary(summary).startswith(
+        "page loads (lean profile): 3, median TTFB 6 ms"
+    )
+    assert page_load.summarize([]) is None
@@ -8,7 +8,7 @@ ALL_BUILDS = list(range(0, 10))
 
 # Tests
 @pytest.mark.build
-@pytest.mark.parametrize("build", ALL_BUILDS)
+@pytest.mark.parametrize("build", ALL_BUILDS, ids=lambda b: f"build-{b}")
 @pytest.mark.parametrize(
     "op, a, b, expected",
     [
@@ -36,7 +36,7 @@ def test_integer_only_flag(calc, build, op, a, b, expected):
 
 
 @pytest.mark.build
-@pytest.mark.parametrize("build", ALL_BUILDS)
+@pytest.mark.parametrize("build", ALL_BUILDS, ids=lambda b: f"build-{b}")
 def test_concatenate_ignores_integer_toggle(calc, build):
     """
     Verify that the 'Integers Only' checkbox is ignored when using
@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from src.engine.calculator_engine import ALL_BUILDS, calculate, js_number_to_string, js_to_number
+
+CALCULATOR_JS = os.path.join(os.path.dirname(__file__), "..", "src", "synthetic", "calculator.js")
+
+# Inputs chosen to exercise number formatting, parsing and every build's defect
+PARITY_INPUTS = [
+    ("0", "0"),
+    ("1.5", "2"),
+    ("0.1", "0.2"),
+    ("-5", "7"),
+    ("7", "-3"),
+    ("1e21", "1"),
+    ("1e-7", "3"),
+    ("123456789", "0.001"),
+    ("0x1F", "2"),
+    (" 4 ", "2."),
+    (".5", "-0"),
+    ("abc", "2"),
+    ("2", ""),
+    ("Infinity", "1"),
+    ("9999.99", "0.001"),
+]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (0.0, "0"),
+        (-0.0, "0"),
+        (15.0, "15"),
+        (0.1 + 0.2, "0.30000000000000004"),
+        (1e21, "1e+21"),
+        (1e20, "100000000000000000000"),
+        (1.5e-7, "1.5e-7"),
+        (0.000001, "0.000001"),
+        (float("inf"), "Infinity"),
+        (float("nan"), "NaN"),
+    ],
+)
+def test_js_number_to_string(value, expected):
+    assert js_number_to_string(value) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("12", 12.0),
+        (" 1e3 ", 1000.0),
+        ("0x10", 16.0),
+        (".5", 0.5),
+        ("", 0.0),
+        ("-Infinity", float("-inf")),
+    ],
+)
+def test_js_to_number(text, expected):
+    assert js_to_number(text) == expected
+
+
+@pytest.mark.parametrize("text", ["abc", "1_000", "inf", "nan", "1e", "--1"])
+def test_js_to_number_rejects_non_numbers(text):
+    assert js_to_number(text) != js_to_number(text)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_engine_matches_page_javascript():
+    """
+    Evaluate every build/operation/input combination with the page's own
+    calculator.js under node and check the Python port agrees exactly.
+    """
+    cases = [
+        [build, op, a, b, integer_only]
+        for build in ALL_BUILDS
+        for op in range(5)
+        for a, b in PARITY_INPUTS
+        for integer_only in (False, True)
+    ]
+    script = (
+        "const { calculate } = require(process.argv[1]);"
+        "const cases = JSON.parse(require('fs').readFileSync(0, 'utf8'));"
+        "process.stdout.write(JSON.stringify(cases.map(c => calculate(...c))));"
+    )
+    proc = subprocess.run(
+        ["node", "-e", script, os.path.abspath(CALCULATOR_JS)],
+        input=json.dumps(cases),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    expected = json.loads(proc.stdout)
+
+    mismatches = [
+        (case, (exp["answer"], exp["error"]), calculate(*case))
+        for case, exp in zip(cases, expected)
+        if calculate(*case) != (exp["answer"], exp["error"])
+    ]
+    assert not mismatches, mismatches[:10]
@@ -0,0 +1,153 @@
+from fakes import FakePageDriver
+from selenium.common.exceptions import WebDriverException
+
+from src.pages.calculator_page import CalculatorPage, resolve_batch_results
+
+NUMBER1 = CalculatorPage.NUMBER1[1]
+URL = "http://aut/"
+
+
+def open_or_reset(page):
+    """What the calc fixture does: reset in the DOM, reload only if that fails."""
+    if not page.reset(URL):
+        page.open(URL)
+    return page
+
+
+def test_element_handles_are_cached_per_driver():
+    driver = FakePageDriver()
+    page = CalculatorPage(driver)
+
+    page._interact(CalculatorPage.NUMBER1, lambda el: el.click())
+    page._interact(CalculatorPage.NUMBER1, lambda el: el.click())
+
+    assert driver.lookups == [NUMBER1]
+    assert (page.element_cache.misses, page.element_cache.hits) == (1, 1)
+    # A second page on the same driver shares the handles
+    assert CalculatorPage(driver).element_cache is page.element_cache
+    assert CalculatorPage(FakePageDriver()).element_cache is not page.element_cache
+
+
+def test_stale_handle_is_resolved_again_once():
+    driver = FakePageDriver()
+    page = CalculatorPage(driver)
+    page._interact(CalculatorPage.NUMBER1, lambda el: el.click())
+
+    stale = driver.elements.pop(NUMBER1)
+    stale.stale = True
+    page._interact(CalculatorPage.NUMBER1, lambda el: el.click())
+
+    assert driver.lookups == [NUMBER1, NUMBER1]
+    assert driver.elements[NUMBER1].clicks == 1
+    assert page.element_cache.elements[CalculatorPage.NUMBER1] is driver.elements[NUMBER1]
+
+
+def test_invalidate_keeps_only_the_given_locators():
+    page = CalculatorPage(FakePageDriver())
+    for locator in (CalculatorPage.SELECT_BUILD, CalculatorPage.NUMBER1, CalculatorPage.ANSWER):
+        page._element(locator)
+
+    page.element_cache.invalidate(keep=(CalculatorPage.SELECT_BUILD,))
+
+    assert list(page.element_cache.elements) == [CalculatorPage.SELECT_BUILD]
+    page.element_cache.invalidate()
+    assert page.element_cache.elements == {}
+
+
+def test_reset_drops_handles_of_the_previous_build():
+    page = CalculatorPage(FakePageDriver())
+    page._build = "4"
+    page._element(CalculatorPage.SELECT_BUILD)
+    page._element(CalculatorPage.NUMBER1)
+
+    assert page.reset(URL) is True
+    assert list(page.element_cache.elements) == [CalculatorPage.SELECT_BUILD]
+    assert page._build is None
+
+
+def test_reset_in_the_dom_skips_the_page_load():
+    driver = FakePageDriver(URL)
+    page = CalculatorPage(driver)
+    page._last_alert_text = "Divide by zero!"
+
+    open_or_reset(page)
+
+    assert driver.visited == []
+    assert driver.scripts_run == 1
+    assert page._last_alert_text is None
+
+
+def test_reset_on_another_url_reloads_the_page():
+    driver = FakePageDriver("about:blank")
+    page = CalculatorPage(driver)
+
+    assert page.reset(URL) is False
+    assert driver.scripts_run == 0
+
+    driver.script_result = None  # no Navigation Timing entry after the load
+    open_or_reset(page)
+    assert driver.visited == [URL]
+
+
+def test_reset_falls_back_to_a_reload_when_the_check_fails_or_the_driver_errors():
+    driver = FakePageDriver(URL)
+    page = CalculatorPage(driver)
+
+    driver.script_result = False
+    assert page.reset(URL) is False
+
+    driver.script_error = WebDriverException("javascript error")
+    page._element(CalculatorPage.NUMBER1)
+    open_or_reset(page)
+
+    assert driver.visited == [URL]
+    # The reload starts a new document: no handle from the old one is kept
+    assert CalculatorPage.NUMBER1 not in page.element_cache.elements
+
+
+def raw_row(answer="", alert=None, error="", body="", missing=False):
+    return {"missing": missing, "alert": alert, "error": error, "answer": answer, "body": body}
+
+
+def test_run_cases_sends_every_case_in_one_script_call():
+    driver = FakePageDriver()
+    driver.async_result = [raw_row("15"), raw_row("5"), raw_row("50")]
+    page = CalculatorPage(driver)
+    page._element(CalculatorPage.SELECT_BUILD)
+    page._element(CalculatorPage.NUMBER1)
+
+    results = page.run_cases(3, [(0, 10, 5, False), (1, "10", "5", 1), ("2", "10", "5", None)])
+
+    assert driver.async_calls == [
+        (
+            "3",
+            [["0", "10", "5", False], ["1", "10", "5", True], ["2", "10", "5", False]],
+        )
+    ]
+    assert driver.script_timeout == 30
+    assert [r["answer"] for r in results] == ["15", "5", "50"]
+    # The batch switched builds in the page: only the build select handle survives
+    assert list(page.element_cache.elements) == [CalculatorPage.SELECT_BUILD]
+
+
+def test_batch_results_resolve_answers_like_read_answer():
+    results = resolve_batch_results(
+        [
+            raw_row("2"),
+            raw_row("", alert="Divide by zero!"),
+            raw_row(None, body="Number 1 is not a number", error="Number 1 is not a number"),
+            raw_row(None, missing=True),
+        ]
+    )
+
+    assert results == [
+        {"missing": False, "alert": None, "error": "", "answer": "2"},
+        {"missing": False, "alert": "Divide by zero!", "error": "", "answer": "Divide by zero!"},
+        {
+            "missing": False,
+            "alert": None,
+            "error": "Number 1 is not a number",
+            "answer": "Number 1 is not a number",
+        },
+        {"missing": True, "alert": None, "error": "", "answer": ""},
+    ]
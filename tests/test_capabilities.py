@@ -0,0 +1,82 @@
+import pytest
+
+from src.utils import capabilities
+from src.utils.capabilities import aut_content_hash, load_or_discover
+
+CAPS = {"0": {"complete": True}, "9": {"complete": False}}
+
+
+@pytest.fixture()
+def aut(tmp_path):
+    """A calculator page with one script, served from file:// URLs."""
+    (tmp_path / "aut").mkdir()
+    (tmp_path / "aut" / "index.html").write_text('<script src="calc.js"></script>')
+    (tmp_path / "aut" / "calc.js").write_text("var build = 0;")
+    return tmp_path / "aut"
+
+
+def counting(result=CAPS):
+    calls = []
+
+    def discover():
+        calls.append(1)
+        return result
+
+    return discover, calls
+
+
+def test_content_hash_covers_the_page_and_its_scripts(aut):
+    url = (aut / "index.html").as_uri()
+    first = aut_content_hash(url)
+
+    assert first is not None and aut_content_hash(url) == first
+    (aut / "calc.js").write_text("var build = 1;")
+    assert aut_content_hash(url) != first
+    assert aut_content_hash((aut / "missing.html").as_uri()) is None
+
+
+def test_discovery_runs_once_per_aut_version(aut, tmp_path):
+    url, cache_dir = (aut / "index.html").as_uri(), str(tmp_path / "cache")
+    discover, calls = counting()
+
+    assert load_or_discover(discover, url, cache_dir) == {
+        0: {"complete": True},
+        9: {"complete": False},
+    }
+    assert load_or_discover(discover, url, cache_dir) == {
+        0: {"complete": True},
+        9: {"complete": False},
+    }
+    assert len(calls) == 1
+
+    # A changed script is a new AUT: discover again and cache under the new hash
+    (aut / "calc.js").write_text("var build = 1;")
+    load_or_discover(discover, url, cache_dir)
+    assert len(calls) == 2
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+def test_missing_or_corrupt_cache_file_means_discovery(monkeypatch, tmp_path):
+    monkeypatch.setattr(capabilities, "aut_content_hash", lambda base_url: "abc")
+    cache_dir = tmp_path / "cache"
+    discover, calls = counting()
+
+    load_or_discover(discover, "http://aut/", str(cache_dir))
+    (cache_dir / "capabilities-abc.json").write_text("{not json")
+    assert load_or_discover(discover, "http://aut/", str(cache_dir))[9] == {"complete": False}
+    assert len(calls) == 2
+
+    (cache_dir / "capabilities-abc.json").unlink()
+    load_or_discover(discover, "http://aut/", str(cache_dir))
+    assert len(calls) == 3
+
+
+def test_unreachable_aut_is_discovered_and_not_cached(monkeypatch, tmp_path):
+    monkeypatch.setattr(capabilities, "aut_content_hash", lambda base_url: None)
+    discover, calls = counting()
+
+    load_or_discover(discover, "http://aut/", str(tmp_path / "cache"))
+    load_or_discover(discover, "http://aut/", str(tmp_path / "cache"))
+
+    assert len(calls) == 2
+    assert not (tmp_path / "cache").exists()
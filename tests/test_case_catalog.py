@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from src.utils import case_catalog
+from src.utils.case_catalog import case_filter, iter_rows, load_catalog
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+ROWS = [
+    {"desc": "add", "op": 0, "a": "1", "b": "2", "expected": "3", "tags": "basic;add"},
+    {
+        "desc": "divide by zero",
+        "op": 3,
+        "a": "1",
+        "b": "0",
+        "expected": "Infinity | Divide by ZERO error!",
+    },
+    {"desc": "build specific", "op": 0, "a": "1", "b": "1", "expected": "2", "build": 4},
+]
+
+
+@pytest.mark.parametrize("extension", ["json", "jsonl", "csv"])
+def test_rows_stream_from_every_format(tmp_path, extension):
+    path = tmp_path / f"cases.{extension}"
+    if extension == "json":
+        path.write_text(json.dumps(ROWS, indent=2))
+    elif extension == "jsonl":
+        path.write_text("\n".join(json.dumps(r) for r in ROWS) + "\n")
+    else:
+        header = ["desc", "op", "a", "b", "expected", "tags", "build"]
+        lines = [",".join(header)] + [",".join(str(r.get(k, "")) for k in header) for r in ROWS]
+        path.write_text("\n".join(lines) + "\n")
+
+    rows = list(iter_rows(str(path)))
+
+    assert [str(r["desc"]) for r in rows] == [r["desc"] for r in ROWS]
+    assert [str(r["a"]) for r in rows] == ["1", "1", "1"]
+
+
+def test_json_streaming_handles_values_split_across_chunks(tmp_path):
+    path = tmp_path / "cases.json"
+    rows = [{"op": i % 5, "a": str(i) * 20, "b": "1", "expected": ""} for i in range(200)]
+    path.write_text(json.dumps(rows))
+
+    with open(path, encoding="utf-8") as f:
+        streamed = list(case_catalog._iter_json_array(f, chunk_size=7))
+
+    assert streamed == rows
+
+
+def test_catalog_is_compiled_indexed_and_cached(tmp_path):
+    path = tmp_path / "cases.json"
+    path.write_text(json.dumps(ROWS))
+    cache_dir = tmp_path / "cache"
+
+    catalog = load_catalog(str(path), cache_dir=str(cache_dir))
+
+    divide = catalog.rows[1]
+    assert divide["expected_options"] == ("Infinity", "Divide by ZERO error!")
+    assert divide["expected_normalized"] == ("infinity", "divide by 0 error")
+    assert divide["expected_numbers"] == (float("inf"),)
+    assert [r["desc"] for r in catalog.select(op=0)] == ["add", "build specific"]
+    assert [r["desc"] for r in catalog.select(build=2)] == ["add", "divide by zero"]
+    assert [r["desc"] for r in catalog.select(op=0, build=4)] == ["add", "build specific"]
+    assert [r["desc"] for r in catalog.select(tag="add")] == ["add"]
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A fresh process maps the pickle instead of parsing the source
+    case_catalog._LOADED.clear()
+    path_mtime = os.path.getmtime(path)
+    reloaded = load_catalog(str(path), cache_dir=str(cache_dir))
+    assert reloaded.rows == catalog.rows
+    assert os.path.getmtime(path) == path_mtime
+
+
+def test_bundled_data_files_compile():
+    arithmetic = load_catalog(os.path.join(DATA_DIR, "arithmetic_cases.json"))
+    edge = load_catalog(os.path.join(DATA_DIR, "edge_cases.csv"))
+
+    assert len(arithmetic) > 0 and all(r["build"] is None for r in arithmetic)
+    assert len(edge) > 0 and all(isinstance(r["integer_only"], bool) for r in edge)
+
+
+def test_case_filter_parses_selection():
+    assert case_filter("") == {}
+    assert case_filter("op=3, tag=fuzz") == {"op": 3, "tag": "fuzz"}
+    with pytest.raises(ValueError):
+        case_filter("colour=blue")
@@ -0,0 +1,103 @@
+import json
+import time
+
+import pytest
+
+from src.pages.calculator_page import CalculatorPage
+from src.utils.cassette import (
+    Cassette,
+    CassetteMismatch,
+    cassette_path,
+    record_commands,
+    replaying,
+    stale_cassettes,
+)
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+def no_such_element(selector):
+    error = {
+        "error": "no such element",
+        "message": f"Unable to locate element: {selector}",
+        "stacktrace": "",
+    }
+    return {"status": 404, "value": json.dumps({"value": error})}
+
+
+def find(selector, using="css selector"):
+    return ["findElement", {"using": using, "value": selector}]
+
+
+def missing_build_cassette(polls: int = 4) -> Cassette:
+    """Build 9: #number1Field never appears during a 2 s probe."""
+    cassette = Cassette("tests/test_x.py::test_build_9", "aut-1")
+    for _ in range(polls):
+        cassette.add(*find("#number1Field"), no_such_element("#number1Field"), 0.01)
+    return cassette
+
+
+# Recorded with fewer, as many or more polls than the replay makes
+@pytest.mark.parametrize("polls", [2, 4, 6])
+def test_replayed_probe_of_an_incomplete_build_takes_no_wall_time(polls):
+    cassette = missing_build_cassette(polls)
+
+    started = time.perf_counter()
+    with replaying(cassette) as driver:
+        assert CalculatorPage(driver).is_calculator_complete(timeout=2) is False
+        virtual_seconds = driver.command_executor.clock.now
+    assert time.perf_counter() - started < 0.5
+    assert virtual_seconds > 2
+
+
+def test_read_answer_falls_back_to_body_text_on_replay():
+    cassette = Cassette("tests/test_x.py::test_fallback", "aut-1")
+    # The answer field is gone (one poll recorded; later polls repeat it)...
+    cassette.add(*find("#numberAnswerField"), no_such_element("#numberAnswerField"), 0.01)
+    # ...so the page body is read instead
+    cassette.add(*find("body", "tag name"), {"value": {ELEMENT_KEY: "body-1"}}, 0.01)
+    cassette.add("getElementText", {"id": "body-1"}, {"value": "  Error: not a number \n"}, 0.01)
+
+    with replaying(cassette) as driver:
+        assert CalculatorPage(driver).read_answer() == "Error: not a number"
+
+
+def test_unrecorded_command_is_a_mismatch():
+    with replaying(missing_build_cassette()) as driver, pytest.raises(
+        CassetteMismatch, match="#number1Field"
+    ):
+        driver.find_element("css selector", "#calculateButton")
+
+
+def test_recording_a_replay_reproduces_the_cassette(tmp_path):
+    original = missing_build_cassette()
+    script = original.normalize("w3cExecuteScript", {"script": "return 1 + 1;", "args": []})
+    original.add("w3cExecuteScript", script, {"value": 2}, 0.01)
+    original.add("w3cExecuteScript", script, {"value": 2}, 0.01)
+    path = tmp_path / "recorded.json"
+
+    with replaying(original) as driver:
+        copy = record_commands(driver, Cassette(original.test, original.aut_hash))
+        CalculatorPage(driver).is_calculator_complete(timeout=2)
+        assert driver.execute_script("return 1 + 1;") == 2
+        assert driver.execute_script("return 1 + 1;") == 2
+        copy.recording = False
+    copy.save(str(path))
+
+    loaded = Cassette.load(str(path))
+    assert [entry[:3] for entry in loaded.interactions] == [
+        entry[:3] for entry in original.interactions
+    ]
+    # The script is stored once, by digest
+    assert list(loaded.scripts.values()) == ["return 1 + 1;"]
+
+
+def test_cassettes_recorded_against_another_aut_are_stale(tmp_path):
+    current = cassette_path("tests/test_x.py::test_a[build-1]", str(tmp_path))
+    old = cassette_path("tests/test_x.py::test_b[build-1]", str(tmp_path))
+    Cassette("tests/test_x.py::test_a[build-1]", "aut-2").save(current)
+    Cassette("tests/test_x.py::test_b[build-1]", "aut-1").save(old)
+
+    assert stale_cassettes("aut-2", str(tmp_path)) == [old]
+    # An unreachable AUT (no hash) does not invalidate anything
+    assert stale_cassettes(None, str(tmp_path)) == []
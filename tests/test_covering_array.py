@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from itertools import combinations, product
+
+from src.utils.covering_array import covering_subset, input_class, interaction_coverage
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_input_class_picks_the_dominant_class():
+    assert input_class(0, "13", "2") == "int"
+    assert input_class(0, "1.5", "2") == "float"
+    assert input_class(1, "-5.5", "2") == "negative"
+    assert input_class(3, "1e-6", "1e-3") == "sci-notation"
+    assert input_class(3, "5.5", "0") == "zero-divisor"
+    # Dividing by zero is only special for division; text beats everything
+    assert input_class(2, "5", "0") == "int"
+    assert input_class(3, "abc", "0") == "non-numeric"
+
+
+def test_pairwise_subset_covers_every_pair_with_a_fraction_of_the_product():
+    rows = [{"build": b, "op": o, "input": i} for b, o, i in product(range(4), range(4), "abcd")]
+
+    keep = covering_subset(rows, 2)
+
+    assert interaction_coverage(rows, keep, 2) == (48, 48)
+    # 16 is the optimum for three 4-value factors; greedy gets close
+    assert len(keep) <= 20
+    assert keep == covering_subset(rows, 2)
+    # Full strength keeps every distinct combination
+    assert len(covering_subset(rows, 3)) == 64
+
+
+def test_subset_respects_combinations_missing_from_the_product():
+    # Division only ever by zero, never by a float: those pairs need not be covered
+    rows = [
+        {"op": 3, "input": "zero-divisor"},
+        {"op": 0, "input": "float"},
+        {"op": 0, "input": "int"},
+    ]
+    rows *= 2
+
+    keep = covering_subset(rows, 2)
+
+    assert keep == [0, 1, 2]
+    pairs = {pair for row in rows for pair in combinations(sorted(row.items()), 2)}
+    assert interaction_coverage(rows, keep, 2) == (len(pairs), len(pairs))
+
+
+def test_coverage_strength_deselects_and_reports(tmp_path):
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("PYTEST_XDIST_WORKER", "CASE_FILTER")
+    }
+    cmd = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "tests/test_data_driven_arithmetic.py",
+        "-p",
+        "no:cacheprovider",
+    ]
+    cmd += ["--no-history", "--backend=engine", "--coverage-strength=2", "--maxfail=0"]
+    result = subprocess.run(cmd, cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+
+    assert "of 140 tests; 2-way 119/119 (100%)" in result.stdout, result.stdout[-2000:]
+    assert " deselected" in result.stdout
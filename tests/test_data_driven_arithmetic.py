@@ -1,11 +1,11 @@
-import json
 import os
 
 import allure
 import pytest
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import WebDriverException
+
+from src.engine.calculator_engine import ALL_BUILDS
+from src.utils.case_catalog import case_filter, load_catalog
 
 # Paths and data
 DATA_PATH = os.path.join(
@@ -15,19 +15,82 @@ DATA_PATH = os.path.join(
     "arithmetic_cases.json",
 )
 
-# Load base arithmetic scenarios (these will be fanned out across all builds)
-with open(DATA_PATH, encoding="utf-8") as f:
-    BASE_CASES = json.load(f)
+# Base arithmetic scenarios (these will be fanned out across all builds),
+# compiled once and shared by every worker through the catalog cache
+BASE_CASES = load_catalog(DATA_PATH).select(**case_filter())
+
+
+def _xfail_missing_ui(build):
+    # cannot execute on this build; attach evidence and xfail
+    allure.attach(
+        f"Build {build} is missing one or more core controls "
+        f"(number1/number2/calculate). Test cannot proceed.",
+        name="ui-missing",
+        attachment_type=allure.attachment_type.TEXT,
+    )
+    pytest.xfail(f"Build {build} has incomplete calculator UI – skipping arithmetic scenarios")
+
+
+def _batch(cases):
+    return [(c["op"], c["a"], c["b"], False) for c in cases]
+
+
+def _by_case(cases, results):
+    """run_cases() results keyed by the catalog index of their case."""
+    return {case["index"]: result for case, result in zip(cases, results)}
+
+
+# Fixtures
+@pytest.fixture(scope="session")
+def selected_cases(request):
+    """
+    {build: cases} of the test_arithmetic_all_builds items left to run after
+    -k/-m, --coverage-strength and --shard, so a build's batch only holds the
+    cases that are asserted on.
+    """
+    selected = {}
+    for item in request.session.items:
+        if str(item.path) == __file__ and item.originalname == "test_arithmetic_all_builds":
+            params = item.callspec.params
+            selected.setdefault(params["build"], []).append(params["case"])
+    return selected
+
 
-# The application exposes builds Prototype (0) through 9
-ALL_BUILDS = list(range(0, 10))
+@pytest.fixture(scope="session")
+def batch_results(request, async_fanout, capabilities, selected_cases):
+    """
+    Session cache of CalculatorPage.run_cases() output: {build: {case index:
+    result}}. The first test for a build runs its selected cases in one driver
+    round-trip; the rest of that build's tests just look up their row.
+
+    With --async-contexts, every complete build is run up front, concurrently,
+    in separate browser contexts of one browser, once per session.
+
+    Shared as config._batch_results so --adaptive-sampling checks these
+    answers instead of inferring them.
+    """
+    computed = request.config._batch_results = {}
+    if async_fanout is None:
+        return computed
+
+    builds = [b for b in selected_cases if capabilities[b]["complete"]]
+    results = async_fanout({b: _batch(selected_cases[b]) for b in builds})
+    for b in builds:
+        computed[b] = (
+            results[b]
+            if isinstance(results[b], Exception)
+            else _by_case(selected_cases[b], results[b])
+        )
+    return computed
 
 
 # Tests
 @pytest.mark.regression
 @pytest.mark.parametrize("build", ALL_BUILDS, ids=lambda b: f"build-{b}")
-@pytest.mark.parametrize("case", BASE_CASES, ids=lambda c: c.get("desc", f"op-{c['op']}"))
-def test_arithmetic_all_builds(calc, build, case):
+@pytest.mark.parametrize("case", BASE_CASES, ids=lambda c: c["desc"] or f"op-{c['op']}")
+def test_arithmetic_all_builds(
+    calc, capabilities, selected_cases, batch_results, record_property, build, case
+):
     """
     Data-driven arithmetic test across all calculator builds.
 
@@ -42,43 +105,37 @@ def test_arithmetic_all_builds(calc, build, case):
     b = case["b"]
     expected = str(case["expected"])
 
-    # 1) Select the build
-    calc.choose_build(build)
+    # 1) Missing UI (for example build 9 has no number2/calculate), known from the capability map
+    if not capabilities[build]["complete"]:
+        _xfail_missing_ui(build)
 
-    # 2) Quick probe for missing UI (prevents long waits on broken builds)
-    try:
-        WebDriverWait(calc.driver, 2).until(EC.presence_of_element_located(calc.NUMBER1))
-        WebDriverWait(calc.driver, 2).until(EC.presence_of_element_located(calc.NUMBER2))
-        WebDriverWait(calc.driver, 2).until(EC.presence_of_element_located(calc.CALCULATE))
-    except TimeoutException:
-        # cannot execute on this build; attach evidence and xfail
-        allure.attach(
-            f"Build {build} is missing one or more core controls "
-            f"(number1/number2/calculate). Test cannot proceed.",
-            name="ui-missing",
-            attachment_type=allure.attachment_type.TEXT,
-        )
-        pytest.xfail(f"Build {build} has incomplete calculator UI – skipping arithmetic scenarios")
+    # 2) Run this build's selected cases in one round-trip (first test per build only)
+    if build not in batch_results:
+        cases = selected_cases[build]
+        try:
+            batch_results[build] = _by_case(cases, calc.run_cases(build, _batch(cases)))
+        except WebDriverException as e:
+            batch_results[build] = e
 
-    # 3) Normal interaction flow (still guarded for late DOM changes)
-    try:
-        (
-            calc
-            .set_numbers(a, b)
-            .choose_operation(op)
-            .calculate()
-        )
-    except (TimeoutException, NoSuchElementException) as e:
+    results = batch_results[build]
+    if isinstance(results, Exception):
         allure.attach(
-            f"Build {build} failed during interaction for "
-            f"(op={op}, a={a}, b={b}): {type(e).__name__}: {e}",
+            f"Build {build} failed during batch interaction for "
+            f"(op={op}, a={a}, b={b}): {type(results).__name__}: {results}",
             name="interaction-failure",
             attachment_type=allure.attachment_type.TEXT,
         )
         pytest.xfail(f"Build {build} could not complete interaction flow")
 
+    result = results[case["index"]]
+
+    # 3) Late DOM changes can still hide controls mid-batch
+    if result["missing"]:
+        _xfail_missing_ui(build)
+
     # 4) Read the output
-    actual = calc.read_answer()
+    actual = result["answer"]
+    record_property("actual", actual)
 
     # 5) Exact string match
     if actual == expected:
@@ -86,7 +143,7 @@ def test_arithmetic_all_builds(calc, build, case):
 
     # 6) Numeric match (2.5 vs 2.5000 etc.)
     try:
-        if float(actual) == float(expected):
+        if float(actual) in case["expected_numbers"]:
             return
     except ValueError:
         # values not both numeric; continue to build-aware handling
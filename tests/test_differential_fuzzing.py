@@ -0,0 +1,98 @@
+import csv
+import json
+import os
+import shutil
+
+import pytest
+
+from src.engine import oracle
+from src.engine.calculator_engine import calculate
+from src.fuzz.differential import (
+    confirmed_on_prototype,
+    generate_cases,
+    main,
+    run_differential,
+    write_back,
+)
+from src.pages.engine_page import EngineCalculatorPage
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+@pytest.mark.parametrize("vectorized", [True, False], ids=["numpy", "scalar"])
+def test_oracle_matches_the_prototype_build(monkeypatch, vectorized):
+    if vectorized and oracle._numpy() is None:
+        pytest.skip("numpy is not installed")
+    if not vectorized:
+        monkeypatch.setattr(oracle, "np", None)
+
+    cases = list(generate_cases(5000, seed=7))
+
+    assert oracle.expected_batch(cases) == [calculate(0, *case) for case in cases]
+
+
+def test_defective_build_yields_minimal_reproducers():
+    page = EngineCalculatorPage().open("")
+
+    stats, reproducers = run_differential(page, [0, 1], count=2000, seed=1, batch_size=500)
+
+    assert stats[0]["mismatches"] == 0
+    assert stats[1]["mismatches"] > 0
+    assert reproducers and all(r["build"] == 1 for r in reproducers)
+    for r in reproducers:
+        op, a, b, _ = r["case"]
+        assert op == 1  # build 1 reverses subtraction only
+        assert len(a) + len(b) <= 4
+        assert r["expected"] != r["actual"]
+
+
+def test_only_expectations_the_prototype_gives_are_written_back():
+    page = EngineCalculatorPage().open("")
+    agreed = {"build": 1, "case": (1, "0", "1", False), "expected": ("-1", ""), "actual": ("1", "")}
+    disputed = {
+        "build": 1,
+        "case": (0, "1", "1", False),
+        "expected": ("3", ""),
+        "actual": ("2", ""),
+    }
+
+    assert confirmed_on_prototype(page, [agreed, disputed]) == ([agreed], [disputed])
+
+
+def test_write_back_refuses_the_emulated_backend(capsys):
+    with pytest.raises(SystemExit):
+        main(["--cases", "10", "--backend", "engine", "--write-back"])
+
+    assert "--write-back needs --backend selenium" in capsys.readouterr().err
+
+
+def test_write_back_appends_new_rows_once(tmp_path):
+    json_path = tmp_path / "arithmetic_cases.json"
+    csv_path = tmp_path / "edge_cases.csv"
+    shutil.copy(os.path.join(DATA_DIR, "arithmetic_cases.json"), json_path)
+    shutil.copy(os.path.join(DATA_DIR, "edge_cases.csv"), csv_path)
+    existing_json = len(json.loads(json_path.read_text()))
+
+    reproducers = [
+        {"build": 1, "case": (1, "0", "1", False), "expected": ("-1", ""), "actual": ("1", "")},
+        {"build": 3, "case": (3, "1", "2", True), "expected": ("0", ""), "actual": ("0.5", "")},
+        {
+            "build": 7,
+            "case": (3, "0", "0", False),
+            "expected": ("", "Divide by zero error!"),
+            "actual": ("NaN", ""),
+        },
+    ]
+
+    assert write_back(reproducers, str(json_path), str(csv_path)) == (1, 2)
+    assert write_back(reproducers, str(json_path), str(csv_path)) == (0, 0)
+
+    rows = json.loads(json_path.read_text())
+    assert len(rows) == existing_json + 1
+    assert rows[-1]["expected"] == "-1"
+    with open(csv_path, newline="") as f:
+        added = list(csv.DictReader(f))[-2:]
+    assert [(r["integer_only"], r["expected"]) for r in added] == [
+        ("true", "0"),
+        ("false", "Divide by zero error!"),
+    ]
@@ -0,0 +1,43 @@
+import pytest
+from fakes import FakeDriver
+
+from src.utils.driver_pool import DriverPool
+
+
+@pytest.fixture()
+def pool():
+    p = DriverPool(size=1, max_uses=3, factory=FakeDriver).start()
+    yield p
+    p.close()
+
+
+def test_healthy_driver_is_reused(pool):
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+
+    assert first is second
+    assert pool.recycled == 0
+
+
+def test_crashed_driver_is_recycled(pool):
+    with pool.lease() as first:
+        first.alive = False
+    with pool.lease() as second:
+        pass
+
+    assert first.quit_called
+    assert second is not first
+    assert pool.recycled == 1
+
+
+def test_driver_is_recycled_after_max_uses(pool):
+    leased = []
+    for _ in range(4):
+        with pool.lease() as drv:
+            leased.append(drv)
+
+    assert leased[0] is leased[1] is leased[2]
+    assert leased[3] is not leased[0]
+    assert leased[0].quit_called
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.utils import driver_resolver
+from src.utils.driver_resolver import file_lock, resolve_driver
+
+
+def make_executable(directory, name, output=""):
+    path = directory / name
+    path.write_text(f"#!/bin/sh\necho '{output}'\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def isolated_resolution(monkeypatch):
+    """Keep these tests out of the session's driver resolution summary and version cache."""
+    monkeypatch.setattr(driver_resolver, "RESOLUTION", {})
+    monkeypatch.setattr(driver_resolver, "_BROWSER_VERSIONS", {})
+    yield
+
+
+@pytest.fixture
+def fake_install(tmp_path, monkeypatch):
+    """A PATH holding only a fake Chrome 129 and chromedriver."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    make_executable(bin_dir, "google-chrome", "Google Chrome 129.0.6668.58")
+    driver = make_executable(bin_dir, "chromedriver")
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    return bin_dir, driver
+
+
+def test_resolution_is_cached_per_browser_version(tmp_path, fake_install, monkeypatch):
+    bin_dir, driver = fake_install
+    lockfile = str(tmp_path / "drivers.lock.json")
+
+    assert resolve_driver("chrome", lockfile) == driver
+    assert driver_resolver.RESOLUTION["source"] == "path"
+    assert driver_resolver.RESOLUTION["version"] == "129"
+
+    # Second run never looks for the driver again
+    monkeypatch.setattr(
+        driver_resolver.shutil,
+        "which",
+        lambda name: None if name == "chromedriver" else str(bin_dir / name),
+    )
+    assert resolve_driver("chrome", lockfile) == driver
+    assert driver_resolver.RESOLUTION["source"] == "lockfile"
+
+
+def test_unknown_version_uses_the_last_resolved_driver(tmp_path, fake_install, monkeypatch):
+    bin_dir, driver = fake_install
+    lockfile = str(tmp_path / "drivers.lock.json")
+    resolve_driver("chrome", lockfile)
+
+    # The browser is asked for its version once per process
+    monkeypatch.setattr(driver_resolver.subprocess, "run", None)
+    assert driver_resolver.browser_version("chrome") == "129"
+
+    # A browser that cannot report its version still gets the locked driver
+    monkeypatch.setattr(driver_resolver, "_BROWSER_VERSIONS", {"chrome": "unknown"})
+    monkeypatch.setattr(driver_resolver.shutil, "which", lambda name: None)
+    assert resolve_driver("chrome", lockfile) == driver
+    assert driver_resolver.RESOLUTION["source"] == "lockfile"
+
+
+def test_environment_override_wins(tmp_path, fake_install, monkeypatch):
+    override = make_executable(tmp_path, "my-chromedriver")
+    monkeypatch.setenv("CHROMEDRIVER_PATH", override)
+
+    assert resolve_driver("chrome", str(tmp_path / "drivers.lock.json")) == override
+    assert driver_resolver.RESOLUTION["source"] == "env"
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    lock_path = str(tmp_path / "resolve.lock")
+    inside = []
+    overlaps = []
+
+    def worker():
+        with file_lock(lock_path, poll=0.005):
+            if inside:
+                overlaps.append(True)
+            inside.append(True)
+            time.sleep(0.02)
+            inside.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not overlaps
+    assert not os.path.exists(lock_path)
@@ -0,0 +1,80 @@
+import os
+import threading
+from types import SimpleNamespace
+
+import allure
+from fakes import FakeDriver
+
+from src.utils import evidence
+from src.utils.evidence import EvidenceCollector
+
+
+def make_collector(tmp_path, monkeypatch, policy="full"):
+    monkeypatch.setattr(evidence, "SCREENSHOT_DIR", str(tmp_path / "screenshots"))
+    monkeypatch.setattr(evidence, "PAGE_SOURCE_DIR", str(tmp_path / "page-sources"))
+    config = SimpleNamespace(
+        option=SimpleNamespace(allure_report_dir=str(tmp_path / "allure-results")),
+        pluginmanager=SimpleNamespace(get_plugin=lambda name: None),
+    )
+    return EvidenceCollector(config, policy=policy)
+
+
+def item(nodeid):
+    return SimpleNamespace(nodeid=nodeid, name=nodeid.rsplit("::", 1)[-1])
+
+
+def test_identical_evidence_is_stored_once(tmp_path, monkeypatch):
+    collector = make_collector(tmp_path, monkeypatch)
+    driver = FakeDriver()
+
+    paths = [collector.capture(item(f"tests/t.py::test_x[build-9-{i}]"), driver) for i in range(5)]
+    collector.close()
+
+    assert driver.screenshots_taken == 5
+    assert len(os.listdir(tmp_path / "screenshots")) == 1
+    assert len(os.listdir(tmp_path / "page-sources")) == 1
+    assert all(p == paths[0] for p in paths) and all(os.path.exists(p) for p in paths[0])
+    png = next(p for p in paths[0] if p.endswith(".png"))
+    with open(png, "rb") as f:
+        assert f.read() == b"\x89PNG fake image"
+
+
+def test_attachments_are_made_on_the_test_thread(tmp_path, monkeypatch):
+    attached = []
+
+    def attach(body, name=None, attachment_type=None):
+        attached.append((body, name, attachment_type, threading.current_thread()))
+
+    monkeypatch.setattr(evidence.allure, "attach", attach)
+    collector = make_collector(tmp_path, monkeypatch)
+
+    collector.capture(item("tests/t.py::test_x[build-9]"), FakeDriver())
+    collector.close()
+
+    assert [(body, name, kind) for body, name, kind, _ in attached] == [
+        (b"\x89PNG fake image", "screenshot-test_x[build-9]", allure.attachment_type.PNG),
+        (b"<html></html>", "page-source-test_x[build-9]", allure.attachment_type.HTML),
+    ]
+    assert all(thread is threading.current_thread() for *_, thread in attached)
+
+
+def test_first_per_build_policy_captures_once_per_build(tmp_path, monkeypatch):
+    collector = make_collector(tmp_path, monkeypatch, policy="first-per-build")
+    driver = FakeDriver()
+
+    for build in (1, 1, 2, 9, 9, 9):
+        collector.capture(item(f"tests/t.py::test_x[build-{build}]"), driver)
+    collector.close()
+
+    assert driver.screenshots_taken == 3
+
+
+def test_none_policy_captures_nothing(tmp_path, monkeypatch):
+    collector = make_collector(tmp_path, monkeypatch, policy="none")
+    driver = FakeDriver()
+
+    collector.capture(item("tests/t.py::test_x[build-0]"), driver)
+    collector.close()
+
+    assert driver.screenshots_taken == 0
+    assert not (tmp_path / "screenshots").exists()
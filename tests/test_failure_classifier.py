@@ -0,0 +1,105 @@
+import importlib.util
+
+import pytest
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from src.utils.failure_classifier import (
+    AUT,
+    DRIVER_CRASH,
+    INFRA,
+    PAGE_LOAD_TIMEOUT,
+    SESSION_LOST,
+    classify,
+)
+
+
+def raised(exc_factory):
+    try:
+        exc_factory()
+    except BaseException as exc:  # noqa: B036 - whatever the callable raised
+        return exc
+    raise AssertionError("nothing raised")
+
+
+def fake_navigation(tmp_path):
+    """A get() defined in .../remote/webdriver.py, like WebDriver.get."""
+    module_path = tmp_path / "remote" / "webdriver.py"
+    module_path.parent.mkdir()
+    module_path.write_text(
+        "from selenium.common.exceptions import TimeoutException\n"
+        "def get(url):\n"
+        "    raise TimeoutException('timeout')\n"
+    )
+    spec = importlib.util.spec_from_file_location("fake_webdriver", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.get
+
+
+def fake_executor(tmp_path):
+    """An execute() defined in .../remote/remote_connection.py, like RemoteConnection.execute."""
+    module_path = tmp_path / "remote" / "remote_connection.py"
+    module_path.parent.mkdir(exist_ok=True)
+    module_path.write_text(
+        "def execute(command):\n"
+        "    raise ConnectionResetError(104, 'Connection reset by peer')\n"
+    )
+    spec = importlib.util.spec_from_file_location("fake_remote_connection", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.execute
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (InvalidSessionIdException("invalid session id"), (INFRA, SESSION_LOST)),
+        (WebDriverException("chrome not reachable"), (INFRA, SESSION_LOST)),
+        # Not raised through the command executor (e.g. a driver download)
+        (ConnectionRefusedError(111, "Connection refused"), (AUT, "ConnectionRefusedError")),
+        (
+            TimeoutException("timeout: Timed out receiving message from renderer: 30.000"),
+            (INFRA, PAGE_LOAD_TIMEOUT),
+        ),
+        (AssertionError("expected 3, got 4"), (AUT, "AssertionError")),
+        (NoSuchElementException("#integerSelect"), (AUT, "NoSuchElementException")),
+        (TimeoutException(""), (AUT, "TimeoutException")),
+        (AssertionError("chrome not reachable"), (AUT, "AssertionError")),
+    ],
+    ids=lambda value: getattr(value, "__name__", None) or type(value).__name__,
+)
+def test_classify_by_type_and_message(exc, expected):
+    assert classify(exc) == expected
+
+
+def test_timeout_during_navigation_is_infra(tmp_path):
+    get = fake_navigation(tmp_path)
+
+    assert classify(raised(lambda: get("http://aut"))) == (INFRA, PAGE_LOAD_TIMEOUT)
+
+
+def test_wrapped_driver_fault_is_infra(tmp_path):
+    execute = fake_executor(tmp_path)
+
+    def lease():
+        try:
+            execute("findElement")
+        except ConnectionResetError as exc:
+            raise RuntimeError("could not run case") from exc
+
+    assert classify(raised(lease)) == (INFRA, DRIVER_CRASH)
+
+
+def test_connection_error_outside_the_executor_is_not_retried():
+    def resolve_driver():
+        try:
+            raise ConnectionRefusedError(111, "Connection refused")
+        except ConnectionRefusedError as exc:
+            raise ConnectionError("could not download chromedriver") from exc
+
+    assert classify(raised(resolve_driver)) == (AUT, "ConnectionError")
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from src.utils.history import changed_since, connect, flip_rates, record_run, slowest_per_build
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def case(nodeid, build, verdict, actual="3", duration=0.1):
+    return {
+        "nodeid": nodeid,
+        "build": build,
+        "op": 0,
+        "a": "1",
+        "b": "2",
+        "expected": "3",
+        "actual": actual,
+        "verdict": verdict,
+        "duration": duration,
+    }
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = str(tmp_path / "history.sqlite")
+    clock = iter(range(1000, 2000, 100))
+    monkeypatch.setattr("src.utils.history.time.time", lambda: float(next(clock)))
+    return path
+
+
+def test_runs_are_appended_with_all_columns(db):
+    record_run([case("t::a[build-1]", 1, "passed")], "engine", "aut-1", db)
+    record_run([case("t::a[build-1]", 1, "failed", actual="-1")], "engine", "aut-1", db)
+
+    rows = (
+        sqlite3.connect(db)
+        .execute("SELECT run_id, build, a, b, actual, verdict, aut_hash FROM results")
+        .fetchall()
+    )
+    assert rows == [
+        (1, 1, "1", "2", "3", "passed", "aut-1"),
+        (2, 1, "1", "2", "-1", "failed", "aut-1"),
+    ]
+
+
+def test_trend_queries(db):
+    # recorded at 1000, 1100, 1200, 1300
+    record_run(
+        [case("t::a[build-1]", 1, "passed"), case("t::b[build-2]", 2, "passed", duration=0.5)],
+        "engine",
+        None,
+        db,
+    )
+    record_run(
+        [
+            case("t::a[build-1]", 1, "failed", actual="-1"),
+            case("t::b[build-2]", 2, "passed", duration=0.7),
+        ],
+        "engine",
+        None,
+        db,
+    )
+    record_run(
+        [case("t::a[build-1]", 1, "passed"), case("t::b[build-2]", 2, "passed", actual="4")],
+        "engine",
+        None,
+        db,
+    )
+
+    connection = connect(db)
+
+    changed = changed_since(connection, since=1150)
+    assert [(build, count) for build, count, _ in changed] == [(1, 1), (2, 1)]
+    assert changed_since(connection, since=5000) == []
+
+    slowest = slowest_per_build(connection, limit=1)
+    assert [(build, nodeid) for build, nodeid, _, _ in slowest] == [
+        (1, "t::a[build-1]"),
+        (2, "t::b[build-2]"),
+    ]
+    assert slowest[1][2] == pytest.approx((0.5 + 0.7 + 0.1) / 3)
+
+    flips = flip_rates(connection, min_runs=3)
+    assert flips == [("t::a[build-1]", 1, 2, 3, 1.0)]
+
+
+def test_recorder_only_fingerprints_runs_of_the_matrix(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("PYTEST_XDIST_WORKER", "CASE_FILTER")
+    }
+    env["HISTORY_DB"] = db
+    cmd = [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "--backend=engine", "-q"]
+    for target in (
+        "tests/test_result_cache.py",
+        "tests/test_data_driven_arithmetic.py::test_arithmetic_all_builds",
+    ):
+        result = subprocess.run(
+            [*cmd, target, "-k", "not build or build-0"],
+            cwd=ROOT_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stdout[-2000:]
+
+    runs = sqlite3.connect(db).execute("SELECT aut_hash FROM runs ORDER BY run_id").fetchall()
+    assert runs[0] == (None,)
+    assert runs[1][0]
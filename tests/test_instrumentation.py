@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from fakes import FakeDriver
+
+from src.utils import instrumentation
+from src.utils.instrumentation import (
+    CommandCounter,
+    SpanSummary,
+    Tracer,
+    chrome_trace,
+    instrument_driver,
+    traced,
+)
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = Tracer()
+    tracer.enabled = True
+    tracer.test = "tests/t.py::test_x[build-3]"
+    monkeypatch.setattr(instrumentation, "TRACER", tracer)
+    # --telemetry may have switched counting on for this process
+    monkeypatch.setattr(instrumentation, "COMMANDS", CommandCounter())
+    return tracer
+
+
+@traced("wait")
+def fake_wait(driver):
+    driver.execute("getAlertText")
+    time.sleep(0.02)
+
+
+@traced("step")
+def fake_step(driver):
+    driver.execute("findElement")
+    driver.execute("elementClick")
+    fake_wait(driver)
+
+
+def test_steps_count_round_trips_and_wait_time(tracer):
+    driver = instrument_driver(FakeDriver())
+    instrument_driver(driver)  # wrapping twice must not double count
+
+    fake_step(driver)
+
+    step = next(s for s in tracer.spans_for("tests/t.py::test_x[build-3]") if s["kind"] == "step")
+    assert step["name"] == "fake_step"
+    assert step["round_trips"] == 3
+    assert step["depth"] == 0
+    assert 0.02 <= step["wait"] <= step["duration"]
+    assert [s["kind"] for s in tracer.spans].count("command") == 3
+
+    events = chrome_trace(tracer.spans, pid="gw0")
+    assert {e["cat"] for e in events} == {"step", "wait", "command"}
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+def test_disabled_tracer_records_nothing(tracer):
+    tracer.enabled = False
+    driver = instrument_driver(FakeDriver())
+
+    fake_step(driver)
+
+    assert tracer.spans == []
+    assert not getattr(driver.command_executor, "_traced", False)
+
+
+def test_commands_are_counted_without_tracing(tracer):
+    tracer.enabled = False
+    instrumentation.COMMANDS.enabled = True
+    driver = instrument_driver(FakeDriver())
+
+    fake_step(driver)
+
+    assert instrumentation.COMMANDS.total == 3
+    assert tracer.spans == []
+
+
+def test_spans_past_the_limit_are_counted_not_kept(tracer):
+    tracer.max_spans = 2
+    driver = instrument_driver(FakeDriver())
+
+    fake_step(driver)
+
+    assert len(tracer.spans) == 2
+    assert tracer.dropped == 3
+    assert len(tracer.pop_spans("tests/t.py::test_x[build-3]")) == 5
+    assert tracer.spans_for("tests/t.py::test_x[build-3]") == []
+
+
+def test_summary_keeps_the_slowest_steps_and_totals_per_build(tracer):
+    driver = instrument_driver(FakeDriver())
+    fake_step(driver)
+    spans = tracer.pop_spans("tests/t.py::test_x[build-3]")
+
+    worker = SpanSummary(top=1)
+    worker.add(spans, 3)
+    worker.add(
+        [
+            {**s, "test": "tests/t.py::test_x[build-4]", "duration": s["duration"] * 2}
+            for s in spans
+        ],
+        4,
+    )
+    controller = SpanSummary(top=1)
+    controller.merge(worker.as_output())
+    controller.merge(worker.as_output())
+
+    assert [s["test"] for s in controller.slowest] == ["tests/t.py::test_x[build-4]"]
+    wall, wait, round_trips = controller.per_build[3]
+    assert round_trips == 6
+    assert 0.04 <= wait <= wall
@@ -0,0 +1,59 @@
+import json
+
+from src.utils import native_report
+from src.utils.native_report import (
+    ResultStream,
+    build_record,
+    merge_streams,
+    read_records,
+    render_html,
+)
+
+
+def test_stream_fsyncs_in_batches(tmp_path, monkeypatch):
+    syncs = []
+    monkeypatch.setattr(native_report.os, "fsync", lambda fd: syncs.append(fd))
+    stream = ResultStream(str(tmp_path / "results-gw0.jsonl"), batch_size=10, interval=3600)
+
+    for i in range(25):
+        stream.write(build_record(f"t.py::test[build-1-{i}]", "passed", 0.01))
+    assert len(syncs) == 2
+    stream.close()
+    assert len(syncs) == 3
+    assert len(read_records(stream.path)) == 25
+
+
+def test_merge_orders_records_and_skips_torn_lines(tmp_path):
+    first, second = tmp_path / "results-gw0.jsonl", tmp_path / "results-gw1.jsonl"
+    first.write_text(json.dumps(build_record("t.py::b", "passed", 1)) + "\n")
+    second.write_text(
+        json.dumps(build_record("t.py::a", "failed", 1)) + "\n" + '{"nodeid": "t.py::c", "outc'
+    )
+
+    merged = merge_streams([str(first), str(second)], str(tmp_path / "results.jsonl"))
+
+    assert [r["nodeid"] for r in merged] == ["t.py::a", "t.py::b"]
+    assert read_records(str(tmp_path / "results.jsonl")) == merged
+
+
+def test_html_grid_has_a_column_per_build_and_evidence_links(tmp_path):
+    shot = tmp_path / "screenshots" / "abc.png"
+    records = [
+        build_record("t.py::test_add[1-2-build-0]", "passed", 0.1),
+        build_record("t.py::test_add[1-2-build-9]", "failed", 0.2, "<boom>", evidence=[str(shot)]),
+        {**build_record("t.py::test_add[1-2-build-3]", "xfailed", 0.1), "emulated": True},
+        build_record("t.py::test_unit", "passed", 0.0),
+    ]
+    output = tmp_path / "native" / "index.html"
+    output.parent.mkdir()
+
+    render_html(records, str(output))
+    page = output.read_text(encoding="utf-8")
+
+    assert page.count("t.py::test_add[1-2-build-*]") == 1
+    # Emulated engine builds are starred
+    assert "<th>0</th><th>3*</th><th>9</th>" in page
+    assert 'href="../screenshots/abc.png"' in page
+    assert "&lt;boom&gt;" in page and "<boom>" not in page
+    assert "t.py::test_unit" in page
+    assert "http-equiv='refresh'" not in page
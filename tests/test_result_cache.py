@@ -0,0 +1,36 @@
+import time
+
+from src.utils.result_cache import case_key, is_fresh, load_results, save_results
+
+PARAMS = {"case": {"a": "1", "b": "2", "op": "0", "expected": "3"}, "build": 0}
+
+
+def test_key_changes_with_each_input():
+    key = case_key("aut-1", "engine", "page-1", PARAMS, "test-1")
+
+    assert key == case_key("aut-1", "engine", "page-1", dict(PARAMS), "test-1")
+    assert key != case_key("aut-2", "engine", "page-1", PARAMS, "test-1")
+    assert key != case_key("aut-1", "engine", "page-1", {**PARAMS, "build": 1}, "test-1")
+    assert key != case_key("aut-1", "engine", "page-1", PARAMS, "test-2")
+    assert key != case_key("aut-1", "engine", "page-2", PARAMS, "test-1")
+    assert key != case_key("aut-1", "selenium", "page-1", PARAMS, "test-1")
+
+
+def test_save_merges_and_prunes_expired_entries(tmp_path):
+    path = str(tmp_path / "results.json")
+    now = time.time()
+    save_results(
+        {
+            "old": {"outcome": "passed", "at": now - 7200},
+            "recent": {"outcome": "failed", "at": now - 60},
+        },
+        max_age=3600,
+        path=path,
+    )
+    save_results({"new": {"outcome": "passed", "at": now}}, max_age=3600, path=path)
+
+    results = load_results(path)
+    assert sorted(results) == ["new", "recent"]
+    assert is_fresh(results["recent"], max_age=3600)
+    assert not is_fresh(results["recent"], max_age=0)
+    assert not is_fresh(None, max_age=3600)
@@ -0,0 +1,114 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from src.plugins.adaptive_sampling import AdaptiveSampler
+from src.utils.sampling import (
+    FAILED,
+    INFERRED_PROPERTY,
+    PASSED,
+    SAMPLED_PROPERTY,
+    SignatureTracker,
+    failure_kind,
+    sampled,
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_failure_kind():
+    assert failure_kind("10", "4", "2.5", "") == "empty"
+    assert failure_kind("10", "4", "2.5", "Divide by zero error") == "text"
+    assert failure_kind("10", "4", "2.5", "2") == "truncated"
+    assert failure_kind("13", "2", "15", "132") == "concatenated"
+    assert failure_kind("13", "2", "15", "11") == "wrong-number"
+
+
+def test_signature_settles_with_enough_matching_cases_and_reopens_on_a_pass():
+    key = ("test_arithmetic_all_builds", 4, 2)
+    tracker = SignatureTracker(confidence=0.75)
+    tracker.observe(key, "truncated")
+    assert tracker.settled(key) is None
+
+    tracker.observe(key, "truncated")
+    assert tracker.settled(key) == ("truncated", 2, 2)
+    # Stricter confidence needs more evidence: (2 + 1) / (2 + 2) < 0.8
+    assert SignatureTracker(confidence=0.8).settled(key) is None
+
+    tracker.observe(key, PASSED)
+    assert tracker.settled(key) is None
+    # Real failures never settle a key
+    tracker.observe(("t", 0, 0), FAILED)
+    tracker.observe(("t", 0, 0), FAILED)
+    assert tracker.settled(("t", 0, 0)) is None
+
+
+def test_sample_is_stable_per_seed_and_close_to_the_rate():
+    nodeids = [f"t.py::test[case-{i}-build-3]" for i in range(2000)]
+    picked = [n for n in nodeids if sampled(n, "2026-01-01", 0.2)]
+
+    assert picked == [n for n in nodeids if sampled(n, "2026-01-01", 0.2)]
+    assert 300 < len(picked) < 500
+    assert picked != [n for n in nodeids if sampled(n, "2026-01-02", 0.2)]
+    assert not any(sampled(n, "x", 0.0) for n in nodeids)
+
+
+def test_settled_cases_are_inferred_unless_already_computed():
+    config = SimpleNamespace(_batch_results={4: {}})
+    sampler = AdaptiveSampler(config, confidence=0.75, rate=0.0, seed="x")
+    for _ in range(2):
+        sampler.tracker.observe(("test_x", 4, 2), "truncated")
+        sampler.tracker.observe(("test_x", 5, 2), "truncated")
+
+    def item(build, fixturenames):
+        case = {"op": 2, "a": "10", "b": "4", "expected": "40"}
+        return SimpleNamespace(
+            config=config,
+            nodeid=f"t.py::test_x[build-{build}]",
+            originalname="test_x",
+            callspec=SimpleNamespace(params={"case": case, "build": build}),
+            fixturenames=fixturenames,
+            user_properties=[],
+        )
+
+    computed = item(4, ["calc", "batch_results"])
+    sampler.pytest_runtest_setup(computed)
+    assert computed.user_properties == [(SAMPLED_PROPERTY, "truncated")]
+
+    for pending in (item(5, ["calc", "batch_results"]), item(4, ["calc"])):
+        with pytest.raises(pytest.xfail.Exception, match=r"\[inferred\]"):
+            sampler.pytest_runtest_setup(pending)
+        assert pending.user_properties == [(INFERRED_PROPERTY, "truncated")]
+    assert sampler.counts == {"inferred": 2, "sampled": 0, "checked": 1}
+
+
+def test_adaptive_sampling_checks_computed_cases_against_the_signature():
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("PYTEST_XDIST_WORKER", "CASE_FILTER")
+    }
+    cmd = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "tests/test_data_driven_arithmetic.py",
+        "-p",
+        "no:cacheprovider",
+    ]
+    cmd += ["--no-history", "--backend=engine", "--maxfail=0", "-rx"]
+    cmd += ["--adaptive-sampling", "--sampling-rate=0"]
+    result = subprocess.run(cmd, cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stdout[-2000:]
+    # Every answer comes from the build's batch, so nothing is inferred
+    assert "[inferred]" not in result.stdout
+    assert "adaptive sampling: 0 case(s) inferred, 0 sampled, " in result.stdout
+    # Build 2 multiplies these correctly despite its settled 'wrong-number' signature
+    assert (
+        "new behaviour: tests/test_data_driven_arithmetic.py::test_arithmetic_all_builds"
+        "[multiply positives-build-2] gave 'passed', settled on 'wrong-number'" in result.stdout
+    )
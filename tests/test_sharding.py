@@ -0,0 +1,142 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.plugins.build_scheduler import pytest_collection_modifyitems
+from src.utils.durations import build_of
+from src.utils.sharding import (
+    MANIFEST,
+    RESULT_CACHE,
+    assign_shards,
+    digest,
+    merge,
+    parse_shard,
+)
+
+
+def write_shard(directory, index, total, assigned, collected, durations=None):
+    directory.mkdir(parents=True)
+    manifest = {
+        "shard": index,
+        "total": total,
+        "collected": len(collected),
+        "collection_hash": digest(sorted(collected)),
+        "durations_hash": "same",
+        "assigned": assigned,
+        "durations": durations or {nodeid: 0.1 for nodeid in assigned},
+    }
+    (directory / MANIFEST).write_text(json.dumps(manifest))
+    return directory
+
+
+def test_parse_shard_validates_spec():
+    assert parse_shard("2/4") == (2, 4)
+    for spec in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_build_of_only_reads_a_whole_build_parameter():
+    assert build_of("t.py::test_x[build-3]") == 3
+    assert build_of("t.py::test_x[add floats-build-12]") == 12
+    assert build_of("t.py::test_x[build-0-row1]") == 0
+    for nodeid in ("t.py::test_x[rebuild-3]", "t.py::test_build-3", "t.py::test_x[a-build-3b]"):
+        assert build_of(nodeid) is None
+
+
+def test_tests_are_grouped_by_build_within_each_module():
+    nodeids = [
+        "tests/b.py::t[build-1]",
+        "tests/b.py::t[build-0]",
+        "tests/b.py::unit",
+        "tests/a.py::t[build-1]",
+        "tests/a.py::t[build-0]",
+    ]
+    items = [SimpleNamespace(nodeid=n, path=n.split("::")[0]) for n in nodeids]
+
+    pytest_collection_modifyitems(None, items)
+
+    assert [item.nodeid for item in items] == [
+        "tests/b.py::unit",
+        "tests/b.py::t[build-0]",
+        "tests/b.py::t[build-1]",
+        "tests/a.py::t[build-0]",
+        "tests/a.py::t[build-1]",
+    ]
+
+
+def test_shards_are_complete_disjoint_and_balanced_by_duration():
+    nodeids = [f"t.py::test[{i}-build-{i % 10}]" for i in range(200)]
+    # A few slow tests that a count-based split would lump together
+    durations = {nodeid: (5.0 if i < 8 else 0.1) for i, nodeid in enumerate(nodeids)}
+
+    shards = assign_shards(nodeids, durations, 4)
+
+    assert sorted(sum(shards, [])) == sorted(nodeids)
+    loads = [sum(durations[n] for n in shard) for shard in shards]
+    assert max(loads) - min(loads) <= 0.1 + 1e-9
+    assert assign_shards(list(reversed(nodeids)), durations, 4) == shards
+
+
+def test_merge_combines_shards_and_checks_coverage(tmp_path):
+    collected = ["t.py::a", "t.py::b", "t.py::c"]
+    first = write_shard(tmp_path / "1", 1, 2, ["t.py::a", "t.py::c"], collected)
+    second = write_shard(tmp_path / "2", 2, 2, ["t.py::b"], collected)
+    for directory, name in ((first, "a-result.json"), (second, "b-result.json")):
+        (directory / "allure-results").mkdir()
+        (directory / "allure-results" / name).write_text("{}")
+        (directory / "allure-results" / "environment.properties").write_text("OS=x\n")
+
+    durations_path = tmp_path / "durations.json"
+    counts, problems = merge(
+        [str(second), str(first)],
+        output=str(tmp_path / "merged"),
+        durations_path=str(durations_path),
+        results_path=str(tmp_path / "results.json"),
+    )
+
+    assert problems == []
+    assert counts["tests"] == 3
+    assert sorted(p.name for p in (tmp_path / "merged" / "allure-results").iterdir()) == [
+        "a-result.json",
+        "b-result.json",
+        "environment.properties",
+    ]
+    assert set(json.loads(durations_path.read_text())) == set(collected)
+
+
+def test_merge_folds_shard_outcomes_into_the_result_cache(tmp_path):
+    collected = ["t.py::a", "t.py::b"]
+    first = write_shard(tmp_path / "1", 1, 2, ["t.py::a"], collected)
+    second = write_shard(tmp_path / "2", 2, 2, ["t.py::b"], collected)
+    entry = {"outcome": "passed", "when": "call", "message": ""}
+    (first / RESULT_CACHE).write_text(json.dumps({"ka": dict(entry, nodeid="t.py::a", at=1.0)}))
+    (second / RESULT_CACHE).write_text(json.dumps({"kb": dict(entry, nodeid="t.py::b", at=2.0)}))
+
+    results_path = tmp_path / "results.json"
+    counts, _ = merge(
+        [str(first), str(second)],
+        output=str(tmp_path / "merged"),
+        durations_path=str(tmp_path / "durations.json"),
+        results_path=str(results_path),
+    )
+
+    assert counts["cached_results"] == 2
+    assert set(json.loads(results_path.read_text())) == {"ka", "kb"}
+
+
+def test_merge_reports_missing_and_duplicated_tests(tmp_path):
+    collected = ["t.py::a", "t.py::b", "t.py::c"]
+    first = write_shard(tmp_path / "1", 1, 3, ["t.py::a", "t.py::b"], collected)
+    second = write_shard(tmp_path / "2", 2, 3, ["t.py::b"], collected)
+
+    _, problems = merge(
+        [str(first), str(second)],
+        output=str(tmp_path / "merged"),
+        durations_path=str(tmp_path / "durations.json"),
+        results_path=str(tmp_path / "results.json"),
+    )
+
+    assert "missing shard(s): 3 of 3" in problems
+    assert any("t.py::b ran in shards 1 and 2" in problem for problem in problems)
@@ -2,7 +2,7 @@ import pytest
 
 # Tests
 @pytest.mark.smoke
-@pytest.mark.parametrize("build", [0, 1, 2])
+@pytest.mark.parametrize("build", [0, 1, 2], ids=lambda b: f"build-{b}")
 def test_page_loads(calc, build):
     """
     Basic smoke test to confirm the calculator loads and performs
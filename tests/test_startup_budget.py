@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What every pytest process (each xdist worker included) imports before the
+# first test: conftest.py and the plugins it registers
+STARTUP_MODULES = (
+    "conftest",
+    "src.plugins.adaptive_sampling",
+    "src.plugins.build_scheduler",
+    "src.plugins.cassettes",
+    "src.plugins.combinatorial",
+    "src.plugins.history",
+    "src.plugins.incremental",
+    "src.plugins.infra_retry",
+    "src.plugins.native_report",
+    "src.plugins.sharding",
+    "src.plugins.step_trace",
+    "src.plugins.telemetry",
+    "src.plugins.worker_control",
+)
+
+# Loaded by pytest and its plugins anyway; imported first so they are not
+# charged to the project
+PRELOADED = ("pytest", "xdist.plugin", "allure_pytest.plugin")
+
+# Only needed once a browser starts or a fuzz batch runs
+DEFERRED = ("selenium.webdriver", "numpy", "dotenv", "webdriver_manager", "urllib.request")
+
+# Cumulative import time allowed for STARTUP_MODULES (microseconds); about
+# 50 ms on an idle machine, the headroom absorbs a busy one (xdist, shards)
+IMPORT_BUDGET_US = int(os.getenv("IMPORT_BUDGET_MS", "200")) * 1000
+
+_MARKER = "--- startup modules ---"
+
+
+def startup_imports() -> list[tuple[str, int, int]]:
+    """(module, depth, cumulative us) for every import made by STARTUP_MODULES, from -X importtime."""
+    code = (
+        f"import {', '.join(PRELOADED)}; import sys; sys.stderr.write({_MARKER!r} + '\\n'); "
+        f"import {', '.join(STARTUP_MODULES)}"
+    )
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = result.stderr.split(_MARKER, 1)[1].splitlines()
+
+    imports = []
+    for line in lines:
+        # "import time: <self us> | <cumulative us> | <indented module>"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(cumulative)))
+    return imports
+
+
+def test_startup_does_not_import_deferred_modules():
+    imported = {name for name, _, _ in startup_imports()}
+
+    loaded = sorted(name for name in imported if name.startswith(DEFERRED))
+    assert not loaded, f"imported at startup: {loaded}"
+
+
+def test_startup_import_time_is_within_budget():
+    # Wall-clock times: take the best of a few runs so other processes on the
+    # machine (and a cold page cache) do not count against the budget
+    totals = []
+    for _ in range(5):
+        totals.append(sum(us for _, depth, us in startup_imports() if depth == 0))
+        if totals[-1] <= IMPORT_BUDGET_US:
+            break
+
+    assert min(totals) <= IMPORT_BUDGET_US, (
+        f"conftest and plugins import in {min(totals) / 1000:.0f} ms, "
+        f"budget is {IMPORT_BUDGET_US / 1000:.0f} ms (IMPORT_BUDGET_MS)"
+    )
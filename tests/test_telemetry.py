@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+from src.utils.telemetry import RunTelemetry, TelemetryServer, WorkerReporter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scraped by the run below, from inside its own test
+PROBE = """
+import json
+import time
+import urllib.request
+
+
+def test_first():
+    pass
+
+
+def test_scrapes_its_own_run(request):
+    url = request.config.pluginmanager.get_plugin("telemetry").server.url
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        with urllib.request.urlopen(url + "/metrics.json", timeout=5) as response:
+            snapshot = json.load(response)
+        if snapshot["workers"].get("main", {}).get("test") == request.node.nodeid:
+            break
+        time.sleep(0.05)
+    assert snapshot["workers"]["main"]["test"] == request.node.nodeid
+    assert snapshot["cases"] == {
+        "collected": 2, "completed": 1, "remaining": 1, "inferred": 0, "by_outcome": {"passed": 1}
+    }
+"""
+
+
+def scrape(url: str) -> dict[str, float]:
+    """Minimal Prometheus collector: {'name{labels}': value} from /metrics."""
+    with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        text = response.read().decode("utf-8")
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+@pytest.fixture()
+def server():
+    clock = {"now": 100.0}
+    telemetry = RunTelemetry(window=10, clock=lambda: clock["now"])
+    server = TelemetryServer(telemetry).start()
+    server.clock = clock
+    yield server
+    server.stop()
+
+
+def test_worker_datagrams_and_completions_are_scraped(server):
+    telemetry = server.telemetry
+    telemetry.set_collected(5)
+    reporter = WorkerReporter(
+        server.ipc_address, "gw1", sample=lambda: {"commands_total": 42, "evidence_backlog": 3}
+    )
+    reporter.start()
+    reporter.send("start", test='t.py::test_x[a"b-build-3]')
+    wait_for(
+        lambda: {"test", "commands_total"}
+        <= {k for k, v in telemetry.workers.get("gw1", {}).items() if v}
+    )
+
+    server.clock["now"] += 4
+    telemetry.completed("t.py::test_a[build-3]", "passed", build=3)
+    telemetry.completed("t.py::test_b[build-3]", "xfailed", build=3, inferred=True)
+    # A rerun replaces the outcome without counting twice
+    telemetry.completed("t.py::test_b[build-3]", "failed", build=3)
+    metrics = scrape(server.url)
+    reporter.stop()
+
+    assert metrics["calculator_run_cases_remaining"] == 3
+    assert metrics['calculator_run_cases_completed_total{outcome="failed"}'] == 1
+    assert metrics["calculator_run_cases_inferred_total"] == 1
+    # Two cases over the 4 s the run has lasted
+    assert metrics["calculator_run_cases_per_second"] == 0.5
+    assert metrics['calculator_run_build_cases_per_second{build="3"}'] == 0.5
+    assert (
+        metrics[
+            'calculator_run_worker_test_seconds{worker="gw1",test="t.py::test_x[a\\"b-build-3]"}'
+        ]
+        == 4
+    )
+    assert metrics['calculator_run_worker_driver_commands_total{worker="gw1"}'] == 42
+    assert metrics['calculator_run_worker_evidence_backlog{worker="gw1"}'] == 3
+
+    # Completions drop out of the rolling window
+    server.clock["now"] += 20
+    with urllib.request.urlopen(f"{server.url}/metrics.json", timeout=5) as response:
+        snapshot = json.load(response)
+    assert snapshot["cases_per_second"] == 0
+    assert snapshot["cases"]["completed"] == 2
+
+
+def test_run_serves_telemetry_while_its_tests_run(tmp_path):
+    (tmp_path / "test_probe.py").write_text(PROBE)
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+    env.pop("PYTEST_XDIST_WORKER", None)
+    cmd = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "test_probe.py",
+        "-p",
+        "src.plugins.telemetry",
+        "--telemetry",
+    ]
+    cmd += ["-p", "no:cacheprovider"]
+    result = subprocess.run(cmd, cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stdout[-2000:]
+    assert "telemetry: http://127.0.0.1:" in result.stdout
@@ -0,0 +1,28 @@
+import pytest
+
+from src.utils import waits
+from src.utils.waits import DEFAULT_TIMEOUT, MIN_SAMPLES, LatencyStats
+
+
+def test_timeout_uses_default_until_enough_samples():
+    stats = LatencyStats()
+    for _ in range(MIN_SAMPLES - 1):
+        stats.record("locator", 0.1)
+
+    assert stats.timeout_for("locator", DEFAULT_TIMEOUT) == DEFAULT_TIMEOUT
+
+
+def test_timeout_tracks_p99_within_bounds(monkeypatch):
+    monkeypatch.setattr(waits, "ADAPTIVE_WAITS", True)
+    stats = LatencyStats()
+    for _ in range(99):
+        stats.record("fast", 0.05)
+        stats.record("slow", 0.5)
+    stats.record("fast", 0.6)
+    stats.record("slow", 3.0)
+
+    # p99 ignores the single outlier; the result is clamped to [minimum, default]
+    assert stats.percentile("slow") == 0.5
+    assert stats.timeout_for("fast", DEFAULT_TIMEOUT) == waits.MIN_TIMEOUT
+    assert stats.timeout_for("slow", DEFAULT_TIMEOUT) == pytest.approx(1.5)
+    assert stats.timeout_for("slow", 1.2) == 1.2
@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+from src.utils.worker_sizing import WorkerMonitor, calibrate, choose_workers
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_choose_workers_takes_the_tightest_limit():
+    calibration = {"cpu_per_worker": 0.5, "worker_rss_mb": 400}
+
+    # 8 CPUs fit 16 workers, 10 builds cap them, 3 GB over the reserve fits 7
+    workers, config = choose_workers(8, (16000, 4000), calibration, reserve_mb=1000)
+    assert (workers, config["limited_by"]) == (7, "memory")
+
+    workers, config = choose_workers(2, (16000, 12000), calibration, reserve_mb=1000)
+    assert (workers, config["limited_by"]) == (4, "cpu")
+
+    # No /proc: CPUs only, and a worker per CPU without a measurement
+    assert choose_workers(4, None, {"cpu_per_worker": None, "worker_rss_mb": None})[0] == 4
+    assert choose_workers(64, (64000, 60000), calibration)[1]["limited_by"] == "builds"
+
+
+def test_monitor_recycles_large_workers_and_parks_under_memory_pressure(tmp_path):
+    for worker, pid in (("gw0", 100), ("gw1", 200)):
+        (tmp_path / f"{worker}.pid").write_text(str(pid))
+    # {pid: (ppid, rss MB, cpu s)}: gw1's browser (201) has grown
+    processes = {100: (1, 100, 0), 101: (100, 300, 0), 200: (1, 100, 0), 201: (200, 900, 0)}
+    memory = {"available": 500.0}
+    monitor = WorkerMonitor(
+        str(tmp_path),
+        ceiling_mb=800,
+        reserve_mb=1000,
+        log=lambda line: None,
+        read_memory=lambda: (8000, memory["available"]),
+        read_load=lambda: 0.5,
+        read_processes=lambda: processes,
+    )
+
+    monitor.check()
+    assert (tmp_path / "gw1.recycle").exists() and not (tmp_path / "gw0.recycle").exists()
+    assert (tmp_path / "gw1.park").exists() and not (tmp_path / "gw0.park").exists()
+
+    # Still short: gw0 is the last one running and keeps going
+    monitor.check()
+    assert not (tmp_path / "gw0.park").exists()
+
+    memory["available"] = 3000.0
+    monitor.check()
+    assert not (tmp_path / "gw1.park").exists()
+    assert [event["action"] for event in monitor.events] == ["recycle", "park", "resume"]
+    assert monitor.peak_rss == {"gw0": 400, "gw1": 1000}
+
+
+def test_worker_takes_a_recycle_order_between_tests(tmp_path):
+    control = tmp_path / "control"
+    control.mkdir()
+    (control / "main.recycle").write_text("")
+    env = {key: value for key, value in os.environ.items() if key != "PYTEST_XDIST_WORKER"}
+
+    cmd = [
+        sys.executable,
+        "-m",
+        "pytest",
+        "tests/test_calculator_engine.py",
+        "-p",
+        "no:cacheprovider",
+    ]
+    cmd += ["--no-history", f"--worker-control={control}"]
+    result = subprocess.run(cmd, cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stdout[-2000:]
+    assert "worker control: main parked 0s, 1 browser(s) recycled" in result.stdout
+    assert sorted(os.listdir(control)) == []
+
+
+def test_calibration_repeats_the_slice_for_the_minimum_duration():
+    slice_cmd = [sys.executable, "-c", "print('2 passed, 1 xfailed in 0.01s')"]
+
+    calibration = calibrate(slice_cmd, interval=0.01, min_seconds=0.5)
+
+    assert calibration["seconds"] >= 0.5
+    assert calibration["cases"] > 3 and calibration["cases"] % 3 == 0
+    # A slice that runs nothing is not repeated
+    assert calibrate([sys.executable, "-c", "print('no tests ran')"], min_seconds=60)["cases"] == 0